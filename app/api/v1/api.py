@@ -1,16 +1,31 @@
-from fastapi import APIRouter
-from app.api.v1.endpoints import tasks, auth
+from fastapi import APIRouter, Depends
+from app.api.v1.endpoints import tasks, auth, async_tasks, async_auth, debug
+from app.core.config import settings
+from app.core.dependencies import get_current_admin_user, get_current_admin_user_async
 
-api_router = APIRouter()
+def build_api_router(use_async: bool = False) -> APIRouter:
+    # Arma el router de la API en modo sync (threadpool) o async (AsyncSession)
+    api_router = APIRouter()
 
-api_router.include_router(
-    auth.router, 
-    prefix="/auth", 
-    tags=["auth"]
-)
+    api_router.include_router(
+        async_auth.router if use_async else auth.router, 
+        prefix="/auth", 
+        tags=["auth"]
+    )
 
-api_router.include_router(
-    tasks.router, 
-    prefix="/tasks", 
-    tags=["tasks"]
-)
\ No newline at end of file
+    api_router.include_router(
+        async_tasks.router if use_async else tasks.router, 
+        prefix="/tasks", 
+        tags=["tasks"]
+    )
+
+    if settings.DEBUG_PROFILING_ENABLED:
+        api_router.include_router(
+            debug.router,
+            prefix="/debug",
+            tags=["debug"],
+            dependencies=[Depends(get_current_admin_user_async if use_async else get_current_admin_user)]
+        )
+    return api_router
+
+api_router = build_api_router(use_async=settings.DB_ASYNC)
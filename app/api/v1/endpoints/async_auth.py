@@ -0,0 +1,93 @@
+# Endpoint de autenticación (modo async, DB_ASYNC=True)
+# POST /login para obtener el token JWT, POST /logout para revocarlo
+# y POST /users/{id}/deactivate (solo admins) para desactivar un usuario
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import timedelta
+
+from app.db.session import get_async_db
+from app.core import security
+from app.core.config import settings
+from app.core.dependencies import (
+    decode_token,
+    get_current_active_user_primary_async,
+    get_current_admin_user_primary_async,
+    oauth2_scheme,
+)
+from app.core.password_pool import PasswordPoolBusy
+from app.core.timing import TimedRoute
+from app.models.user import User
+from app.services import async_auth_service
+from app.schemas.token import Token
+
+router = APIRouter(route_class=TimedRoute)
+
+@router.post("/login", response_model=Token)
+async def login_for_access_token(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Endpoint de login - valida credenciales y devuelve token
+    try:
+        user = await async_auth_service.authenticate(
+            db, email=form_data.username, password=form_data.password
+        )
+    except PasswordPoolBusy:
+        # Demasiados logins a la vez: se rechaza rápido en vez de encolar
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Demasiados intentos de login, intenta de nuevo en unos segundos",
+            headers={"Retry-After": "1"},
+        )
+    
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Email o contraseña incorrectos",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Usuario inactivo"
+        )
+
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = security.create_access_token(
+        data={"sub": user.email},
+        expires_delta=access_token_expires,
+        user_id=user.id,
+        is_active=user.is_active,
+        epoch=await async_auth_service.get_user_epoch(db, user.id)
+    )
+
+    return {"access_token": access_token, "token_type": "bearer"}
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user_primary_async)
+):
+    # POST /auth/logout - Revoca el token con el que se llama hasta que expire
+    token_data = decode_token(token)
+    if token_data.jti is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El token no se puede revocar")
+    await async_auth_service.revoke_token(db, token_data.jti, token_data.expires_at)
+    return None
+
+@router.post("/users/{user_id}/deactivate", status_code=status.HTTP_204_NO_CONTENT)
+async def deactivate_user(
+    user_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_admin_user_primary_async)
+):
+    # POST /auth/users/{id}/deactivate - Desactiva al usuario e invalida sus tokens (solo admins)
+    user = await db.get(User, user_id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado")
+    await async_auth_service.deactivate_user(db, user)
+    return None
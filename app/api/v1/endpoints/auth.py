@@ -1,7 +1,9 @@
 # Endpoint de autenticación
-# POST /login para obtener el token JWT
+# POST /login para obtener el token JWT, POST /logout para revocarlo
+# y POST /users/{id}/deactivate (solo admins) para desactivar un usuario
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta
@@ -9,20 +11,34 @@ from datetime import timedelta
 from app.db.session import get_db
 from app.core import security
 from app.core.config import settings
+from app.core.dependencies import decode_token, get_current_active_user_primary, get_current_admin_user_primary, oauth2_scheme
+from app.core.password_pool import PasswordPoolBusy
+from app.core.timing import TimedRoute
+from app.models.user import User
 from app.services import auth_service
 from app.schemas.token import Token
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 @router.post("/login", response_model=Token)
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
     # Endpoint de login - valida credenciales y devuelve token
-    user = auth_service.authenticate(
-        db, email=form_data.username, password=form_data.password
-    )
+    # Es async def para esperar a bcrypt sin ocupar un hilo del threadpool
+    # (las queries sí van al threadpool, ver auth_service.authenticate_async)
+    try:
+        user = await auth_service.authenticate_async(
+            db, email=form_data.username, password=form_data.password
+        )
+    except PasswordPoolBusy:
+        # Demasiados logins a la vez: se rechaza rápido en vez de encolar
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Demasiados intentos de login, intenta de nuevo en unos segundos",
+            headers={"Retry-After": "1"},
+        )
     
     if not user:
         raise HTTPException(
@@ -39,7 +55,38 @@ def login_for_access_token(
 
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = security.create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data={"sub": user.email},
+        expires_delta=access_token_expires,
+        user_id=user.id,
+        is_active=user.is_active,
+        epoch=await run_in_threadpool(auth_service.get_user_epoch, db, user.id)
     )
 
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    return {"access_token": access_token, "token_type": "bearer"}
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user_primary)
+):
+    # POST /auth/logout - Revoca el token con el que se llama hasta que expire
+    # Este worker lo rechaza al instante; los demás en la próxima recarga de revocaciones
+    token_data = decode_token(token)
+    if token_data.jti is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El token no se puede revocar")
+    auth_service.revoke_token(db, token_data.jti, token_data.expires_at)
+    return None
+
+@router.post("/users/{user_id}/deactivate", status_code=status.HTTP_204_NO_CONTENT)
+def deactivate_user(
+    user_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user_primary)
+):
+    # POST /auth/users/{id}/deactivate - Desactiva al usuario e invalida sus tokens (solo admins)
+    user = db.get(User, user_id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado")
+    auth_service.deactivate_user(db, user)
+    return None
@@ -0,0 +1,32 @@
+# Endpoints de diagnóstico (solo admins, DEBUG_PROFILING_ENABLED=true)
+# GET /profile corre el profiler sobre el tráfico real del worker que atiende el request
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.profiler import ProfileMode, ProfilerBusy, run_profile
+
+# El control de admin lo agrega build_api_router (sync o async según el modo)
+router = APIRouter()
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile(
+    seconds: float = Query(10, gt=0, le=settings.DEBUG_PROFILE_MAX_SECONDS),
+    mode: ProfileMode = ProfileMode.CPU,
+    interval_ms: float = Query(10, ge=1, le=1000),
+    include_idle: bool = False
+):
+    # Devuelve collapsed stacks: `flamegraph.pl perfil.txt > perfil.svg` o abrirlo en speedscope
+    # mode=cpu cuenta muestras cada interval_ms; mode=alloc pesa cada pila en bytes (tracemalloc)
+    # El muestreo corre en un hilo aparte: el event loop sigue atendiendo mientras tanto
+    try:
+        return await run_in_threadpool(
+            run_profile, mode, seconds, interval=interval_ms / 1000, include_idle=include_idle
+        )
+    except ProfilerBusy:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Ya hay un profile corriendo en este worker"
+        )
@@ -0,0 +1,113 @@
+# Piezas compartidas por los endpoints de tareas sync (tasks.py) y async (async_tasks.py)
+# Validación de parámetros, headers y armado de respuestas; cada router solo
+# cambia la sesión y cómo llama al servicio (directo o con await)
+
+from fastapi import HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.etag import etag_matches, not_modified, task_etag, tasks_etag
+from app.core.msgpack_route import msgpack_requested
+from app.core.responses import rows_response
+from app.schemas.task import TaskCreate, TaskExportFormat, TaskSort
+from app.services import import_service, stats_service, task_service
+
+def list_sort(q: Optional[str], cursor: Optional[str], sort: Optional[TaskSort]) -> TaskSort:
+    # La búsqueda se ordena por relevancia y se pagina con page/page_size
+    if q is not None and (cursor is not None or sort is not None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="La búsqueda no se puede combinar con cursor ni sort"
+        )
+    return sort or TaskSort.CREATED_AT
+
+def decode_cursor(cursor: str, sort: TaskSort):
+    # Cursor vacío = primera página
+    try:
+        return task_service.decode_cursor(cursor, sort) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+
+def set_total(response: Response, total) -> None:
+    # total = (cantidad, fuente): "counters" y "exact" son exactos, "estimate" aproximado
+    count, source = total
+    response.headers["X-Total-Count"] = str(count)
+    response.headers["X-Total-Count-Source"] = source
+
+def list_body(tasks, response: Response):
+    # Con TASKS_FAST_SERIALIZATION las filas ya vienen planas y se escriben con orjson;
+    # si no (o si se pidió msgpack), FastAPI las valida y serializa con response_model
+    if settings.TASKS_FAST_SERIALIZATION and not msgpack_requested.get():
+        return rows_response(tasks, task_service.TASK_OUT_FIELDS, response)
+    return tasks
+
+def list_response(
+    response: Response,
+    tasks,
+    total: Optional[Tuple[int, str]],
+    if_none_match: Optional[str],
+    page_size: int,
+    cursor_sort: Optional[TaskSort] = None
+):
+    # Headers del listado (total, ETag, X-Next-Cursor) y el cuerpo, o 304
+    # En modo cursor (cursor_sort) tasks trae una fila extra para saber si hay página siguiente
+    if total is not None:
+        set_total(response, total)
+    # El ETag incluye la fila extra: si aparece o desaparece cambia X-Next-Cursor
+    etag = tasks_etag(tasks, total)
+    if cursor_sort is not None and len(tasks) > page_size:
+        tasks = tasks[:page_size]
+        response.headers["X-Next-Cursor"] = task_service.encode_cursor(tasks[-1], cursor_sort)
+    return not_modified(response, etag, if_none_match) or list_body(tasks, response)
+
+def stats_range(date_from: Optional[date], date_to: Optional[date]) -> Tuple[date, date]:
+    try:
+        return stats_service.stats_range(date_from, date_to, settings.TASK_STATS_MAX_DAYS)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+def export_response(chunks, fmt: TaskExportFormat) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type=task_service.EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{fmt.value}"'}
+    )
+
+def found(task):
+    if not task:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tarea no encontrada")
+    return task
+
+def check_if_match(if_match: Optional[str], task) -> None:
+    # Con If-Match solo se actualiza si el cliente tiene la última versión (si no, 412)
+    if if_match is not None and not etag_matches(if_match, task_etag(task), weak=False):
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="La tarea cambió, vuelve a leerla")
+
+def stale_update(if_match: Optional[str]) -> HTTPException:
+    # Otro request la actualizó entre la lectura y el UPDATE
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED if if_match is not None else status.HTTP_409_CONFLICT,
+        detail="La tarea cambió, vuelve a leerla"
+    )
+
+def bulk_items(items: List[Dict[str, Any]]):
+    # Los items inválidos no frenan a los demás, se reportan por índice
+    valid, errors = task_service.validate_bulk_items(items)
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[error.model_dump() for error in errors]
+        )
+    return valid, errors
+
+async def import_ndjson(request, flush: Callable[[List[TaskCreate]], Awaitable[int]]):
+    # El body se lee en streaming, nunca se carga entero en memoria
+    return await import_service.import_tasks(
+        request.stream(),
+        flush,
+        batch_size=settings.TASKS_IMPORT_BATCH_SIZE,
+        max_line_bytes=settings.TASKS_IMPORT_MAX_LINE_BYTES,
+        max_errors=settings.TASKS_IMPORT_MAX_ERRORS
+    )
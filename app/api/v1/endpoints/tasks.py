@@ -1,73 +1,210 @@
 # Endpoints de tareas
 # CRUD completo: listar, crear, actualizar, eliminar
 # Todos requieren autenticación (token JWT)
+# La validación y el armado de respuestas se comparten con async_tasks.py (task_common.py)
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Body, Depends, Header, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.orm.exc import StaleDataError
+from datetime import date
+from typing import Any, Dict, List, Optional
 
-from app.db.session import get_db
-from app.schemas.task import TaskCreate, TaskOut, TaskUpdate
-from app.services import task_service
-from app.core.dependencies import get_current_active_user
+from app.api.v1.endpoints import task_common
+from app.core.config import settings
+from app.core.etag import not_modified, task_etag
+from app.core.msgpack_route import MsgPackRoute
+from app.db.session import get_db, get_read_db
+from app.schemas.task import (
+    TaskBulkCreateResult,
+    TaskBulkFilter,
+    TaskBulkResult,
+    TaskBulkUpdate,
+    TaskCreate,
+    TaskExportFormat,
+    TaskFilter,
+    TaskImportResult,
+    TaskOut,
+    TaskSort,
+    TaskStats,
+    TaskUpdate,
+)
+from app.services import stats_service, task_service
+from app.core.dependencies import get_current_active_user, get_current_active_user_primary
 from app.models.user import User
 
-router = APIRouter()
+# MsgPackRoute: además de JSON acepta y responde application/msgpack
+router = APIRouter(route_class=MsgPackRoute)
 
 @router.get("/", response_model=List[TaskOut])
 def read_tasks(
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db),
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor opaco; vacío para la primera página"),
+    q: Optional[str] = Query(None, min_length=1, max_length=200, description="Búsqueda por texto en título y descripción"),
+    filters: TaskFilter = Depends(),
+    sort: Optional[TaskSort] = Query(None, description="Orden del listado; por defecto created_at"),
+    with_total: bool = Query(False, description="Agrega X-Total-Count con el total del listado (ignora la paginación)"),
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_active_user)
 ):
     # GET /tasks - Lista todas las tareas con paginación
+    sort = task_common.list_sort(q, cursor, sort)
     skip = (page - 1) * page_size
-    tasks = task_service.get_tasks(db, skip=skip, limit=page_size)
-    return tasks
+    as_rows = settings.TASKS_FAST_SERIALIZATION
+    if q is not None:
+        # Búsqueda ordenada por relevancia
+        tasks = task_service.search_tasks(db, q=q, skip=skip, limit=page_size, filters=filters, as_rows=as_rows)
+    elif cursor is None:
+        # Modo clásico page/page_size (OFFSET)
+        tasks = task_service.get_tasks(db, skip=skip, limit=page_size, filters=filters, sort=sort, as_rows=as_rows)
+    else:
+        # Modo cursor (keyset): la latencia no depende de la profundidad
+        after = task_common.decode_cursor(cursor, sort)
+        tasks = task_service.get_tasks(
+            db, limit=page_size + 1, after=after, filters=filters, sort=sort, as_rows=as_rows
+        )
+    total = task_service.count_tasks(db, filters, q, settings.TASKS_EXACT_COUNT_LIMIT) if with_total else None
+    cursor_sort = sort if q is None and cursor is not None else None
+    return task_common.list_response(response, tasks, total, if_none_match, page_size, cursor_sort)
+
+@router.get("/stats", response_model=TaskStats)
+def read_task_stats(
+    date_from: Optional[date] = Query(None, description="Primer día (UTC); por defecto hace 29 días"),
+    date_to: Optional[date] = Query(None, description="Último día (UTC); por defecto hoy"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    # GET /tasks/stats - Totales por estado y creadas/completadas por día
+    date_from, date_to = task_common.stats_range(date_from, date_to)
+    return stats_service.get_stats(db, date_from, date_to)
+
+@router.get("/export")
+def export_tasks(
+    fmt: TaskExportFormat = Query(TaskExportFormat.NDJSON, alias="format"),
+    filters: TaskFilter = Depends(),
+    sort: TaskSort = Query(TaskSort.CREATED_AT),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    # GET /tasks/export - Descarga todas las tareas (con los mismos filtros del listado)
+    # La sesión de get_read_db se cierra antes de que arranque el stream,
+    # así que el generador abre la suya sobre el mismo engine
+    bind = db.get_bind()
+
+    def stream():
+        with Session(bind=bind) as session:
+            yield from task_service.export_tasks(
+                session, fmt, filters=filters, sort=sort, chunk_size=settings.TASKS_EXPORT_CHUNK_SIZE
+            )
+
+    return task_common.export_response(stream(), fmt)
 
 @router.get("/{task_id}", response_model=TaskOut)
 def read_task(
     task_id: int,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db),
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_active_user)
 ):
     # GET /tasks/{id} - Obtiene una tarea específica
-    task = task_service.get_task(db, task_id=task_id)
-    if not task:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tarea no encontrada")
-    return task
+    # Con If-None-Match igual al ETag responde 304 sin cuerpo
+    task = task_common.found(task_service.get_task(db, task_id=task_id))
+    return not_modified(response, task_etag(task), if_none_match) or task
 
 @router.post("/", response_model=TaskOut, status_code=status.HTTP_201_CREATED)
 def create_task(
     task_in: TaskCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_active_user_primary)
 ):
     # POST /tasks - Crea una nueva tarea
     return task_service.create_task(db, obj_in=task_in)
 
+@router.post("/bulk", response_model=TaskBulkCreateResult, status_code=status.HTTP_201_CREATED)
+def create_tasks_bulk(
+    items: List[Dict[str, Any]] = Body(..., max_length=settings.TASKS_BULK_MAX_ITEMS),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user_primary)
+):
+    # POST /tasks/bulk - Crea muchas tareas en un solo request
+    valid, errors = task_common.bulk_items(items)
+    created = task_service.create_tasks(db, objs_in=valid, chunk_size=settings.TASKS_BULK_CHUNK_SIZE)
+    return {"created": created, "errors": errors}
+
+@router.post(
+    "/import",
+    response_model=TaskImportResult,
+    openapi_extra={"requestBody": {
+        "required": True,
+        "content": {"application/x-ndjson": {"schema": {"type": "string"}}}
+    }}
+)
+async def import_tasks(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user_primary)
+):
+    # POST /tasks/import - Importa tareas desde un NDJSON (una tarea por línea)
+    # Es async def para leer el body en streaming; los INSERT van al threadpool
+    async def flush(batch):
+        created = await run_in_threadpool(
+            task_service.create_tasks, db, batch, settings.TASKS_BULK_CHUNK_SIZE
+        )
+        return len(created)
+
+    return await task_common.import_ndjson(request, flush)
+
+@router.patch("/bulk", response_model=TaskBulkResult)
+def update_tasks_bulk(
+    bulk_in: TaskBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user_primary)
+):
+    # PATCH /tasks/bulk - Actualiza todas las tareas que cumplen el filtro
+    affected = task_service.update_tasks(
+        db, criteria=bulk_in, obj_in=bulk_in.changes, chunk_size=settings.TASKS_BULK_CHUNK_SIZE
+    )
+    return {"affected": affected}
+
+@router.delete("/bulk", response_model=TaskBulkResult)
+def delete_tasks_bulk(
+    criteria: TaskBulkFilter,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user_primary)
+):
+    # DELETE /tasks/bulk - Elimina todas las tareas que cumplen el filtro
+    affected = task_service.delete_tasks(db, criteria=criteria, chunk_size=settings.TASKS_BULK_CHUNK_SIZE)
+    return {"affected": affected}
+
 @router.put("/{task_id}", response_model=TaskOut)
 def update_task(
     task_id: int,
     task_in: TaskUpdate,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    if_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_active_user_primary)
 ):
     # PUT /tasks/{id} - Actualiza una tarea
-    task = task_service.get_task(db, task_id=task_id)
-    if not task:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tarea no encontrada")
-    return task_service.update_task(db, db_obj=task, obj_in=task_in)
+    task = task_common.found(task_service.get_task(db, task_id=task_id))
+    task_common.check_if_match(if_match, task)
+    try:
+        task = task_service.update_task(db, db_obj=task, obj_in=task_in)
+    except StaleDataError:
+        raise task_common.stale_update(if_match)
+    response.headers["ETag"] = task_etag(task)
+    return task
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_task(
     task_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_active_user_primary)
 ):
     # DELETE /tasks/{id} - Elimina una tarea
-    task = task_service.delete_task(db, task_id=task_id)
-    if not task:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tarea no encontrada")
+    task_common.found(task_service.delete_task(db, task_id=task_id))
     return None
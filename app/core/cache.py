@@ -0,0 +1,139 @@
+# Cache de lectura para entidades (p.ej. GET /tasks/{id})
+# CacheBackend es la interfaz; LRUTTLCache es la implementación en memoria
+# de este proceso. Un backend compartido (Redis, memcached) solo tiene que
+# implementar los mismos métodos
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from app.core.config import settings
+
+class CacheBackend(ABC):
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[Any]:
+        # Retorna el valor o None si no está (o expiró)
+        ...
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> None:
+        ...
+
+    @abstractmethod
+    def token(self) -> int:
+        # Marca que se toma antes de leer de la BD, para set_if_fresh
+        ...
+
+    @abstractmethod
+    def set_if_fresh(self, key: Hashable, value: Any, token: int) -> bool:
+        # set() solo si nadie hizo set/delete de key después de token
+        # Así una lectura lenta no vuelve a meter un valor que otro ya reemplazó o borró
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        ...
+
+class LRUTTLCache(CacheBackend):
+    # LRU con expiración por TTL y tamaño máximo, seguro entre hilos
+    def __init__(self, max_items: int, ttl_seconds: float):
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Última escritura (set/delete) de cada key, con un reloj lógico
+        # Se recuerdan hasta max_items keys; las olvidadas quedan bajo _forgotten_tick
+        self._tick = 0
+        self._written: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._forgotten_tick = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.max_items <= 0:
+            return
+        with self._lock:
+            self._mark_written(key)
+            self._store(key, value)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._mark_written(key)
+            self._data.pop(key, None)
+
+    def token(self) -> int:
+        with self._lock:
+            return self._tick
+
+    def set_if_fresh(self, key: Hashable, value: Any, token: int) -> bool:
+        if self.max_items <= 0:
+            return False
+        with self._lock:
+            if self._written.get(key, self._forgotten_tick) > token:
+                return False
+            self._store(key, value)
+            return True
+
+    def _mark_written(self, key: Hashable) -> None:
+        self._tick += 1
+        self._written[key] = self._tick
+        self._written.move_to_end(key)
+        while len(self._written) > max(self.max_items, 1):
+            _, tick = self._written.popitem(last=False)
+            self._forgotten_tick = tick
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (value, time.monotonic() + self.ttl_seconds)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_items:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            # Las lecturas en curso tampoco pueden guardar lo que leyeron antes de limpiar
+            self._tick += 1
+            self._written.clear()
+            self._forgotten_tick = self._tick
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._data),
+            "max_items": self.max_items,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+# Cache de tareas por id (TASK_CACHE_MAX_ITEMS=0 lo desactiva)
+task_cache: CacheBackend = LRUTTLCache(
+    max_items=settings.TASK_CACHE_MAX_ITEMS,
+    ttl_seconds=settings.TASK_CACHE_TTL_SECONDS,
+)
@@ -2,7 +2,7 @@
 # Lee las variables del archivo .env
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import List, Optional
 
 class Settings(BaseSettings):
     # Info de la API
@@ -16,16 +16,113 @@ class Settings(BaseSettings):
     DB_USER: str
     DB_PASSWORD: str
 
+    # Si es True, los endpoints usan AsyncEngine y sesiones async
+    DB_ASYNC: bool = False
+
+    # Pool de conexiones (por proceso, igual para el motor sync y el async)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10  # Conexiones extra por encima de DB_POOL_SIZE en picos
+    DB_POOL_TIMEOUT: float = 30  # Segundos esperando una conexión libre antes de fallar
+    DB_POOL_RECYCLE: int = 1800  # Segundos de vida de una conexión (-1 = sin límite)
+    DB_POOL_PRE_PING: bool = True  # Prueba la conexión al sacarla (descarta las muertas tras un failover)
+    # Ejecuciones de una misma query antes de que psycopg la prepare en el servidor
+    # (-1 = nunca, necesario detrás de PgBouncer en modo transaction)
+    DB_PREPARE_THRESHOLD: int = 5
+
+    # Réplicas de lectura, URLs separadas por coma (vacío = todo va al primario)
+    DB_READ_REPLICA_URLS: str = ""
+    # Segundos que las lecturas de un cliente van al primario después de que escribe
+    DB_READ_AFTER_WRITE_SECONDS: float = 5
+
+    # Instrumentación de SQL (ver app/db/instrumentation.py)
+    SQL_SLOW_QUERY_MS: float = 500  # Sentencias más lentas se loguean con params y ruta (0 = no)
+    # Veces que un request puede repetir la misma sentencia antes de avisar de un N+1 (0 = no revisar)
+    SQL_REPEATED_STATEMENT_LIMIT: int = 0
+    SQL_REPEATED_STATEMENT_RAISE: bool = False  # True = falla el request en vez de solo avisar
+
     # Cosas de seguridad JWT
     SECRET_KEY: str  
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Emails de administradores, separados por coma (pueden usar /debug)
+    ADMIN_EMAILS: str = ""
+
+    # Profiler en /api/v1/debug/profile (apagado: la ruta ni se registra)
+    DEBUG_PROFILING_ENABLED: bool = False
+    DEBUG_PROFILE_MAX_SECONDS: float = 60
+
+    # Métricas Prometheus en /metrics (middleware de latencia por ruta)
+    METRICS_ENABLED: bool = True
+
+    # Header Server-Timing con el tiempo de cada fase del request (ver app/core/timing.py)
+    SERVER_TIMING_ENABLED: bool = True
+    SERVER_TIMING_LOG: bool = False  # Además, una línea JSON por request en el logger app.core.timing
+
+    # Modo stateless: el usuario sale de los claims del token, sin query por request
+    # Las desactivaciones se aplican con una lista de revocación en memoria
+    AUTH_STATELESS: bool = False
+    AUTH_REVOCATION_REFRESH_SECONDS: float = 30
+
+    # Costo de bcrypt para passwords nuevas; los hashes con otro costo se rehashean en el login
+    BCRYPT_ROUNDS: int = 12
+    # Si es > 0, al arrancar se elige el costo cuyo verify tarda ~estos ms en el host (ignora BCRYPT_ROUNDS)
+    BCRYPT_TARGET_MS: float = 0
+
+    # Pool de procesos para bcrypt (0 workers = se calcula en el mismo hilo)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 32  # Pendientes máximos antes de responder 503
+
+    # Cache de lectura de tareas por id (0 items = desactivado)
+    TASK_CACHE_MAX_ITEMS: int = 10000
+    TASK_CACHE_TTL_SECONDS: float = 60
+
+    # Operaciones masivas de tareas
+    TASKS_BULK_MAX_ITEMS: int = 10000  # Máximo de items por request
+    TASKS_BULK_CHUNK_SIZE: int = 1000  # Filas por INSERT multi-fila
+
+    # Totales de GET /tasks?with_total=true (header X-Total-Count)
+    # Contadores por estado en task_status_counts: totales exactos en O(estados), pero
+    # cada escritura bloquea la fila de su estado hasta el commit y las escrituras
+    # concurrentes del mismo estado se serializan. Apagados por defecto: sin ellos el
+    # total sale de un COUNT acotado (o del estimado de PostgreSQL sin filtros).
+    # Antes de prenderlos hay que recalcularlos (make backfill-stats)
+    TASK_COUNTERS_ENABLED: bool = False
+    # Con otros filtros se cuenta exacto hasta este número; por encima, estimado del planner
+    TASKS_EXACT_COUNT_LIMIT: int = 10000
+
+    # Rollup diario task_daily_stats para GET /tasks/stats: mismo costo que los
+    # contadores (las filas del día en curso se bloquean hasta el commit) y por eso
+    # también apagado por defecto; sin él las estadísticas agrupan tasks en el rango.
+    # Antes de prenderlo hay que recalcularlo (make backfill-stats)
+    TASK_STATS_ENABLED: bool = False
+    # Días máximos que se pueden pedir de una vez en GET /tasks/stats
+    TASK_STATS_MAX_DAYS: int = 366
+
+    # Filas que se traen del cursor del servidor por vuelta en GET /tasks/export
+    TASKS_EXPORT_CHUNK_SIZE: int = 1000
+
+    # Listados con filas Core + orjson en vez de ORM + response_model
+    TASKS_FAST_SERIALIZATION: bool = False
+
+    # Import NDJSON en streaming
+    TASKS_IMPORT_BATCH_SIZE: int = 1000  # Tareas válidas por commit
+    TASKS_IMPORT_MAX_LINE_BYTES: int = 64 * 1024  # Líneas más largas se rechazan
+    TASKS_IMPORT_MAX_ERRORS: int = 1000  # Errores que se devuelven en la respuesta
+
     @property
     def SQLALCHEMY_DATABASE_URL(self) -> str:
         # Arma la URL de conexión a la base de datos
         return f"postgresql+psycopg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def read_replica_urls(self) -> List[str]:
+        return [url.strip() for url in self.DB_READ_REPLICA_URLS.split(",") if url.strip()]
+
+    @property
+    def admin_emails(self) -> List[str]:
+        return [email.strip().lower() for email in self.ADMIN_EMAILS.split(",") if email.strip()]
+
     model_config = SettingsConfigDict(
         env_file=".env", 
         case_sensitive=True,
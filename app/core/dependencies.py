@@ -1,46 +1,196 @@
 # Dependencias para proteger los endpoints
 # Verifica el token JWT y obtiene el usuario actual
 
+from datetime import datetime, timezone
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, Union
 
 from app.core.config import settings
-from app.db.session import get_db
+from app.core.revocation import revocation_cache
+from app.core.timing import span
+from app.db.session import get_async_db, get_async_read_db, get_db, get_read_db
+from app.models.revocation import RevokedToken
 from app.models.user import User
-from app.schemas.token import TokenData
+from app.schemas.token import Principal, TokenData
 
 # Le dice a FastAPI dónde está el endpoint de login
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
-    # Decodifica el token y busca al usuario en la BD
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="No se pudieron validar las credenciales",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def decode_token(token: str) -> TokenData:
+    # Decodifica el token y devuelve sus datos (compartido por sync y async)
     try:
         # Intenta decodificar el token
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        with span("jwt"):
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
-            raise credentials_exception
-        token_data = TokenData(email=email)
+            raise _credentials_exception()
+        exp = payload.get("exp")
+        return TokenData(
+            email=email,
+            user_id=payload.get("uid"),
+            is_active=payload.get("act"),
+            epoch=payload.get("ep", 0),
+            jti=payload.get("jti"),
+            expires_at=datetime.fromtimestamp(exp, timezone.utc) if exp is not None else None,
+        )
     except JWTError:
         # Si el token es inválido, lanza error
-        raise credentials_exception
+        raise _credentials_exception()
+
+def _stateless_principal(token_data: TokenData) -> Optional[Principal]:
+    # Arma el usuario desde los claims si el modo stateless está activo
+    # Tokens viejos sin uid/act siguen el camino normal (query a la BD)
+    if not settings.AUTH_STATELESS or token_data.user_id is None or token_data.is_active is None:
+        return None
+    if revocation_cache.is_revoked(token_data):
+        raise _credentials_exception()
+    return Principal(id=token_data.user_id, email=token_data.email, is_active=token_data.is_active)
+
+def _refresh_revocations(primary: Session, db: Session) -> bool:
+    # Las revocaciones se recargan siempre del primario: una réplica atrasada
+    # podría devolver la lista de antes del logout justo después de invalidate()
+    # La sesión no abre conexión salvo cuando toca recargar; si no es la del
+    # endpoint se libera enseguida para no retener dos conexiones
+    loaded = revocation_cache.refresh_if_stale(primary)
+    if primary is not db:
+        primary.close()
+    return loaded
+
+def _resolve_user(token_data: TokenData, db: Session, primary: Session) -> Union[User, Principal]:
+    loaded = _refresh_revocations(primary, db)
+    if settings.AUTH_STATELESS and loaded:
+        principal = _stateless_principal(token_data)
+        if principal is not None:
+            return principal
+    # Tokens revocados (logout, usuario desactivado) tampoco valen buscando en la BD
+    if loaded and revocation_cache.is_revoked(token_data):
+        raise _credentials_exception()
     
     # Busca el usuario por email
-    user = db.query(User).filter(User.email == token_data.email).first()
+    with span("user"):
+        user = db.query(User).filter(User.email == token_data.email).first()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     return user
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_read_db),
+    primary: Session = Depends(get_db)
+) -> Union[User, Principal]:
+    # Decodifica el token y busca al usuario en la BD (puede ser una réplica)
+    return _resolve_user(decode_token(token), db, primary)
+
+def get_current_user_primary(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Union[User, Principal]:
+    # Para endpoints de escritura: FastAPI resuelve get_db una vez por request,
+    # así que el usuario se busca en la misma sesión (y conexión) que usa el endpoint
+    return _resolve_user(decode_token(token), db, db)
+
+def get_current_active_user(current_user: Union[User, Principal] = Depends(get_current_user)) -> Union[User, Principal]:
     # Verifica que el usuario esté activo
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Usuario inactivo")
     return current_user
+
+def get_current_active_user_primary(
+    current_user: Union[User, Principal] = Depends(get_current_user_primary)
+) -> Union[User, Principal]:
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Usuario inactivo")
+    return current_user
+
+async def _is_revoked_async(token_data: TokenData, db: AsyncSession, primary: AsyncSession) -> Optional[bool]:
+    # Como _refresh_revocations; None = usar el estado ya cargado en revocation_cache
+    try:
+        # Sin datos de revocación todavía se sigue por la BD
+        if await primary.run_sync(revocation_cache.refresh_if_stale, False):
+            return None
+        # Otro hilo está cargando las revocaciones: se consulta el jti directo
+        return token_data.jti is not None and await primary.get(RevokedToken, token_data.jti) is not None
+    finally:
+        if primary is not db:
+            await primary.close()
+
+async def _resolve_user_async(token_data: TokenData, db: AsyncSession, primary: AsyncSession) -> Union[User, Principal]:
+    revoked = await _is_revoked_async(token_data, db, primary)
+    if revoked is None:
+        if settings.AUTH_STATELESS:
+            principal = _stateless_principal(token_data)
+            if principal is not None:
+                return principal
+        revoked = revocation_cache.is_revoked(token_data)
+    if revoked:
+        raise _credentials_exception()
+
+    with span("user"):
+        user = (await db.scalars(select(User).where(User.email == token_data.email))).first()
+    if user is None:
+        raise _credentials_exception()
+    return user
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_read_db),
+    primary: AsyncSession = Depends(get_async_db)
+) -> Union[User, Principal]:
+    # Igual que get_current_user pero con sesión async
+    return await _resolve_user_async(decode_token(token), db, primary)
+
+async def get_current_user_primary_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> Union[User, Principal]:
+    # Igual que get_current_user_primary: misma sesión que el endpoint
+    return await _resolve_user_async(decode_token(token), db, db)
+
+async def get_current_active_user_async(
+    current_user: Union[User, Principal] = Depends(get_current_user_async)
+) -> Union[User, Principal]:
+    # Verifica que el usuario esté activo
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Usuario inactivo")
+    return current_user
+
+async def get_current_active_user_primary_async(
+    current_user: Union[User, Principal] = Depends(get_current_user_primary_async)
+) -> Union[User, Principal]:
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Usuario inactivo")
+    return current_user
+
+def _require_admin(current_user: Union[User, Principal]) -> Union[User, Principal]:
+    if current_user.email.lower() not in settings.admin_emails:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Se requieren permisos de administrador")
+    return current_user
+
+def get_current_admin_user(current_user: Union[User, Principal] = Depends(get_current_active_user)) -> Union[User, Principal]:
+    # Usuario activo cuyo email está en ADMIN_EMAILS
+    return _require_admin(current_user)
+
+async def get_current_admin_user_async(
+    current_user: Union[User, Principal] = Depends(get_current_active_user_async)
+) -> Union[User, Principal]:
+    return _require_admin(current_user)
+
+def get_current_admin_user_primary(
+    current_user: Union[User, Principal] = Depends(get_current_active_user_primary)
+) -> Union[User, Principal]:
+    return _require_admin(current_user)
+
+async def get_current_admin_user_primary_async(
+    current_user: Union[User, Principal] = Depends(get_current_active_user_primary_async)
+) -> Union[User, Principal]:
+    return _require_admin(current_user)
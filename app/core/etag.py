@@ -0,0 +1,48 @@
+# ETags para lecturas condicionales (If-None-Match) y escrituras (If-Match)
+# Se calculan con id y version, sin serializar la respuesta
+
+import hashlib
+from typing import Iterable, Optional, Tuple
+
+from fastapi import Response, status
+from app.models.task import Task
+
+def task_etag(task: Task) -> str:
+    # ETag fuerte de una tarea: cambia cada vez que sube su version
+    return f'"{task.id}-{task.version}"'
+
+def tasks_etag(tasks: Iterable[Task], total: Optional[Tuple[int, str]] = None) -> str:
+    # ETag de una página: hash de los (id, version) en orden
+    # Cambia si se edita, agrega, borra o reordena cualquier tarea de la página
+    # Con total (with_total) también entra X-Total-Count: un 304 no puede esconder
+    # que cambió el total aunque la página sea la misma
+    digest = hashlib.sha1()
+    for task in tasks:
+        digest.update(f"{task.id}:{task.version};".encode())
+    if total is not None:
+        count, source = total
+        digest.update(f"total:{count}:{source}".encode())
+    return f'"{digest.hexdigest()}"'
+
+def etag_matches(header: Optional[str], etag: str, weak: bool = True) -> bool:
+    # Compara un If-None-Match / If-Match con el ETag actual
+    # weak=True ignora el prefijo W/ (comparación débil, la que pide If-None-Match)
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if weak and candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+def not_modified(response: Response, etag: str, if_none_match: Optional[str]) -> Optional[Response]:
+    # Agrega el ETag a la respuesta; si el cliente ya tiene esa versión
+    # devuelve un 304 vacío y el endpoint se saltea la serialización
+    response.headers["ETag"] = etag
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return None
@@ -0,0 +1,199 @@
+# Métricas en formato Prometheus (texto, versión 0.0.4)
+# Registro en memoria por proceso, sin dependencias externas: con varios
+# workers cada uno expone las suyas y Prometheus las suma por instancia
+
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import task_cache
+
+LabelValues = Tuple[str, ...]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}"
+            for labels, value in values
+        ]
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+class CounterFunc(_Metric):
+    # Valor leído al renderizar, para contadores que ya lleva otro objeto
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, read: Callable[[], float]):
+        super().__init__(name, documentation)
+        self._read = read
+
+    def render(self) -> List[str]:
+        return self._header() + [f"{self.name} {_format_number(self._read())}"]
+
+class GaugeFunc(CounterFunc):
+    kind = "gauge"
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Iterable[float] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # Por cada combinación de labels: [conteo por bucket (no acumulado), suma]
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = ([0] * len(self.buckets), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = [(labels, list(counts), total[0]) for labels, (counts, total) in self._values.items()]
+        lines = self._header()
+        bucket_names = self.labelnames + ("le",)
+        for labels, counts, total in values:
+            cumulative = 0
+            for upper, count in zip(self.buckets, counts):
+                cumulative += count
+                bucket_labels = _format_labels(bucket_names, labels + (_format_number(upper),))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_number(total)}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self._metrics for line in metric.render()) + "\n"
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Buckets por defecto de los clientes oficiales de Prometheus (segundos)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+registry = Registry()
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "Requests HTTP atendidos", ("method", "route", "status")
+))
+http_requests_in_progress = registry.register(Gauge(
+    "http_requests_in_progress", "Requests HTTP en curso", ("method",)
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "Latencia de los requests HTTP", ("method", "route", "status"), LATENCY_BUCKETS
+))
+http_response_size_bytes = registry.register(Histogram(
+    "http_response_size_bytes", "Tamaño del cuerpo de las respuestas HTTP", ("method", "route", "status"), SIZE_BUCKETS
+))
+
+# Contadores del cache de tareas (acumulados desde que arrancó el proceso)
+task_cache_hits_total = registry.register(CounterFunc(
+    "task_cache_hits_total", "Lecturas del cache de tareas que encontraron la entrada", lambda: task_cache.stats()["hits"]
+))
+task_cache_misses_total = registry.register(CounterFunc(
+    "task_cache_misses_total", "Lecturas del cache de tareas sin entrada (o vencida)", lambda: task_cache.stats()["misses"]
+))
+task_cache_evictions_total = registry.register(CounterFunc(
+    "task_cache_evictions_total", "Entradas del cache de tareas desalojadas por tamaño", lambda: task_cache.stats()["evictions"]
+))
+task_cache_size = registry.register(GaugeFunc(
+    "task_cache_size", "Entradas en el cache de tareas", lambda: task_cache.stats()["size"]
+))
+
+def route_template(scope: Scope) -> str:
+    # El template de la ruta (/api/v1/tasks/{task_id}), nunca el path real:
+    # con ids en el label la cantidad de series crecería sin límite
+    route = scope.get("route")
+    path = getattr(route, "path_format", None) or getattr(route, "path", None)
+    return path or "unmatched"
+
+class MetricsMiddleware:
+    # Middleware ASGI: mide cada request HTTP y lo suma al registro
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        http_requests_in_progress.inc((method,))
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_progress.dec((method,))
+            # El router completa scope["route"] al resolver la ruta
+            labels = (method, route_template(scope), str(status_code))
+            http_requests_total.inc(labels)
+            http_request_duration_seconds.observe(elapsed, labels)
+            http_response_size_bytes.observe(size, labels)
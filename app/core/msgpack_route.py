@@ -0,0 +1,85 @@
+# Negociación de contenido MessagePack para los routers de tareas
+# Accept: application/msgpack -> la respuesta sale en msgpack (mismo esquema que el JSON)
+# Content-Type: application/msgpack -> el body se decodifica y valida igual que el JSON
+
+from contextvars import ContextVar
+from typing import Any, Callable, Coroutine, Optional
+
+import msgpack
+from fastapi import Request, Response
+
+from app.core.timing import TimedRoute
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+# True mientras se atiende un request que pidió msgpack
+# Lo leen los endpoints que pueden saltearse response_model (ver TASKS_FAST_SERIALIZATION)
+msgpack_requested: ContextVar[bool] = ContextVar("msgpack_requested", default=False)
+
+class MsgPackResponse(Response):
+    media_type = MSGPACK_MEDIA_TYPES[0]
+
+    def render(self, content: Any) -> bytes:
+        # content ya viene en modo JSON (fechas como string), así el esquema es el mismo
+        return msgpack.packb(content)
+
+class MsgPackRequest(Request):
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = msgpack.unpackb(await self.body())
+        return self._json
+
+def _media_type(header: str) -> str:
+    return header.split(";", 1)[0].strip().lower()
+
+def wants_msgpack(accept: Optional[str]) -> bool:
+    # msgpack solo si el cliente lo prefiere a JSON; sin Accept o con */* sigue siendo JSON
+    if not accept:
+        return False
+    quality = {}
+    for item in accept.split(","):
+        media_type, *params = [part.strip() for part in item.split(";")]
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        quality[media_type.lower()] = q
+    msgpack_q = max(quality.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES)
+    return msgpack_q > 0 and msgpack_q >= quality.get("application/json", 0.0)
+
+def _as_json_request(request: Request) -> Request:
+    # FastAPI solo llama a request.json() si el Content-Type es JSON: la copia
+    # del scope lo declara JSON y MsgPackRequest.json() decodifica msgpack
+    headers = [
+        (name, b"application/json" if name == b"content-type" else value)
+        for name, value in request.scope["headers"]
+    ]
+    return MsgPackRequest({**request.scope, "headers": headers}, request.receive)
+
+class MsgPackRoute(TimedRoute):
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        json_handler = super().get_route_handler()
+        # Segundo handler de la misma ruta que serializa con MsgPackResponse
+        response_class = self.response_class
+        self.response_class = MsgPackResponse
+        msgpack_handler = super().get_route_handler()
+        self.response_class = response_class
+
+        async def route_handler(request: Request) -> Response:
+            if _media_type(request.headers.get("content-type", "")) in MSGPACK_MEDIA_TYPES:
+                request = _as_json_request(request)
+            use_msgpack = wants_msgpack(request.headers.get("accept"))
+            token = msgpack_requested.set(use_msgpack)
+            try:
+                response = await (msgpack_handler if use_msgpack else json_handler)(request)
+            finally:
+                msgpack_requested.reset(token)
+            # La misma URL responde distinto según Accept (importante con ETag y caches)
+            response.headers.append("Vary", "Accept")
+            return response
+
+        return route_handler
@@ -0,0 +1,88 @@
+# Pool de procesos para hashear y verificar passwords
+# bcrypt es pura CPU: en un proceso aparte no bloquea el GIL de los workers
+# La cola es acotada, si se llena falla al instante (PasswordPoolBusy -> 503)
+# y una ráfaga de logins solo degrada el login, no toda la API
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Optional
+
+from app.core import security
+from app.core.config import settings
+from app.core.timing import span
+
+class PasswordPoolBusy(Exception):
+    # El pool tiene todos sus workers ocupados y la cola llena
+    pass
+
+class PasswordHasherPool:
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        # Cupos = workers ocupados + trabajos esperando en la cola
+        self._slots = threading.BoundedSemaphore(max(workers, 1) + max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Se crea al primer uso; spawn evita hacer fork de un proceso con hilos
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def submit(self, fn: Callable, *args) -> Future:
+        # Encola fn(*args) o lanza PasswordPoolBusy si no hay cupo
+        if not self._slots.acquire(blocking=False):
+            raise PasswordPoolBusy()
+        try:
+            if self.workers > 0:
+                future = self._get_executor().submit(fn, *args)
+            else:
+                future = Future()
+                try:
+                    future.set_result(fn(*args))
+                except Exception as exc:
+                    future.set_exception(exc)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+password_pool = PasswordHasherPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    # Igual que security.verify_password pero corre en el pool
+    with span("bcrypt"):
+        return password_pool.submit(security.verify_password, plain_password, hashed_password).result()
+
+def get_password_hash(password: str) -> str:
+    # Igual que security.get_password_hash pero corre en el pool
+    # El costo va como argumento: los workers no ven la calibración del proceso principal
+    with span("bcrypt"):
+        return password_pool.submit(security.get_password_hash, password, security.get_bcrypt_rounds()).result()
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    # Versión para endpoints async: espera el resultado sin bloquear el event loop
+    with span("bcrypt"):
+        future = password_pool.submit(security.verify_password, plain_password, hashed_password)
+        return await asyncio.wrap_future(future)
+
+async def get_password_hash_async(password: str) -> str:
+    with span("bcrypt"):
+        future = password_pool.submit(security.get_password_hash, password, security.get_bcrypt_rounds())
+        return await asyncio.wrap_future(future)
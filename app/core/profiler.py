@@ -0,0 +1,116 @@
+# Profiler por muestreo para diagnosticar un worker en producción
+# Solo usa la stdlib: cada `interval` segundos un hilo lee sys._current_frames()
+# (las pilas de todos los hilos) y cuenta cada pila. No instala hooks de
+# tracing, así el resto de los requests corre a velocidad normal.
+# La salida es "collapsed stacks" (una pila por línea, frames separados por ;
+# y el peso al final), el formato que leen flamegraph.pl y speedscope
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from enum import Enum
+
+class ProfileMode(str, Enum):
+    CPU = "cpu"  # Muestras de las pilas de todos los hilos
+    ALLOC = "alloc"  # Memoria asignada durante la ventana (tracemalloc)
+
+class ProfilerBusy(Exception):
+    # Ya hay un profile corriendo en este proceso
+    pass
+
+# Un solo profile a la vez por proceso (dos samplers se medirían entre sí)
+_profile_lock = threading.Lock()
+
+# Hilos esperando trabajo: se descartan salvo que se pidan (include_idle)
+# (archivo, función) del frame más profundo de Python
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+
+def _is_idle(frame) -> bool:
+    return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in _IDLE_FRAMES
+
+def _collapse(frame) -> str:
+    # De la raíz a la hoja, como espera el formato collapsed
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+def format_collapsed(stacks: Counter) -> str:
+    return "".join(f"{stack} {weight}\n" for stack, weight in stacks.most_common())
+
+def sample_stacks(seconds: float, interval: float = 0.01, include_idle: bool = False) -> Counter:
+    # Cuenta las pilas de todos los hilos (menos el propio) durante `seconds`
+    stacks: Counter = Counter()
+    own_thread = threading.get_ident()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_thread or (not include_idle and _is_idle(frame)):
+                continue
+            stacks[_collapse(frame)] += 1
+        time.sleep(interval)
+    return stacks
+
+def _short_path(filename: str) -> str:
+    # Rutas relativas al paquete instalado o al proyecto, más legibles en el flamegraph
+    for marker in ("site-packages" + os.sep, os.getcwd() + os.sep):
+        index = filename.find(marker)
+        if index != -1:
+            return filename[index + len(marker):]
+    return filename
+
+def sample_allocations(seconds: float, frames: int = 25) -> Counter:
+    # Bytes que se asignaron durante la ventana y siguen vivos al final, por pila
+    # Si tracemalloc ya estaba activo (PYTHONTRACEMALLOC) se compara contra el inicio
+    started_here = not tracemalloc.is_tracing()
+    if started_here:
+        tracemalloc.start(frames)
+    try:
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        before = tracemalloc.take_snapshot().filter_traces(filters)
+        time.sleep(seconds)
+        after = tracemalloc.take_snapshot().filter_traces(filters)
+    finally:
+        if started_here:
+            tracemalloc.stop()
+
+    stacks: Counter = Counter()
+    for stat in after.compare_to(before, "traceback"):
+        if stat.size_diff <= 0:
+            continue
+        # tracemalloc guarda los frames del más viejo al más reciente
+        stack = ";".join(f"{_short_path(frame.filename)}:{frame.lineno}" for frame in stat.traceback)
+        stacks[stack] += stat.size_diff
+    return stacks
+
+def run_profile(
+    mode: ProfileMode,
+    seconds: float,
+    interval: float = 0.01,
+    include_idle: bool = False
+) -> str:
+    # Corre un profile y devuelve el texto collapsed (bloquea `seconds`)
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusy()
+    try:
+        if mode == ProfileMode.ALLOC:
+            stacks = sample_allocations(seconds)
+        else:
+            stacks = sample_stacks(seconds, interval=interval, include_idle=include_idle)
+    finally:
+        _profile_lock.release()
+    return format_collapsed(stacks)
@@ -0,0 +1,21 @@
+# Respuestas JSON rápidas con orjson
+# Se usan cuando el endpoint ya tiene los datos planos (filas Core) y no
+# necesita pasar por response_model ni por el json de la stdlib
+
+from typing import Any, Iterable, Sequence
+
+import orjson
+from fastapi import Response
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        # OPT_UTC_Z escribe UTC como "Z", igual que Pydantic
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+def rows_response(rows: Iterable[Sequence], fields: Sequence[str], response: Response) -> FastJSONResponse:
+    # Arma la respuesta desde filas (tuplas) sin crear objetos ORM ni modelos Pydantic
+    # zip corta en el más corto: las columnas extra al final de la fila no se escriben
+    # Copia los headers que el endpoint puso en `response` (ETag, X-Next-Cursor)
+    return FastJSONResponse([dict(zip(fields, row)) for row in rows], headers=response.headers)
@@ -0,0 +1,64 @@
+# Cache en memoria de revocaciones para el modo stateless (AUTH_STATELESS)
+# Cada worker guarda los jti revocados y el epoch de cada usuario, y los
+# recarga desde la BD como mucho cada AUTH_REVOCATION_REFRESH_SECONDS
+
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, FrozenSet
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.revocation import RevokedToken, UserEpoch
+from app.schemas.token import TokenData
+
+class RevocationCache:
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._revoked: FrozenSet[str] = frozenset()
+        self._epochs: Dict[int, int] = {}
+        self._loaded_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def refresh(self, db: Session) -> None:
+        # Recarga los jti vigentes y los epochs (las dos tablas son chicas)
+        now = datetime.now(timezone.utc)
+        revoked = frozenset(db.scalars(select(RevokedToken.jti).where(RevokedToken.expires_at > now)))
+        epochs = {user_id: epoch for user_id, epoch in db.execute(select(UserEpoch.user_id, UserEpoch.epoch))}
+        self._revoked, self._epochs = revoked, epochs
+        self._loaded_at = time.monotonic()
+
+    def _is_stale(self) -> bool:
+        return time.monotonic() - self._loaded_at >= self.refresh_seconds
+
+    def refresh_if_stale(self, db: Session, wait: bool = True) -> bool:
+        # Solo un hilo recarga; los demás siguen con los datos anteriores.
+        # Si nunca se cargó (o se invalidó) se espera a la recarga, salvo
+        # wait=False (en async un lock de hilo bloquearía el event loop).
+        # Retorna False si todavía no hay datos confiables
+        if not self._is_stale():
+            return True
+        if self._lock.acquire(blocking=wait and not self.loaded):
+            try:
+                if self._is_stale():
+                    self.refresh(db)
+            finally:
+                self._lock.release()
+        return self.loaded
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at != float("-inf")
+
+    def invalidate(self) -> None:
+        # Fuerza la recarga en el próximo request (p.ej. después de desactivar un usuario)
+        self._loaded_at = float("-inf")
+
+    def is_revoked(self, token_data: TokenData) -> bool:
+        if token_data.jti is not None and token_data.jti in self._revoked:
+            return True
+        return token_data.epoch < self._epochs.get(token_data.user_id, 0)
+
+revocation_cache = RevocationCache(refresh_seconds=settings.AUTH_REVOCATION_REFRESH_SECONDS)
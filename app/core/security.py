@@ -1,8 +1,12 @@
 # Funciones de seguridad
 # Hash de passwords y creación de tokens JWT
 
+import math
+import time
+import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Any, Union
+from functools import lru_cache
+from typing import Any, Optional, Union
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
@@ -10,16 +14,64 @@ from app.core.config import settings
 # Configuración de bcrypt para hashear passwords
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Límites de la calibración: menos de 10 es demasiado barato de atacar por fuerza bruta
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 16
+
+# Costo con el que se hashean las passwords nuevas (BCRYPT_ROUNDS o el calibrado)
+_bcrypt_rounds = settings.BCRYPT_ROUNDS
+
+def get_bcrypt_rounds() -> int:
+    return _bcrypt_rounds
+
+def set_bcrypt_rounds(rounds: int) -> None:
+    global _bcrypt_rounds
+    _bcrypt_rounds = rounds
+
+@lru_cache(maxsize=None)
+def _bcrypt_hasher(rounds: int):
+    return pwd_context.handler("bcrypt").using(rounds=rounds)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     # Verifica si la password ingresada coincide con el hash guardado en la BD
     return pwd_context.verify(plain_password, hashed_password)
 
-def get_password_hash(password: str) -> str:
+def get_password_hash(password: str, rounds: Optional[int] = None) -> str:
     # Hashea una password para guardarla en la BD
     # NUNCA guardar passwords en texto plano!
-    return pwd_context.hash(password)
+    # rounds se pasa explícito desde el pool de procesos, que no ve la calibración
+    return _bcrypt_hasher(rounds or _bcrypt_rounds).hash(password)
+
+def needs_rehash(hashed_password: str) -> bool:
+    # True si el hash se guardó con un costo menor que el actual (o con otro esquema)
+    # Nunca baja el costo: cada worker calibra el suyo y con != dos workers que
+    # eligieron costos distintos rehashearían la misma password en cada login
+    if pwd_context.needs_update(hashed_password):
+        return True
+    parts = hashed_password.split("$")
+    return len(parts) < 4 or not parts[2].isdigit() or int(parts[2]) < _bcrypt_rounds
+
+def calibrate_bcrypt_rounds(target_ms: float, probe_rounds: int = 8, samples: int = 3) -> int:
+    # Costo cuyo verify tarda lo más cerca posible de target_ms sin pasarse
+    # Cada round extra duplica el tiempo: se mide un costo barato y se extrapola
+    hashed = get_password_hash("calibracion", rounds=probe_rounds)
+    elapsed = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        pwd_context.verify("calibracion", hashed)
+        elapsed.append(time.perf_counter() - started)
+    probe_ms = min(elapsed) * 1000
+    rounds = probe_rounds + math.floor(math.log2(target_ms / probe_ms))
+    return max(BCRYPT_MIN_ROUNDS, min(BCRYPT_MAX_ROUNDS, rounds))
 
-def create_access_token(data: dict, expires_delta: Union[timedelta, None] = None) -> str:
+def create_access_token(
+    data: dict,
+    expires_delta: Union[timedelta, None] = None,
+    *,
+    user_id: Optional[int] = None,
+    is_active: bool = True,
+    epoch: int = 0
+) -> str:
     # Crea un token JWT para el usuario
     # El token expira después de cierto tiempo por seguridad
     to_encode = data.copy()
@@ -29,7 +81,11 @@ def create_access_token(data: dict, expires_delta: Union[timedelta, None] = None
         # Si no se especifica, usa el default de 30 min del config
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    # jti identifica al token para poder revocarlo
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
+    if user_id is not None:
+        # Claims del modo stateless: con esto no hace falta buscar al usuario en la BD
+        to_encode.update({"uid": user_id, "act": is_active, "ep": epoch})
 
     # Firma el token con la SECRET_KEY
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
@@ -0,0 +1,147 @@
+# Tiempos por fase de cada request (header Server-Timing)
+# Las fases se miden con span("nombre") donde ocurren (JWT, usuario, bcrypt)
+# y TimedRoute separa el endpoint de la serialización de la respuesta.
+# El tiempo de BD sale de request.state.query_stats (app/db/instrumentation.py)
+
+import functools
+import inspect
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Coroutine, Dict, Iterator, Optional
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+class RequestTiming:
+    # Milisegundos acumulados por fase; una fase que se repite (p.ej. dos
+    # verificaciones de bcrypt) suma sus duraciones
+    def __init__(self):
+        self.spans: Dict[str, float] = {}
+        self.endpoint_finished: Optional[float] = None
+
+    def add(self, name: str, seconds: float) -> None:
+        self.spans[name] = self.spans.get(name, 0.0) + seconds * 1000
+
+# Tiempos del request en curso (None fuera de un request o con SERVER_TIMING_ENABLED=false)
+current_timing: ContextVar[Optional[RequestTiming]] = ContextVar("current_timing", default=None)
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    # Mide el bloque y lo suma a la fase `name` del request en curso
+    timing = current_timing.get()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - started)
+
+def _timed_endpoint(endpoint: Callable) -> Callable:
+    # Envuelve el endpoint para medir su duración y marcar cuándo terminó
+    # functools.wraps conserva la firma, así FastAPI ve los mismos parámetros
+    def finish(timing: Optional[RequestTiming], started: float) -> None:
+        if timing is not None:
+            timing.endpoint_finished = time.perf_counter()
+            timing.add("endpoint", timing.endpoint_finished - started)
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            timing, started = current_timing.get(), time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                finish(timing, started)
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        timing, started = current_timing.get(), time.perf_counter()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            finish(timing, started)
+    return wrapper
+
+class TimedRoute(APIRoute):
+    # Ruta que separa "endpoint" (la función) de "serialize" (response_model,
+    # validación y render del body, lo que FastAPI hace después)
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            response = await handler(request)
+            timing = current_timing.get()
+            if timing is not None and timing.endpoint_finished is not None:
+                timing.add("serialize", time.perf_counter() - timing.endpoint_finished)
+            return response
+
+        return route_handler
+
+def server_timing_header(timing: RequestTiming, total_seconds: float, query_stats: Any = None) -> str:
+    # Formato estándar: nombre;dur=ms[;desc="..."] separados por coma
+    entries = [f"{name};dur={ms:.2f}" for name, ms in timing.spans.items()]
+    if query_stats is not None and query_stats.count:
+        entries.append(f'db;dur={query_stats.seconds * 1000:.2f};desc="{query_stats.count} queries"')
+    entries.append(f"total;dur={total_seconds * 1000:.2f}")
+    return ", ".join(entries)
+
+class ServerTimingMiddleware:
+    # Abre un RequestTiming por request y agrega Server-Timing a la respuesta
+    # Con SERVER_TIMING_LOG además escribe una línea JSON por request
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                total = time.perf_counter() - started
+                query_stats = scope.get("state", {}).get("query_stats")
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", server_timing_header(timing, total, query_stats)
+                )
+                if settings.SERVER_TIMING_LOG:
+                    _log_request(scope, message["status"], timing, total, query_stats)
+            await send(message)
+
+        token = current_timing.set(timing)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_timing.reset(token)
+
+def _log_request(scope: Scope, status_code: int, timing: RequestTiming, total: float, query_stats: Any) -> None:
+    # Una línea JSON por request para el pipeline de logs (hasta el inicio de la respuesta)
+    record = {
+        "method": scope["method"],
+        "route": route_template(scope),
+        "status": status_code,
+        "total_ms": round(total * 1000, 2),
+        "spans_ms": {name: round(ms, 2) for name, ms in timing.spans.items()},
+    }
+    if query_stats is not None:
+        record["db_queries"] = query_stats.count
+        record["db_ms"] = round(query_stats.seconds * 1000, 2)
+    logger.info(json.dumps(record))
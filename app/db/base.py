@@ -2,4 +2,7 @@
 from app.db.session import Base
 
 from app.models.user import User  
-from app.models.task import Task
\ No newline at end of file
+from app.models.task import Task
+from app.models.revocation import RevokedToken, UserEpoch
+from app.models.task_count import TaskStatusCount
+from app.models.task_stats import TaskDailyStats
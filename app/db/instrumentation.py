@@ -0,0 +1,114 @@
+# Instrumentación de SQL por request
+# Hooks de eventos del engine que cuentan sentencias y tiempo de BD del request
+# en curso, loguean las sentencias lentas y detectan N+1 (la misma sentencia
+# repetida muchas veces en un request)
+
+import logging
+import time
+import warnings
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+# Largo máximo de los parámetros en el log (un bulk insert puede traer miles)
+_MAX_PARAMS_LOG = 500
+
+class RepeatedStatementWarning(UserWarning):
+    pass
+
+class RepeatedStatementError(RuntimeError):
+    pass
+
+class QueryStats:
+    # Sentencias de un request; los hooks la encuentran por la ContextVar
+    def __init__(self, scope: Optional[Scope] = None):
+        self.scope = scope
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+
+    @property
+    def route(self) -> str:
+        return route_template(self.scope) if self.scope is not None else "-"
+
+# Stats del request en curso (None fuera de un request, p.ej. en scripts)
+# Los endpoints sync corren en el threadpool con una copia del contexto y
+# los async pasan por greenlets que la conservan, así que ambos la ven
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+        # La sentencia ya viene parametrizada: misma forma = mismo texto
+        stats.shapes[statement] += 1
+        _check_repeated(stats, statement)
+
+    if settings.SQL_SLOW_QUERY_MS > 0 and elapsed * 1000 >= settings.SQL_SLOW_QUERY_MS:
+        logger.warning(
+            "Sentencia lenta %.1f ms en %s: %s | params=%.*s",
+            elapsed * 1000,
+            stats.route if stats is not None else "-",
+            statement,
+            _MAX_PARAMS_LOG,
+            repr(parameters),
+        )
+
+def _handle_error(exception_context):
+    # Si la sentencia falló no hay after_cursor_execute: se descarta su inicio
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+def _check_repeated(stats: QueryStats, statement: str) -> None:
+    limit = settings.SQL_REPEATED_STATEMENT_LIMIT
+    # Se avisa una sola vez por forma, al pasar el límite
+    if limit <= 0 or stats.shapes[statement] != limit + 1:
+        return
+    message = f"Posible N+1 en {stats.route}: la misma sentencia se ejecutó más de {limit} veces: {statement}"
+    if settings.SQL_REPEATED_STATEMENT_RAISE:
+        raise RepeatedStatementError(message)
+    warnings.warn(message, RepeatedStatementWarning, stacklevel=2)
+
+def instrument_engine(engine: Engine) -> None:
+    # Registra los hooks en un engine sync (para uno async, pasar async_engine.sync_engine)
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+class QueryStatsMiddleware:
+    # Abre un QueryStats por request HTTP y lo deja en request.state.query_stats
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope)
+        scope.setdefault("state", {})["query_stats"] = stats
+        token = current_query_stats.set(stats)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_query_stats.reset(token)
+            logger.debug(
+                "%s %s: %d sentencias, %.1f ms de BD",
+                scope["method"], stats.route, stats.count, stats.seconds * 1000
+            )
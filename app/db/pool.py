@@ -0,0 +1,98 @@
+# Pool de conexiones instrumentado
+# Mide cuánto tarda cada checkout (espera en la cola + crear la conexión si
+# hace falta + pre-ping) y cuenta los timeouts, para /health/db
+
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+class PoolStats:
+    # Límites superiores de los buckets del histograma, en milisegundos
+    BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = [0] * (len(self.BUCKETS_MS) + 1)  # El último es "más de 5000"
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        milliseconds = seconds * 1000
+        index = next(
+            (i for i, limit in enumerate(self.BUCKETS_MS) if milliseconds <= limit),
+            len(self.BUCKETS_MS)
+        )
+        with self._lock:
+            self._buckets[index] += 1
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            labels = [f"<={limit}ms" for limit in self.BUCKETS_MS] + [f">{self.BUCKETS_MS[-1]}ms"]
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_total": round(self.wait_seconds_total * 1000, 3),
+                "wait_ms_avg": round(self.wait_seconds_total * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+                "histogram": dict(zip(labels, self._buckets)),
+            }
+
+class _InstrumentedPoolMixin:
+    stats: PoolStats
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.timeout()
+            raise
+        self.stats.observe(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() crea un pool nuevo: las estadísticas siguen acumulando
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+def pool_status(engine: Engine) -> Dict[str, Any]:
+    # Estado actual del pool más las estadísticas acumuladas de checkout
+    pool = engine.pool
+    status = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "max_overflow": pool._max_overflow,
+            "timeout_seconds": pool.timeout(),
+        })
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status["checkout"] = stats.snapshot()
+    return status
@@ -0,0 +1,88 @@
+# Ruteo de lecturas a réplicas
+# Las lecturas se reparten entre las réplicas (round robin), salvo que el mismo
+# cliente haya escrito hace poco: ahí van al primario para que vea sus cambios
+# (read-your-writes) aunque la réplica todavía no los tenga
+
+import itertools
+import math
+import threading
+import time
+from typing import Callable, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Métodos que no escriben: no activan la ventana de primario
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Marca en Session.info de las sesiones abiertas contra una réplica
+REPLICA_INFO_KEY = "replica"
+
+# Cookie con el momento de la última escritura del cliente
+STICKY_COOKIE = "primary_after_write"
+
+def is_replica_session(db) -> bool:
+    # Lo que se lee de una réplica puede venir atrasado: no debe llegar a caches compartidos
+    return bool(db.info.get(REPLICA_INFO_KEY))
+
+class ReadRouter:
+    # Decide a qué réplica va cada lectura (None = primario)
+    # Devuelve un índice para que el mismo ruteo sirva a los motores sync y async
+    # La ventana de primario viaja en una cookie del cliente (no en memoria),
+    # así vale en cualquier worker o instancia que atienda la siguiente lectura
+
+    def __init__(self, replica_count: int, sticky_seconds: float, clock: Callable[[], float] = time.time):
+        self.replica_count = replica_count
+        self.sticky_seconds = sticky_seconds
+        self._clock = clock
+        self._next_replica = itertools.cycle(range(replica_count))
+        self._lock = threading.Lock()
+
+    def write_marker(self) -> Optional[str]:
+        # Valor de la cookie después de una escritura (None si no hace falta)
+        if not self.replica_count or self.sticky_seconds <= 0:
+            return None
+        return f"{self._clock():.3f}"
+
+    def is_sticky(self, marker: Optional[str]) -> bool:
+        # Reloj de pared, compartido entre workers; un valor vencido,
+        # inventado a futuro o ilegible no cuenta
+        if not marker:
+            return False
+        try:
+            written_at = float(marker)
+        except ValueError:
+            return False
+        return abs(self._clock() - written_at) < self.sticky_seconds
+
+    def choose(self, marker: Optional[str] = None) -> Optional[int]:
+        # Primario si no hay réplicas o si el cliente escribió hace poco
+        if not self.replica_count or self.is_sticky(marker):
+            return None
+        with self._lock:
+            return next(self._next_replica)
+
+class StickyPrimaryMiddleware:
+    # Marca al cliente después de cada request que escribe (POST/PUT/PATCH/DELETE)
+    # con respuesta 2xx: un 307 por la barra final o un error no escribieron nada
+    # La cookie va en la misma respuesta, así la siguiente lectura ya la trae
+    def __init__(self, app: ASGIApp, router: ReadRouter):
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and 200 <= message["status"] < 300:
+                marker = self.router.write_marker()
+                if marker is not None:
+                    max_age = math.ceil(self.router.sticky_seconds)
+                    MutableHeaders(scope=message).append(
+                        "set-cookie", f"{STICKY_COOKIE}={marker}; Max-Age={max_age}; Path=/; HttpOnly; SameSite=Lax"
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
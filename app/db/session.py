@@ -1,12 +1,59 @@
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
+from app.db.instrumentation import instrument_engine
+from app.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+from app.db.replicas import REPLICA_INFO_KEY, STICKY_COOKIE, ReadRouter
+
+def _pool_options() -> dict:
+    # Opciones de pool comunes a ambos motores (ver DB_POOL_* en config)
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        # psycopg usa None para no preparar nunca
+        "connect_args": {
+            "prepare_threshold": settings.DB_PREPARE_THRESHOLD if settings.DB_PREPARE_THRESHOLD >= 0 else None
+        },
+    }
 
 # Usar psycopg3 que tiene mejor soporte Unicode que psycopg2
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URL)
+engine = create_engine(settings.SQLALCHEMY_DATABASE_URL, poolclass=InstrumentedQueuePool, **_pool_options())
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Motor async (psycopg3 también tiene driver async con la misma URL)
+# No abre conexiones hasta que se usa, así que no molesta en modo sync
+async_engine = create_async_engine(
+    settings.SQLALCHEMY_DATABASE_URL, poolclass=InstrumentedAsyncQueuePool, **_pool_options()
+)
+
+# expire_on_commit=False para no disparar lazy loads (que en async fallan)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+# Réplicas de lectura (DB_READ_REPLICA_URLS), mismo pool que el primario
+read_engines = [
+    create_engine(url, poolclass=InstrumentedQueuePool, **_pool_options())
+    for url in settings.read_replica_urls
+]
+async_read_engines = [
+    create_async_engine(url, poolclass=InstrumentedAsyncQueuePool, **_pool_options())
+    for url in settings.read_replica_urls
+]
+ReadSessionLocals = [sessionmaker(autocommit=False, autoflush=False, bind=e) for e in read_engines]
+AsyncReadSessionLocals = [
+    async_sessionmaker(bind=e, autoflush=False, expire_on_commit=False) for e in async_read_engines
+]
+read_router = ReadRouter(len(read_engines), settings.DB_READ_AFTER_WRITE_SECONDS)
+
+# Conteo de sentencias, log de lentas y detección de N+1 en todos los motores
+for _engine in [engine, async_engine.sync_engine, *read_engines, *(e.sync_engine for e in async_read_engines)]:
+    instrument_engine(_engine)
+
 Base = declarative_base()
 
 def get_db():
@@ -14,4 +61,25 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_read_db(request: Request):
+    # Sesión para endpoints que solo leen: réplica o primario según read_router
+    replica = read_router.choose(request.cookies.get(STICKY_COOKIE))
+    db = SessionLocal() if replica is None else ReadSessionLocals[replica]()
+    db.info[REPLICA_INFO_KEY] = replica is not None
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db(request: Request):
+    replica = read_router.choose(request.cookies.get(STICKY_COOKIE))
+    factory = AsyncSessionLocal if replica is None else AsyncReadSessionLocals[replica]
+    async with factory() as db:
+        db.info[REPLICA_INFO_KEY] = replica is not None
+        yield db
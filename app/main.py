@@ -1,15 +1,39 @@
 # Archivo principal de la aplicación
 # Aquí se configura FastAPI y se agregan las rutas
 
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from app.core import security
+from app.core.cache import task_cache
 from app.core.config import settings
+from app.core.metrics import METRICS_CONTENT_TYPE, MetricsMiddleware, registry
+from app.core.password_pool import password_pool
+from app.core.timing import ServerTimingMiddleware
 from app.api.v1.api import api_router
+from app.db.instrumentation import QueryStatsMiddleware
+from app.db.pool import pool_status
+from app.db.replicas import StickyPrimaryMiddleware
+from app.db.session import async_engine, engine, read_engines, read_router
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Con BCRYPT_TARGET_MS se elige el costo de bcrypt según lo que tarda este host
+    if settings.BCRYPT_TARGET_MS > 0:
+        security.set_bcrypt_rounds(security.calibrate_bcrypt_rounds(settings.BCRYPT_TARGET_MS))
+        logger.info("bcrypt calibrado a %d rounds (objetivo %.0f ms)", security.get_bcrypt_rounds(), settings.BCRYPT_TARGET_MS)
+    yield
+    # Al apagar, cerrar los procesos de bcrypt
+    password_pool.shutdown()
 
 # Crear la app de FastAPI
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # CORS - para que el frontend pueda hacer requests
@@ -19,8 +43,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "X-Total-Count-Source", "ETag", "Server-Timing"],
 )
 
+# Read-your-writes: después de escribir, las lecturas del cliente van al primario
+app.add_middleware(StickyPrimaryMiddleware, router=read_router)
+
+# Sentencias SQL y tiempo de BD de cada request (request.state.query_stats)
+app.add_middleware(QueryStatsMiddleware)
+
+# Server-Timing: va por fuera de QueryStatsMiddleware para leer el tiempo de BD
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+
+# Métricas: se agrega al final para que sea el middleware más externo
+# y mida también el tiempo de CORS y del resto de middlewares
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Agregar las rutas de la API
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -32,4 +72,20 @@ def root():
 @app.get("/health")
 def health_check():
     # Endpoint de health check para verificar que el servidor está vivo
-    return {"status": "healthy"}
+    # Incluye los contadores del cache de tareas de este proceso
+    return {"status": "healthy", "task_cache": task_cache.stats()}
+
+@app.get("/health/db")
+def health_db():
+    # Estado de los pools de conexiones (no abre conexiones nuevas)
+    # checked_out/overflow = uso actual, checkout = latencia acumulada de sacar una conexión
+    return {
+        "sync": pool_status(engine),
+        "async": pool_status(async_engine.sync_engine),
+        "replicas": [pool_status(read_engine) for read_engine in read_engines],
+    }
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    # Métricas del proceso en formato de texto de Prometheus
+    return Response(registry.render(), media_type=METRICS_CONTENT_TYPE)
@@ -0,0 +1,21 @@
+# Modelos para invalidar tokens JWT en el modo stateless
+# Son tablas chicas que cada worker carga en memoria cada pocos segundos
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    # jti del token revocado, se puede borrar cuando el token expira
+    jti = Column(String, primary_key=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+class UserEpoch(Base):
+    __tablename__ = "user_epochs"
+
+    # Al desactivar un usuario se sube su epoch y todos sus tokens anteriores dejan de valer
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    epoch = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
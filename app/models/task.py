@@ -1,6 +1,7 @@
 # Modelo de Tarea para la base de datos
 
-from sqlalchemy import Column, Integer, String, DateTime, Enum
+from datetime import datetime, timezone
+from sqlalchemy import DDL, Column, Integer, String, DateTime, Enum, Index, event
 from sqlalchemy.sql import func
 from app.db.session import Base
 import enum
@@ -11,16 +12,84 @@ class TaskStatus(str, enum.Enum):
     IN_PROGRESS = "in_progress"
     COMPLETED = "completed"
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
 class Task(Base):
     __tablename__ = "tasks"
 
     # Campos de la tarea
     id = Column(Integer, primary_key=True, index=True)
-    title = Column(String, index=True, nullable=False)  # Indexado para búsquedas
+    title = Column(String, nullable=False)  # Indexado por ix_tasks_title_id (abajo)
     description = Column(String, nullable=True)  # Opcional
     status = Column(
         Enum(TaskStatus),
         default=TaskStatus.PENDING,  # Por defecto es pending
         nullable=False
     )
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # El default de Python da precisión de microsegundos en cualquier motor
+    # (en SQLite CURRENT_TIMESTAMP solo tiene segundos y rompe el cursor)
+    created_at = Column(DateTime(timezone=True), default=_utcnow, server_default=func.now(), nullable=False)
+    # Cambian en cada UPDATE; version sale en el ETag y evita pisar cambios ajenos
+    updated_at = Column(
+        DateTime(timezone=True), default=_utcnow, onupdate=_utcnow, server_default=func.now(), nullable=False
+    )
+    version = Column(Integer, default=1, server_default="1", nullable=False)
+    # Cuándo pasó a COMPLETED (None en los otros estados); alimenta el rollup de /tasks/stats
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Orden estable para la paginación por cursor (keyset)
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        # Listados filtrados por estado y orden por título (ver ?status= y ?sort=)
+        Index("ix_tasks_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_tasks_status_title_id", "status", "title", "id"),
+        Index("ix_tasks_title_id", "title", "id"),
+    )
+
+    # El ORM suma 1 a version en cada UPDATE y agrega "AND version = <leída>";
+    # si otro la cambió antes, el commit falla con StaleDataError
+    __mapper_args__ = {"version_id_col": version}
+
+# Búsqueda de texto completo sobre title + description
+# No se mapea en el modelo porque depende del motor:
+# - PostgreSQL: columna generada tsvector + índice GIN
+# - SQLite: tabla virtual FTS5 sincronizada con triggers
+# La migración 004 crea lo mismo en bases existentes
+SEARCH_CONFIG = "spanish"
+
+_postgres_search_ddl = [
+    f"""
+    ALTER TABLE tasks ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX ix_tasks_search_vector ON tasks USING gin (search_vector)",
+]
+
+_sqlite_search_ddl = [
+    "CREATE VIRTUAL TABLE tasks_fts USING fts5(title, description, content='tasks', content_rowid='id')",
+    """
+    CREATE TRIGGER tasks_fts_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_fts_ad AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+for statement in _postgres_search_ddl:
+    event.listen(Task.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+for statement in _sqlite_search_ddl:
+    event.listen(Task.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(Task.__table__, "before_drop", DDL("DROP TABLE IF EXISTS tasks_fts").execute_if(dialect="sqlite"))
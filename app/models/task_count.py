@@ -0,0 +1,18 @@
+# Contadores de tareas por estado, para totales sin COUNT(*) sobre toda la tabla
+# task_service los ajusta en la misma transacción de cada escritura
+
+from sqlalchemy import BigInteger, Column, Enum, event
+from app.db.session import Base
+from app.models.task import TaskStatus
+
+class TaskStatusCount(Base):
+    __tablename__ = "task_status_counts"
+
+    # Una fila por estado; la migración 007 las crea con el conteo actual
+    status = Column(Enum(TaskStatus), primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+@event.listens_for(TaskStatusCount.__table__, "after_create")
+def _insert_status_rows(target, connection, **kw):
+    # Con create_all (tests, benchmarks) la tabla arranca con todos los estados en 0
+    connection.execute(target.insert(), [{"status": status, "count": 0} for status in TaskStatus])
@@ -0,0 +1,17 @@
+# Rollup diario de tareas para GET /tasks/stats
+# Una fila por (día UTC, estado); stats_service la ajusta en la misma transacción
+# de cada escritura, así las estadísticas se leen sin recorrer tasks
+
+from sqlalchemy import BigInteger, Column, Date, Enum
+from app.db.session import Base
+from app.models.task import TaskStatus
+
+class TaskDailyStats(Base):
+    __tablename__ = "task_daily_stats"
+
+    day = Column(Date, primary_key=True)
+    status = Column(Enum(TaskStatus), primary_key=True)
+    # Tareas creadas ese día que hoy están en este estado
+    created = Column(BigInteger, nullable=False, default=0, server_default="0")
+    # Tareas completadas ese día (solo en las filas de COMPLETED)
+    completed = Column(BigInteger, nullable=False, default=0, server_default="0")
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field
-from typing import Optional
-from datetime import datetime
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, Dict, List, Optional
+from datetime import date, datetime
 from enum import Enum
 
 class TaskStatusSchema(str, Enum):
@@ -25,6 +25,80 @@ class TaskUpdate(BaseModel):
 class TaskOut(TaskBase):
     id: int
     created_at: datetime
+    updated_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class TaskBulkError(BaseModel):
+    # Error de validación de un item dentro de una carga masiva
+    index: int
+    errors: List[Dict[str, Any]]
+
+class TaskBulkCreateResult(BaseModel):
+    created: List[TaskOut]
+    errors: List[TaskBulkError] = []
+
+class TaskImportError(BaseModel):
+    # Error de una línea del NDJSON de POST /tasks/import (empieza en 1)
+    line: int
+    errors: List[Dict[str, Any]]
+
+class TaskImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[TaskImportError]  # Solo los primeros TASKS_IMPORT_MAX_ERRORS
+
+class TaskSort(str, Enum):
+    # Orden del listado, el "-" indica descendente
+    CREATED_AT = "created_at"
+    CREATED_AT_DESC = "-created_at"
+    TITLE = "title"
+    TITLE_DESC = "-title"
+
+class TaskExportFormat(str, Enum):
+    # Formatos de GET /tasks/export
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+class TaskFilter(BaseModel):
+    # Filtros del listado, se combinan con AND
+    status: Optional[TaskStatusSchema] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+
+class TaskBulkFilter(TaskFilter):
+    # Criterios para operaciones masivas, se combinan con AND
+    ids: Optional[List[int]] = Field(None, min_length=1)
+    title_contains: Optional[str] = Field(None, min_length=1)
+
+    @model_validator(mode="after")
+    def check_has_criteria(self):
+        # Sin criterios afectaría a toda la tabla, mejor pedirlo explícito
+        if all(getattr(self, field) is None for field in TaskBulkFilter.model_fields):
+            raise ValueError("Se requiere al menos un criterio (ids o filtro)")
+        return self
+
+class TaskBulkUpdate(TaskBulkFilter):
+    changes: TaskUpdate
+
+    @model_validator(mode="after")
+    def check_has_changes(self):
+        if not self.changes.model_fields_set:
+            raise ValueError("No hay cambios para aplicar")
+        return self
+
+class TaskBulkResult(BaseModel):
+    affected: int
+
+class TaskDayStats(BaseModel):
+    # Creadas (que siguen existiendo) y completadas en un día UTC
+    day: date
+    created: int
+    completed: int
+
+class TaskStats(BaseModel):
+    # Respuesta de GET /tasks/stats
+    total: int
+    by_status: Dict[TaskStatusSchema, int]
+    days: List[TaskDayStats]
@@ -1,3 +1,4 @@
+from datetime import datetime
 from pydantic import BaseModel
 from typing import Optional
 
@@ -6,4 +7,16 @@ class Token(BaseModel):
     token_type: str
 
 class TokenData(BaseModel):
-    email: Optional[str] = None
\ No newline at end of file
+    email: Optional[str] = None
+    # Solo vienen en tokens emitidos para el modo stateless
+    user_id: Optional[int] = None
+    is_active: Optional[bool] = None
+    epoch: int = 0
+    jti: Optional[str] = None
+    expires_at: Optional[datetime] = None
+
+class Principal(BaseModel):
+    # Usuario autenticado armado solo con los claims del token (sin ir a la BD)
+    id: int
+    email: str
+    is_active: bool
\ No newline at end of file
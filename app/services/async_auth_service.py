@@ -0,0 +1,57 @@
+# Servicio de autenticación (versión async)
+# bcrypt es pura CPU, así que se corre en el pool de procesos
+
+from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import needs_rehash
+from app.models.revocation import UserEpoch
+from app.models.user import User
+from app.core.password_pool import PasswordPoolBusy, get_password_hash_async, verify_password_async
+from app.services import auth_service
+from app.schemas.user import UserCreate
+
+async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
+    # Busca un usuario por email
+    return (await db.scalars(select(User).where(User.email == email))).first()
+
+async def authenticate(db: AsyncSession, email: str, password: str) -> User | None:
+    # Valida email y password, retorna el usuario si es correcto
+    user = await get_user_by_email(db, email)
+    if not user:
+        return None
+    if not await verify_password_async(password, user.hashed_password):
+        return None
+    if needs_rehash(user.hashed_password):
+        # Mismo rehash que la versión sync (ver auth_service.authenticate)
+        try:
+            user.hashed_password = await get_password_hash_async(password)
+        except PasswordPoolBusy:
+            return user
+        await db.commit()
+    return user
+
+async def get_user_epoch(db: AsyncSession, user_id: int) -> int:
+    # Epoch actual del usuario (0 si nunca se invalidaron sus tokens)
+    row = await db.get(UserEpoch, user_id)
+    return row.epoch if row else 0
+
+async def create_user(db: AsyncSession, user_in: UserCreate) -> User:
+    # Crea un nuevo usuario en la BD, hasheando la password antes de guardar
+    db_user = User(
+        email=user_in.email,
+        hashed_password=await get_password_hash_async(user_in.password),
+        is_active=True
+    )
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+async def deactivate_user(db: AsyncSession, user: User) -> User:
+    # Misma lógica que auth_service.deactivate_user (sube el epoch e invalida el cache)
+    return await db.run_sync(auth_service.deactivate_user, user)
+
+async def revoke_token(db: AsyncSession, jti: str, expires_at: datetime) -> None:
+    await db.run_sync(auth_service.revoke_token, jti, expires_at)
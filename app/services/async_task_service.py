@@ -0,0 +1,95 @@
+# Servicio de tareas (versión async)
+# Las lecturas usan select() nativo con AsyncSession
+# Las escrituras reutilizan task_service con run_sync, así la lógica
+# vive en un solo lugar y el event loop nunca se bloquea
+
+from datetime import date
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.task import Task
+from app.schemas.task import TaskBulkFilter, TaskCreate, TaskExportFormat, TaskFilter, TaskSort, TaskUpdate
+from app.services import stats_service, task_service
+
+async def get_tasks(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    after: Optional[Tuple[Any, int]] = None,
+    filters: Optional[TaskFilter] = None,
+    sort: TaskSort = TaskSort.CREATED_AT,
+    as_rows: bool = False
+):
+    # Obtiene lista de tareas filtradas y ordenadas
+    statement = task_service.tasks_statement(skip=skip, limit=limit, after=after, filters=filters, sort=sort)
+    if as_rows:
+        return (await db.execute(task_service.rows_statement(statement))).all()
+    result = await db.scalars(statement)
+    return result.all()
+
+async def search_tasks(
+    db: AsyncSession,
+    q: str,
+    skip: int = 0,
+    limit: int = 10,
+    filters: Optional[TaskFilter] = None,
+    as_rows: bool = False
+):
+    # Busca tareas por título y descripción, las más relevantes primero
+    if not q.split():
+        return []
+    statement = task_service.search_statement(db.bind.dialect.name, q, skip=skip, limit=limit, filters=filters)
+    if as_rows:
+        return (await db.execute(task_service.rows_statement(statement))).all()
+    return (await db.scalars(statement)).all()
+
+async def count_tasks(
+    db: AsyncSession,
+    filters: Optional[TaskFilter] = None,
+    q: Optional[str] = None,
+    exact_limit: int = 10000
+) -> Tuple[int, str]:
+    # Mismas estrategias que task_service.count_tasks
+    return await db.run_sync(task_service.count_tasks, filters, q, exact_limit)
+
+async def get_stats(db: AsyncSession, date_from: date, date_to: date) -> dict:
+    # Lee del rollup (ver stats_service.get_stats)
+    return await db.run_sync(stats_service.get_stats, date_from, date_to)
+
+async def export_tasks(
+    db: AsyncSession,
+    fmt: TaskExportFormat,
+    filters: Optional[TaskFilter] = None,
+    sort: TaskSort = TaskSort.CREATED_AT,
+    chunk_size: int = 1000
+) -> AsyncIterator[str]:
+    # Igual que task_service.export_tasks pero con AsyncSession.stream()
+    header = task_service.export_header(fmt)
+    if header:
+        yield header
+    statement = task_service.export_statement(filters, sort).execution_options(yield_per=chunk_size)
+    result = await db.stream(statement)
+    async for rows in result.partitions():
+        yield task_service.format_export_rows(rows, fmt)
+
+async def get_task(db: AsyncSession, task_id: int):
+    # Busca una tarea por ID (pasa por el mismo cache que la versión sync)
+    return await db.run_sync(task_service.get_task, task_id)
+
+async def create_task(db: AsyncSession, obj_in: TaskCreate):
+    return await db.run_sync(task_service.create_task, obj_in)
+
+async def create_tasks(db: AsyncSession, objs_in: List[TaskCreate], chunk_size: int = 1000):
+    return await db.run_sync(task_service.create_tasks, objs_in, chunk_size)
+
+async def update_task(db: AsyncSession, db_obj: Task, obj_in: TaskUpdate):
+    return await db.run_sync(task_service.update_task, db_obj, obj_in)
+
+async def delete_task(db: AsyncSession, task_id: int):
+    return await db.run_sync(task_service.delete_task, task_id)
+
+async def update_tasks(db: AsyncSession, criteria: TaskBulkFilter, obj_in: TaskUpdate, chunk_size: int = 1000) -> int:
+    return await db.run_sync(task_service.update_tasks, criteria, obj_in, chunk_size)
+
+async def delete_tasks(db: AsyncSession, criteria: TaskBulkFilter, chunk_size: int = 1000) -> int:
+    return await db.run_sync(task_service.delete_tasks, criteria, chunk_size)
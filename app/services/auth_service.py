@@ -1,9 +1,21 @@
 # Servicio de autenticación
 # Funciones para validar usuarios y crear nuevos
 
+from datetime import datetime
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from app.core.revocation import revocation_cache
+from app.core.security import needs_rehash
+from app.models.revocation import RevokedToken, UserEpoch
 from app.models.user import User
-from app.core.security import verify_password, get_password_hash
+# bcrypt corre en el pool de procesos (ver app/core/password_pool.py)
+from app.core.password_pool import (
+    PasswordPoolBusy,
+    get_password_hash,
+    get_password_hash_async,
+    verify_password,
+    verify_password_async,
+)
 from app.schemas.user import UserCreate
 
 def authenticate(db: Session, email: str, password: str) -> User | None:
@@ -13,8 +25,39 @@ def authenticate(db: Session, email: str, password: str) -> User | None:
         return None
     if not verify_password(password, user.hashed_password):
         return None
+    if needs_rehash(user.hashed_password):
+        # Hash con otro costo de bcrypt: se rehashea ahora que tenemos la password en claro
+        # Si el pool está lleno queda para el próximo login
+        try:
+            user.hashed_password = get_password_hash(password)
+        except PasswordPoolBusy:
+            return user
+        db.commit()
     return user
 
+async def authenticate_async(db: Session, email: str, password: str) -> User | None:
+    # Igual que authenticate, para endpoints async def con sesión sync (POST /login):
+    # las queries van al threadpool y bcrypt se espera en el event loop, así una
+    # ráfaga de logins no deja los hilos del threadpool esperando al pool de procesos
+    user = await run_in_threadpool(get_user_by_email, db, email)
+    if not user:
+        return None
+    if not await verify_password_async(password, user.hashed_password):
+        return None
+    if needs_rehash(user.hashed_password):
+        try:
+            hashed = await get_password_hash_async(password)
+        except PasswordPoolBusy:
+            return user
+        await run_in_threadpool(_save_password_hash, db, user, hashed)
+    return user
+
+def _save_password_hash(db: Session, user: User, hashed: str) -> None:
+    user.hashed_password = hashed
+    db.commit()
+    # Recarga acá (en el threadpool) y no en el primer acceso desde el event loop
+    db.refresh(user)
+
 def get_user_by_email(db: Session, email: str) -> User | None:
     # Busca un usuario por email
     return db.query(User).filter(User.email == email).first()
@@ -30,4 +73,32 @@ def create_user(db: Session, user_in: UserCreate) -> User:
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
-    return db_user
\ No newline at end of file
+    return db_user
+
+def get_user_epoch(db: Session, user_id: int) -> int:
+    # Epoch actual del usuario (0 si nunca se invalidaron sus tokens)
+    row = db.get(UserEpoch, user_id)
+    return row.epoch if row else 0
+
+def revoke_user_tokens(db: Session, user: User) -> None:
+    # Sube el epoch: todos los tokens emitidos antes dejan de valer
+    row = db.get(UserEpoch, user.id)
+    if row is None:
+        db.add(UserEpoch(user_id=user.id, epoch=1))
+    else:
+        row.epoch += 1
+
+def deactivate_user(db: Session, user: User) -> User:
+    # Desactiva un usuario e invalida sus tokens (también en modo stateless)
+    user.is_active = False
+    revoke_user_tokens(db, user)
+    db.commit()
+    # Este worker se entera al instante; los demás en la próxima recarga
+    revocation_cache.invalidate()
+    return user
+
+def revoke_token(db: Session, jti: str, expires_at: datetime) -> None:
+    # Revoca un token puntual (p.ej. logout) hasta que expire
+    db.merge(RevokedToken(jti=jti, expires_at=expires_at))
+    db.commit()
+    revocation_cache.invalidate()
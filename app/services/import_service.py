@@ -0,0 +1,82 @@
+# Servicio de import de tareas en NDJSON
+# Lee el body del request en streaming, valida línea por línea y guarda en
+# lotes de tamaño fijo: en memoria hay como mucho un lote y una línea
+
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+
+from pydantic import ValidationError
+from app.schemas.task import TaskCreate, TaskImportError, TaskImportResult
+
+# Recibe un lote de tareas válidas, lo guarda y devuelve cuántas se crearon
+FlushBatch = Callable[[List[TaskCreate]], Awaitable[int]]
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    # Parte el stream en líneas numeradas desde 1
+    # Una línea que pasa de max_line_bytes se descarta y sale como None
+    buffer = bytearray()
+    line_no = 0
+    too_long = False
+    async for chunk in chunks:
+        buffer += chunk
+        while True:
+            end = buffer.find(b"\n")
+            if end == -1:
+                break
+            line_no += 1
+            line = bytes(buffer[:end])
+            del buffer[:end + 1]
+            yield line_no, None if too_long or len(line) > max_line_bytes else line
+            too_long = False
+        if len(buffer) > max_line_bytes:
+            # No se guarda el resto de la línea, solo se recuerda que era larga
+            too_long = True
+            buffer.clear()
+    if buffer or too_long:
+        line_no += 1
+        yield line_no, None if too_long else bytes(buffer)
+
+def parse_line(line_no: int, line: Optional[bytes], max_line_bytes: int) -> Tuple[Optional[TaskCreate], Optional[TaskImportError]]:
+    # Valida una línea contra TaskCreate (JSON inválido también es un error de validación)
+    if line is None:
+        return None, TaskImportError(line=line_no, errors=[{
+            "type": "line_too_long",
+            "loc": [],
+            "msg": f"La línea supera {max_line_bytes} bytes"
+        }])
+    try:
+        return TaskCreate.model_validate_json(line), None
+    except ValidationError as exc:
+        return None, TaskImportError(
+            line=line_no,
+            errors=exc.errors(include_url=False, include_context=False, include_input=False)
+        )
+
+async def import_tasks(
+    chunks: AsyncIterator[bytes],
+    flush: FlushBatch,
+    batch_size: int = 1000,
+    max_line_bytes: int = 64 * 1024,
+    max_errors: int = 1000
+) -> TaskImportResult:
+    # Importa un NDJSON completo; las líneas vacías se ignoran
+    # Cada lote se guarda (y se commitea) apenas se llena, así un error
+    # más adelante no pierde lo que ya entró
+    batch: List[TaskCreate] = []
+    errors: List[TaskImportError] = []
+    imported = failed = 0
+    async for line_no, line in iter_lines(chunks, max_line_bytes):
+        if line is not None and not line.strip():
+            continue
+        task_in, error = parse_line(line_no, line, max_line_bytes)
+        if error is not None:
+            failed += 1
+            if len(errors) < max_errors:
+                errors.append(error)
+            continue
+        batch.append(task_in)
+        if len(batch) >= batch_size:
+            imported += await flush(batch)
+            batch = []
+    if batch:
+        imported += await flush(batch)
+    return TaskImportResult(imported=imported, failed=failed, errors=errors)
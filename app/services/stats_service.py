@@ -0,0 +1,179 @@
+# Servicio de estadísticas de tareas
+# Mantiene el rollup task_daily_stats y lo consulta para GET /tasks/stats
+# Con TASK_STATS_ENABLED las consultas son O(días) y nunca recorren la tabla
+# tasks, salvo el backfill; sin él se agrupa tasks en el rango pedido
+#
+# Backfill (recalcula el rollup y los contadores por estado desde cero, p.ej. después
+# de cargar datos por fuera de la API o antes de prender TASK_COUNTERS_ENABLED):
+#     python -m app.services.stats_service
+
+import argparse
+from collections import Counter
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+from sqlalchemy import Date, cast, delete, func, literal, select, union_all
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.task import Task, TaskStatus
+from app.models.task_count import TaskStatusCount
+from app.models.task_stats import TaskDailyStats
+
+class TaskState(NamedTuple):
+    # Lo que el rollup necesita de una tarea (antes o después de una escritura)
+    status: TaskStatus
+    created_at: datetime
+    completed_at: Optional[datetime]
+
+def utc_day(value: datetime) -> date:
+    # SQLite devuelve fechas sin zona (ya en UTC), PostgreSQL en la zona de la sesión
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+def apply_changes(db: Session, removed: Iterable[TaskState] = (), added: Iterable[TaskState] = ()) -> None:
+    # Ajusta el rollup con las tareas que salen (removed) y entran (added) en una escritura
+    # Un update es removed=[estado viejo], added=[estado nuevo]; no hace commit
+    # Las filas del día en curso son calientes igual que los contadores por estado
+    if not settings.TASK_STATS_ENABLED:
+        return
+    created: Counter = Counter()
+    completed: Counter = Counter()
+    for sign, states in ((-1, removed), (1, added)):
+        for state in states:
+            status = TaskStatus(state.status)
+            created[(utc_day(state.created_at), status)] += sign
+            if status == TaskStatus.COMPLETED and state.completed_at is not None:
+                completed[(utc_day(state.completed_at), status)] += sign
+
+    rows = [
+        {"day": day, "status": status, "created": created[(day, status)], "completed": completed[(day, status)]}
+        for day, status in sorted(set(created) | set(completed))
+        if created[(day, status)] or completed[(day, status)]
+    ]
+    if not rows:
+        return
+    # Un solo INSERT ... ON CONFLICT DO UPDATE suma los deltas a las filas que ya existen
+    insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    statement = insert(TaskDailyStats).values(rows)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[TaskDailyStats.day, TaskDailyStats.status],
+        set_={
+            "created": TaskDailyStats.created + statement.excluded.created,
+            "completed": TaskDailyStats.completed + statement.excluded.completed,
+        }
+    ))
+
+def _day_column(dialect_name: str, column):
+    # Día UTC de una columna timestamp, igual que utc_day() en Python
+    if dialect_name == "postgresql":
+        return cast(func.timezone("UTC", column), Date)
+    return func.date(column, type_=Date)
+
+def rebuild_daily_stats(db: Session) -> int:
+    # Recalcula el rollup entero con un GROUP BY sobre tasks; retorna las filas escritas
+    dialect_name = db.get_bind().dialect.name
+    created_day = _day_column(dialect_name, Task.created_at)
+    completed_day = _day_column(dialect_name, Task.completed_at)
+    events = union_all(
+        select(created_day.label("day"), Task.status, func.count().label("created"), literal(0).label("completed"))
+        .group_by(created_day, Task.status),
+        select(completed_day.label("day"), Task.status, literal(0).label("created"), func.count().label("completed"))
+        .where(Task.status == TaskStatus.COMPLETED, Task.completed_at.is_not(None))
+        .group_by(completed_day, Task.status),
+    ).subquery()
+    statement = (
+        select(events.c.day, events.c.status, func.sum(events.c.created), func.sum(events.c.completed))
+        .group_by(events.c.day, events.c.status)
+    )
+    rows = [
+        {"day": day, "status": status, "created": created, "completed": completed}
+        for day, status, created, completed in db.execute(statement)
+    ]
+    db.execute(delete(TaskDailyStats))
+    if rows:
+        db.execute(TaskDailyStats.__table__.insert(), rows)
+    db.commit()
+    return len(rows)
+
+def stats_range(date_from: Optional[date], date_to: Optional[date], max_days: int) -> Tuple[date, date]:
+    # Completa el rango pedido (por defecto los últimos 30 días) y lo valida
+    date_to = date_to or datetime.now(timezone.utc).date()
+    date_from = date_from or date_to - timedelta(days=29)
+    if date_from > date_to:
+        raise ValueError("date_from no puede ser posterior a date_to")
+    if (date_to - date_from).days + 1 > max_days:
+        raise ValueError(f"El rango no puede superar {max_days} días")
+    return date_from, date_to
+
+def _by_status_statement():
+    # Totales por estado: contadores (O(estados)), rollup (O(días)) o GROUP BY sobre tasks
+    if settings.TASK_COUNTERS_ENABLED:
+        return select(TaskStatusCount.status, TaskStatusCount.count)
+    if settings.TASK_STATS_ENABLED:
+        return select(TaskDailyStats.status, func.sum(TaskDailyStats.created)).group_by(TaskDailyStats.status)
+    return select(Task.status, func.count()).group_by(Task.status)
+
+def _daily_statements(dialect_name: str, date_from: date, date_to: date) -> list:
+    # (día, creadas, completadas) en [date_from, date_to]
+    if settings.TASK_STATS_ENABLED:
+        return [
+            select(TaskDailyStats.day, func.sum(TaskDailyStats.created), func.sum(TaskDailyStats.completed))
+            .where(TaskDailyStats.day >= date_from, TaskDailyStats.day <= date_to)
+            .group_by(TaskDailyStats.day)
+        ]
+    # Sin rollup: dos GROUP BY acotados al rango (usa ix_tasks_created_at_id)
+    start = datetime.combine(date_from, time.min, tzinfo=timezone.utc)
+    end = datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=timezone.utc)
+    created_day = _day_column(dialect_name, Task.created_at)
+    completed_day = _day_column(dialect_name, Task.completed_at)
+    return [
+        select(created_day, func.count(), literal(0))
+        .where(Task.created_at >= start, Task.created_at < end)
+        .group_by(created_day),
+        select(completed_day, literal(0), func.count())
+        .where(Task.status == TaskStatus.COMPLETED, Task.completed_at >= start, Task.completed_at < end)
+        .group_by(completed_day),
+    ]
+
+def get_stats(db: Session, date_from: date, date_to: date) -> dict:
+    # Totales por estado y creadas/completadas por día en [date_from, date_to]
+    # Los días sin actividad salen en 0 para que el gráfico no tenga huecos
+    by_status = {status: 0 for status in TaskStatus}
+    for status, count in db.execute(_by_status_statement()):
+        by_status[TaskStatus(status)] = int(count)
+
+    daily: Counter = Counter()
+    for statement in _daily_statements(db.get_bind().dialect.name, date_from, date_to):
+        for day, created, completed in db.execute(statement):
+            daily[(day, "created")] += int(created)
+            daily[(day, "completed")] += int(completed)
+    days = []
+    for offset in range((date_to - date_from).days + 1):
+        day = date_from + timedelta(days=offset)
+        days.append({"day": day, "created": daily[(day, "created")], "completed": daily[(day, "completed")]})
+
+    return {
+        "total": sum(by_status.values()),
+        "by_status": {status.value: count for status, count in by_status.items()},
+        "days": days,
+    }
+
+def main() -> None:
+    # task_service importa este módulo
+    from app.services.task_service import rebuild_status_counts
+
+    parser = argparse.ArgumentParser(description="Recalcula task_daily_stats y task_status_counts desde la tabla tasks")
+    parser.parse_args()
+    with SessionLocal() as db:
+        rows = rebuild_daily_stats(db)
+        rebuild_status_counts(db)
+    print(f"task_daily_stats: {rows} filas")
+    print("task_status_counts: recalculada")
+
+if __name__ == "__main__":
+    main()
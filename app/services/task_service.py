@@ -1,47 +1,568 @@
 # Servicio de tareas
 # Maneja toda la lógica CRUD de tareas
 
-from sqlalchemy.orm import Session
-from app.models.task import Task
-from app.schemas.task import TaskCreate, TaskUpdate
+import base64
+import csv
+import io
+import json
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-def get_tasks(db: Session, skip: int = 0, limit: int = 10):
-    # Obtiene lista de tareas con paginación
-    # skip = cuántos saltar, limit = cuántos traer
-    return db.query(Task).offset(skip).limit(limit).all()
+from pydantic import ValidationError
+from sqlalchemy import Select, case, column, delete, func, insert, literal_column, select, table, text, tuple_, update
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from app.core.cache import task_cache
+from app.core.config import settings
+from app.db.replicas import is_replica_session
+from app.models.task import SEARCH_CONFIG, Task, TaskStatus
+from app.models.task_count import TaskStatusCount
+from app.services import stats_service
+from app.services.stats_service import TaskState
+from app.schemas.task import (
+    TaskBulkError,
+    TaskBulkFilter,
+    TaskCreate,
+    TaskExportFormat,
+    TaskFilter,
+    TaskOut,
+    TaskSort,
+    TaskUpdate,
+)
+
+# Columna por la que ordena cada opción de sort (siempre se desempata por id)
+_SORT_COLUMNS = {
+    TaskSort.CREATED_AT: Task.created_at,
+    TaskSort.CREATED_AT_DESC: Task.created_at,
+    TaskSort.TITLE: Task.title,
+    TaskSort.TITLE_DESC: Task.title,
+}
+
+# Listados en modo filas (as_rows=True): las columnas de TaskOut en su orden
+# y version al final (la usa el ETag, no se escribe en la respuesta)
+TASK_OUT_FIELDS = tuple(TaskOut.model_fields)
+_ROW_COLUMNS = tuple(Task.__table__.c[name] for name in TASK_OUT_FIELDS) + (Task.__table__.c.version,)
+
+def rows_statement(statement: Select) -> Select:
+    # Mismo WHERE/ORDER BY pero con columnas sueltas: filas Core, sin objetos ORM
+    return statement.with_only_columns(*_ROW_COLUMNS)
+
+def _is_descending(sort: TaskSort) -> bool:
+    return sort.value.startswith("-")
+
+def encode_cursor(task: Task, sort: TaskSort = TaskSort.CREATED_AT) -> str:
+    # Arma un cursor opaco con el orden y la posición (valor, id) de la última tarea
+    value = getattr(task, _SORT_COLUMNS[sort].key)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort.value, value, task.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort: TaskSort = TaskSort.CREATED_AT) -> Tuple[Any, int]:
+    # Inverso de encode_cursor, lanza ValueError si el cursor no es válido
+    # o si se generó con otro orden
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, task_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if cursor_sort != sort.value:
+            raise ValueError("El cursor es de otro orden")
+        if _SORT_COLUMNS[sort] is Task.created_at:
+            value = datetime.fromisoformat(value)
+        elif not isinstance(value, str):
+            raise ValueError("Cursor inválido")
+        return value, int(task_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Cursor inválido") from exc
+
+def _filter_conditions(criteria: Optional[TaskFilter]) -> list:
+    # Traduce un filtro (del listado o de una operación masiva) a condiciones WHERE
+    conditions = []
+    if criteria is None:
+        return conditions
+    if getattr(criteria, "ids", None) is not None:
+        conditions.append(Task.id.in_(criteria.ids))
+    if criteria.status is not None:
+        conditions.append(Task.status == criteria.status)
+    if criteria.created_after is not None:
+        conditions.append(Task.created_at >= criteria.created_after)
+    if criteria.created_before is not None:
+        conditions.append(Task.created_at < criteria.created_before)
+    if getattr(criteria, "title_contains", None) is not None:
+        conditions.append(Task.title.icontains(criteria.title_contains, autoescape=True))
+    return conditions
+
+def tasks_statement(
+    skip: int = 0,
+    limit: int = 10,
+    after: Optional[Tuple[Any, int]] = None,
+    filters: Optional[TaskFilter] = None,
+    sort: TaskSort = TaskSort.CREATED_AT
+) -> Select:
+    # Arma el SELECT del listado filtrado y ordenado por (columna de sort, id)
+    # Se comparte con el servicio async para que ambos listen igual
+    # Los índices (status, created_at, id) y (status, title, id) cubren
+    # los listados filtrados por estado
+    sort_column = _SORT_COLUMNS[sort]
+    key = tuple_(sort_column, Task.id)
+    statement = select(Task).where(*_filter_conditions(filters))
+    if _is_descending(sort):
+        statement = statement.order_by(sort_column.desc(), Task.id.desc())
+        if after is not None:
+            statement = statement.where(key < after)
+    else:
+        statement = statement.order_by(sort_column, Task.id)
+        if after is not None:
+            # Keyset: el índice arranca en la posición del cursor, sin leer las filas anteriores
+            statement = statement.where(key > after)
+    if skip:
+        statement = statement.offset(skip)
+    return statement.limit(limit)
+
+def get_tasks(
+    db: Session,
+    skip: int = 0,
+    limit: int = 10,
+    after: Optional[Tuple[Any, int]] = None,
+    filters: Optional[TaskFilter] = None,
+    sort: TaskSort = TaskSort.CREATED_AT,
+    as_rows: bool = False
+):
+    # Obtiene lista de tareas filtradas y ordenadas
+    # skip = cuántos saltar (modo página), after = posición del cursor (modo keyset)
+    # as_rows = filas Core con TASK_OUT_FIELDS + version en vez de objetos Task
+    statement = tasks_statement(skip=skip, limit=limit, after=after, filters=filters, sort=sort)
+    if as_rows:
+        return db.execute(rows_statement(statement)).all()
+    return db.scalars(statement).all()
+
+# Content-Type de cada formato de export
+EXPORT_MEDIA_TYPES = {
+    TaskExportFormat.NDJSON: "application/x-ndjson",
+    TaskExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+# Columnas del export, en el mismo orden que la cabecera del CSV
+_EXPORT_COLUMNS = ("id", "title", "description", "status", "created_at")
+
+def export_statement(filters: Optional[TaskFilter] = None, sort: TaskSort = TaskSort.CREATED_AT) -> Select:
+    # Mismo filtro y orden que el listado, pero sin límite y con columnas sueltas
+    # (filas Core, sin armar objetos ORM ni modelos Pydantic por tarea)
+    sort_column = _SORT_COLUMNS[sort]
+    order = (sort_column.desc(), Task.id.desc()) if _is_descending(sort) else (sort_column, Task.id)
+    return (
+        select(*(Task.__table__.c[name] for name in _EXPORT_COLUMNS))
+        .where(*_filter_conditions(filters))
+        .order_by(*order)
+    )
+
+def _export_value(value: Any) -> Any:
+    if isinstance(value, TaskStatus):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def export_header(fmt: TaskExportFormat) -> str:
+    # Primera línea del archivo (NDJSON no lleva cabecera)
+    if fmt == TaskExportFormat.CSV:
+        return format_export_rows([_EXPORT_COLUMNS], fmt)
+    return ""
+
+def format_export_rows(rows: Iterable[Tuple], fmt: TaskExportFormat) -> str:
+    # Serializa un bloque de filas en un solo string para el stream
+    if fmt == TaskExportFormat.CSV:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(
+            [_export_value(value) for value in row] for row in rows
+        )
+        return buffer.getvalue()
+    return "".join(
+        json.dumps(dict(zip(_EXPORT_COLUMNS, map(_export_value, row))), ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+def export_tasks(
+    db: Session,
+    fmt: TaskExportFormat,
+    filters: Optional[TaskFilter] = None,
+    sort: TaskSort = TaskSort.CREATED_AT,
+    chunk_size: int = 1000
+) -> Iterator[str]:
+    # Genera el export bloque a bloque
+    # yield_per activa stream_results: en PostgreSQL es un cursor del servidor,
+    # así en memoria hay como mucho chunk_size filas sin importar el total
+    header = export_header(fmt)
+    if header:
+        yield header
+    result = db.execute(export_statement(filters, sort).execution_options(yield_per=chunk_size))
+    for rows in result.partitions():
+        yield format_export_rows(rows, fmt)
+
+def _cache_task(task: Task, token: Optional[int] = None) -> None:
+    # Guarda una copia plana de las columnas (los objetos ORM son de una sesión)
+    # Con token (tomado antes de leer) no pisa lo que una escritura guardó o borró mientras tanto
+    values = {attr.key: getattr(task, attr.key) for attr in Task.__table__.columns}
+    if token is None:
+        task_cache.set(task.id, values)
+    else:
+        task_cache.set_if_fresh(task.id, values, token)
+
+# Pesos de bm25 en SQLite (FTS5): una coincidencia en el título vale más que en la descripción
+SEARCH_TITLE_WEIGHT = 10.0
+SEARCH_DESCRIPTION_WEIGHT = 1.0
+
+def _fts5_query(q: str) -> str:
+    # Cada palabra como frase entre comillas: la sintaxis de FTS5 no se
+    # rompe con caracteres especiales y las palabras se combinan con AND
+    return " ".join('"{}"'.format(word.replace('"', '""')) for word in q.split())
+
+def search_statement(
+    dialect_name: str,
+    q: str,
+    skip: int = 0,
+    limit: int = 10,
+    filters: Optional[TaskFilter] = None
+) -> Select:
+    # Arma la búsqueda por relevancia usando el índice de texto del motor
+    if dialect_name == "postgresql":
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        vector = literal_column("tasks.search_vector")
+        statement = (
+            select(Task)
+            .where(vector.op("@@")(query))
+            .order_by(func.ts_rank_cd(vector, query).desc(), Task.id)
+        )
+    elif dialect_name == "sqlite":
+        fts = table("tasks_fts", column("rowid"))
+        fts_table = literal_column("tasks_fts")
+        # bm25 con peso por columna (title, description), como setweight A/B en PostgreSQL
+        # La columna rank de FTS5 es bm25 sin pesos: una descripción corta le ganaría al título
+        rank = func.bm25(fts_table, SEARCH_TITLE_WEIGHT, SEARCH_DESCRIPTION_WEIGHT)
+        statement = (
+            select(Task)
+            .join(fts, fts.c.rowid == Task.id)
+            .where(fts_table.op("MATCH")(_fts5_query(q)))
+            .order_by(rank, Task.id)  # bm25: menor es mejor
+        )
+    else:
+        # Otros motores: sin índice de texto, solo para no fallar
+        statement = (
+            select(Task)
+            .where(Task.title.icontains(q, autoescape=True) | Task.description.icontains(q, autoescape=True))
+            .order_by(Task.id)
+        )
+    return statement.where(*_filter_conditions(filters)).offset(skip).limit(limit)
+
+def search_tasks(
+    db: Session,
+    q: str,
+    skip: int = 0,
+    limit: int = 10,
+    filters: Optional[TaskFilter] = None,
+    as_rows: bool = False
+):
+    # Busca tareas por título y descripción, las más relevantes primero
+    if not q.split():
+        return []
+    statement = search_statement(db.get_bind().dialect.name, q, skip=skip, limit=limit, filters=filters)
+    if as_rows:
+        return db.execute(rows_statement(statement)).all()
+    return db.scalars(statement).all()
+
+def _apply_status_deltas(db: Session, deltas: Counter) -> None:
+    # Ajusta los contadores por estado dentro de la transacción en curso
+    # (se confirman o se descartan junto con la escritura que los cambió)
+    # En orden fijo de estado: dos transacciones nunca bloquean las filas al revés
+    # Cada fila queda bloqueada hasta el commit: las escrituras concurrentes del
+    # mismo estado esperan unas a otras (por eso TASK_COUNTERS_ENABLED viene apagado)
+    if not settings.TASK_COUNTERS_ENABLED:
+        return
+    for status in sorted(deltas):
+        delta = deltas[status]
+        if delta:
+            db.execute(
+                update(TaskStatusCount)
+                .where(TaskStatusCount.status == TaskStatus(status))
+                .values(count=TaskStatusCount.count + delta)
+            )
+
+def _state(task) -> TaskState:
+    return TaskState(TaskStatus(task.status), task.created_at, task.completed_at)
+
+def _track_changes(db: Session, removed: Iterable[TaskState] = (), added: Iterable[TaskState] = ()) -> None:
+    # Contadores por estado y rollup diario, en la transacción de la escritura
+    removed, added = list(removed), list(added)
+    deltas = Counter(state.status for state in added)
+    deltas.subtract(state.status for state in removed)
+    _apply_status_deltas(db, deltas)
+    stats_service.apply_changes(db, removed, added)
+
+def rebuild_status_counts(db: Session) -> None:
+    # Recalcula los contadores con un GROUP BY sobre toda la tabla
+    # Solo para cargas que no pasan por el servicio (p.ej. benchmarks/seed_dataset.py)
+    counts = dict(db.execute(select(Task.status, func.count()).group_by(Task.status)).all())
+    for status in TaskStatus:
+        db.execute(
+            update(TaskStatusCount).where(TaskStatusCount.status == status).values(count=counts.get(status, 0))
+        )
+    db.commit()
+
+class _Explain(Executable, ClauseElement):
+    # EXPLAIN de un SELECT con sus parámetros normales (no se pueden renderizar literales
+    # de todos los tipos, p.ej. el regconfig de la búsqueda)
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+def _planner_estimate(db: Session, statement: Select) -> int:
+    # Filas que el planner de PostgreSQL espera que devuelva el SELECT (sin ejecutarlo)
+    plan = db.execute(_Explain(statement)).scalar()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+def count_tasks(
+    db: Session,
+    filters: Optional[TaskFilter] = None,
+    q: Optional[str] = None,
+    exact_limit: int = 10000
+) -> Tuple[int, str]:
+    # Total del listado y de dónde sale: "counters", "exact" o "estimate"
+    # - Sin filtros o solo por estado: suma de task_status_counts (exacto, O(estados))
+    # - Sin filtros y sin contadores: reltuples de pg_class (estimado, se actualiza con ANALYZE)
+    # - Con otros filtros o q: COUNT(*) cortado en exact_limit + 1 filas; si se pasa, estimado del planner
+    postgres = db.get_bind().dialect.name == "postgresql"
+    dates = filters is not None and (filters.created_after is not None or filters.created_before is not None)
+    status = filters.status if filters is not None else None
+
+    if q is None and not dates:
+        if settings.TASK_COUNTERS_ENABLED:
+            statement = select(func.coalesce(func.sum(TaskStatusCount.count), 0))
+            if status is not None:
+                statement = statement.where(TaskStatusCount.status == TaskStatus(status))
+            return int(db.scalar(statement)), "counters"
+        if status is None and postgres:
+            estimate = db.scalar(text("SELECT reltuples FROM pg_class WHERE oid = 'tasks'::regclass"))
+            # -1 = la tabla nunca se analizó (PostgreSQL 14+)
+            if estimate is not None and estimate >= 0:
+                return int(estimate), "estimate"
+
+    if q is not None:
+        if not q.split():
+            return 0, "exact"
+        statement = search_statement(db.get_bind().dialect.name, q, filters=filters)
+        statement = statement.with_only_columns(Task.id).order_by(None).offset(None).limit(None)
+    else:
+        statement = select(Task.id).where(*_filter_conditions(filters))
+
+    bounded = select(func.count()).select_from(statement.limit(exact_limit + 1).subquery())
+    total = db.scalar(bounded)
+    if total <= exact_limit:
+        return total, "exact"
+    if postgres:
+        return max(total, _planner_estimate(db, statement)), "estimate"
+    return db.scalar(select(func.count()).select_from(statement.subquery())), "exact"
 
 def get_task(db: Session, task_id: int):
-    # Busca una tarea por ID
-    return db.query(Task).filter(Task.id == task_id).first()
+    # Busca una tarea por ID, primero en el cache
+    cached = task_cache.get(task_id)
+    if cached is not None:
+        # La copia se adjunta a la sesión sin SELECT, así update/delete siguen funcionando
+        task = Task(**cached)
+        make_transient_to_detached(task)
+        return db.merge(task, load=False)
+
+    token = task_cache.token()
+    task = db.query(Task).filter(Task.id == task_id).first()
+    # Solo se cachea lo leído del primario: una réplica atrasada dejaría la versión
+    # vieja en el cache y la vería hasta quien acaba de escribir (read-your-writes)
+    if task is not None and not is_replica_session(db):
+        _cache_task(task, token)
+    return task
 
 def create_task(db: Session, obj_in: TaskCreate):
     # Crea una nueva tarea en la BD
+    # created_at va explícito para conocer su día antes del INSERT (rollup de stats)
+    now = datetime.now(timezone.utc)
+    status = TaskStatus(obj_in.status or TaskStatus.PENDING)
     db_obj = Task(
         title=obj_in.title,
         description=obj_in.description,
-        status=obj_in.status
+        status=status,
+        created_at=now,
+        completed_at=now if status == TaskStatus.COMPLETED else None
     )
     db.add(db_obj)
+    # tasks antes que contadores y rollup, como el resto de las escrituras
+    db.flush()
+    _track_changes(db, added=[_state(db_obj)])
     db.commit()
     db.refresh(db_obj)
+    _cache_task(db_obj)
     return db_obj
 
+def validate_bulk_items(items: List[Dict[str, Any]]) -> Tuple[List[TaskCreate], List[TaskBulkError]]:
+    # Valida cada item de una carga masiva en una sola pasada
+    # Los inválidos no frenan a los demás, se reportan por índice
+    valid: List[TaskCreate] = []
+    errors: List[TaskBulkError] = []
+    for index, item in enumerate(items):
+        try:
+            valid.append(TaskCreate.model_validate(item))
+        except ValidationError as exc:
+            errors.append(TaskBulkError(
+                index=index,
+                errors=exc.errors(include_url=False, include_context=False)
+            ))
+    return valid, errors
+
+def create_tasks(db: Session, objs_in: List[TaskCreate], chunk_size: int = 1000):
+    # Crea muchas tareas con un INSERT multi-fila ... RETURNING por bloque
+    # y un solo commit al final (sin refresh por cada fila)
+    # Retorna filas planas (no objetos ORM) para no recargarlas tras el commit
+    created = []
+    postgres = db.get_bind().dialect.name == "postgresql"
+    for start in range(0, len(objs_in), chunk_size):
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "title": obj.title,
+                "description": obj.description,
+                "status": obj.status or TaskStatus.PENDING,
+                "completed_at": now if obj.status == TaskStatus.COMPLETED else None,
+            }
+            for obj in objs_in[start:start + chunk_size]
+        ]
+        # Core (no ORM) para que SQLAlchemy agrupe las filas en un solo
+        # INSERT ... VALUES (...), (...) RETURNING (insertmanyvalues)
+        # PostgreSQL no garantiza que RETURNING siga el orden de los VALUES: con
+        # sort_by_parameter_order SQLAlchemy las devuelve en el orden de rows (usa el id
+        # como centinela y sigue siendo un INSERT por bloque)
+        # SQLite no lo soporta sin partir el bloque en un INSERT por fila; ahí un INSERT
+        # multi-fila asigna los rowid en orden (un solo escritor), así que se ordena por id
+        result = db.execute(
+            insert(Task.__table__).returning(*Task.__table__.c, sort_by_parameter_order=postgres), rows
+        )
+        chunk = result.all() if postgres else sorted(result.all(), key=lambda row: row.id)
+        _track_changes(db, added=[_state(row) for row in chunk])
+        created.extend(chunk)
+    db.commit()
+    return created
+
 def update_task(db: Session, db_obj: Task, obj_in: TaskUpdate):
     # Actualiza una tarea existente
     # Solo actualiza los campos que vengan en obj_in
     update_data = obj_in.model_dump(exclude_unset=True)
+    old_state = _state(db_obj)
     for field in update_data:
         setattr(db_obj, field, update_data[field])
     
     db.add(db_obj)
-    db.commit()
+    status_changed = db_obj.status is not None and TaskStatus(db_obj.status) != old_state.status
+    if status_changed:
+        db_obj.completed_at = datetime.now(timezone.utc) if db_obj.status == TaskStatus.COMPLETED else None
+    try:
+        if status_changed:
+            # Primero el UPDATE de tasks y después contadores y rollup: mismo orden de locks
+            # que _run_in_chunks. Si falla por version, el rollback descarta todo junto
+            db.flush()
+            _track_changes(db, removed=[old_state], added=[_state(db_obj)])
+        db.commit()
+    except StaleDataError:
+        # Otro request la modificó después de leerla (version distinta)
+        db.rollback()
+        task_cache.delete(db_obj.id)
+        raise
     db.refresh(db_obj)
+    # Después del commit, así ninguna lectura ve el valor viejo
+    _cache_task(db_obj)
     return db_obj
 
 def delete_task(db: Session, task_id: int):
     # Elimina una tarea de la BD
-    obj = db.query(Task).get(task_id)
+    obj = db.get(Task, task_id)
     if obj:
         db.delete(obj)
+        db.flush()
+        _track_changes(db, removed=[_state(obj)])
+        db.commit()
+        task_cache.delete(task_id)
+    return obj
+
+def _run_in_chunks(db: Session, criteria: TaskBulkFilter, chunk_size: int, build_statement, new_states) -> int:
+    # Ejecuta un UPDATE/DELETE por bloque de ids (ordenados) y hace commit
+    # de cada bloque para no retener locks demasiado tiempo
+    # Las filas del bloque se leen (bloqueadas hasta el commit) para ajustar contadores
+    # y rollup en la misma transacción: new_states(filas) da el estado de cada una
+    # después de la escritura (vacío si se borran)
+    conditions = _filter_conditions(criteria)
+    affected = 0
+    last_id = 0
+    while True:
+        chunk = db.execute(
+            select(Task.id, Task.status, Task.created_at, Task.completed_at)
+            .where(*conditions, Task.id > last_id)
+            .order_by(Task.id)
+            .limit(chunk_size)
+            .with_for_update()
+        ).all()
+        if not chunk:
+            db.commit()
+            return affected
+        ids = [row.id for row in chunk]
+        db.execute(build_statement(Task.id.in_(ids)).execution_options(synchronize_session=False))
+        _track_changes(db, removed=[_state(row) for row in chunk], added=new_states(chunk))
         db.commit()
-    return obj
\ No newline at end of file
+        for task_id in ids:
+            task_cache.delete(task_id)
+        affected += len(ids)
+        if len(ids) < chunk_size:
+            return affected
+        last_id = ids[-1]
+
+def update_tasks(db: Session, criteria: TaskBulkFilter, obj_in: TaskUpdate, chunk_size: int = 1000) -> int:
+    # Actualiza de forma masiva las tareas que cumplen el filtro
+    # Retorna cuántas filas se actualizaron
+    # version se sube a mano: el UPDATE masivo no pasa por el versionado del ORM
+    values = {**obj_in.model_dump(exclude_unset=True), "version": Task.version + 1}
+    new_status = TaskStatus(values["status"]) if values.get("status") is not None else None
+    now = datetime.now(timezone.utc)
+    if new_status == TaskStatus.COMPLETED:
+        # Las que ya estaban completadas conservan su fecha
+        values["completed_at"] = case((Task.status == TaskStatus.COMPLETED, Task.completed_at), else_=now)
+    elif new_status is not None:
+        values["completed_at"] = None
+
+    def new_states(rows):
+        if new_status is None:
+            return [_state(row) for row in rows]
+        return [
+            TaskState(
+                new_status,
+                row.created_at,
+                (row.completed_at if row.status == TaskStatus.COMPLETED else now)
+                if new_status == TaskStatus.COMPLETED else None
+            )
+            for row in rows
+        ]
+
+    return _run_in_chunks(
+        db, criteria, chunk_size,
+        lambda where: update(Task).where(where).values(**values),
+        new_states
+    )
+
+def delete_tasks(db: Session, criteria: TaskBulkFilter, chunk_size: int = 1000) -> int:
+    # Elimina de forma masiva las tareas que cumplen el filtro
+    # Retorna cuántas filas se eliminaron
+    return _run_in_chunks(
+        db, criteria, chunk_size,
+        lambda where: delete(Task).where(where),
+        lambda rows: []
+    )
@@ -0,0 +1 @@
+# Benchmarks de rendimiento (no se ejecutan con pytest)
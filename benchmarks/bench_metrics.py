@@ -0,0 +1,76 @@
+"""
+Benchmark del costo de MetricsMiddleware por request
+
+Llama N veces a una app ASGI mínima directamente (sin red ni cliente HTTP),
+con y sin el middleware, y a la app FastAPI real en GET /health, para ver
+cuánto agrega medir cada request frente a lo que ya cuesta atenderlo.
+
+Ejecutar con:
+    python -m benchmarks.bench_metrics --requests 20000
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+
+from app.core.metrics import MetricsMiddleware
+
+
+async def bare_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def build_fastapi(with_metrics: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/tasks/{task_id}")
+    def read_task(task_id: int):
+        return {"id": task_id, "title": "Tarea", "status": "pending"}
+
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def run(app, requests: int, path: str) -> float:
+    # Devuelve µs por request
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [], "client": ("127.0.0.1", 1234), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(dict(scope), receive, send)  # Calentamiento (arma el middleware stack)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    cases = [
+        ("asgi mínima", bare_app, MetricsMiddleware(bare_app), "/x"),
+        ("fastapi", build_fastapi(False), build_fastapi(True), "/tasks/1"),
+    ]
+    print(f"{'app':<12} {'sin µs/req':>11} {'con µs/req':>11} {'overhead µs':>12} {'overhead %':>11}")
+    for name, plain, measured, path in cases:
+        without = asyncio.run(run(plain, args.requests, path))
+        with_metrics = asyncio.run(run(measured, args.requests, path))
+        overhead = with_metrics - without
+        print(f"{name:<12} {without:>11.1f} {with_metrics:>11.1f} {overhead:>12.1f} {overhead / without * 100:>10.1f}%")
+
+
+if __name__ == "__main__":
+    main()
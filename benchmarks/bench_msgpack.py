@@ -0,0 +1,72 @@
+"""
+Benchmark de formatos: JSON (stdlib y orjson) vs MessagePack
+
+Arma una lista de TaskOut ya en modo JSON (lo que recibe la clase de respuesta)
+y mide tamaño del payload y tiempo de encode/decode de cada formato.
+
+Ejecutar con:
+    python -m benchmarks.bench_msgpack --rows 10 100 1000 --repeat 500
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+import msgpack
+import orjson
+from fastapi.responses import JSONResponse
+
+from app.core.msgpack_route import MsgPackResponse
+
+
+def build_payload(rows: int) -> list:
+    created = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "title": f"Tarea {i}",
+            "description": "Descripción de la tarea con acentos ñ " * 2,
+            "status": ("pending", "in_progress", "completed")[i % 3],
+            "id": i + 1,
+            "created_at": (created + timedelta(seconds=i)).isoformat().replace("+00:00", "Z"),
+            "updated_at": (created + timedelta(seconds=i, microseconds=123456)).isoformat().replace("+00:00", "Z"),
+        }
+        for i in range(rows)
+    ]
+
+
+# Encoders tal como los usan las clases de respuesta, decoders como los usaría el cliente
+FORMATS = {
+    "json": (lambda content: JSONResponse(content).body, json.loads),
+    "orjson": (orjson.dumps, orjson.loads),
+    "msgpack": (lambda content: MsgPackResponse(content).body, msgpack.unpackb),
+}
+
+
+def per_call_us(fn, arg, repeat: int) -> float:
+    fn(arg)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(arg)
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'filas':>6} {'formato':<8} {'bytes':>9} {'encode µs':>10} {'decode µs':>10}")
+    for rows in args.rows:
+        payload = build_payload(rows)
+        for name, (encode, decode) in FORMATS.items():
+            body = encode(payload)
+            assert decode(body) == payload, f"{name} no conserva el payload"
+            print(
+                f"{rows:>6} {name:<8} {len(body):>9} "
+                f"{per_call_us(encode, payload, args.repeat):>10.1f} {per_call_us(decode, body, args.repeat):>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
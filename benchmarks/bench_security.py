@@ -0,0 +1,68 @@
+"""
+Micro-benchmarks de app.core.security
+
+Mide get_password_hash y verify_password para varios costos de bcrypt, y
+create_access_token y el jwt.decode de dependencies.decode_token para tokens
+con distintos tamaños de payload. Todo en el mismo hilo, sin el pool de procesos.
+
+Ejecutar con:
+    python -m benchmarks.bench_security --rounds 10 11 12 13 --payload-bytes 0 256 1024 4096
+
+Con --target-ms muestra además el costo que elegiría BCRYPT_TARGET_MS en este host.
+"""
+import argparse
+import time
+
+from app.core import security
+from app.core.dependencies import decode_token
+
+PASSWORD = "benchpass123"
+
+
+def per_call_us(fn, iterations: int) -> float:
+    fn()  # Calentamiento
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def bench_bcrypt(rounds: list, iterations: int) -> None:
+    print(f"{'rounds':>6} {'hash ms':>9} {'verify ms':>10} {'verify/s':>9}")
+    for r in rounds:
+        hashed = security.get_password_hash(PASSWORD, rounds=r)
+        hash_us = per_call_us(lambda: security.get_password_hash(PASSWORD, rounds=r), iterations)
+        verify_us = per_call_us(lambda: security.verify_password(PASSWORD, hashed), iterations)
+        print(f"{r:>6} {hash_us / 1000:>9.1f} {verify_us / 1000:>10.1f} {1e6 / verify_us:>9.1f}")
+
+
+def bench_jwt(payload_sizes: list, iterations: int) -> None:
+    print(f"\n{'payload B':>9} {'token B':>8} {'create µs':>10} {'decode µs':>10}")
+    for size in payload_sizes:
+        # Claims extra del tamaño pedido, como harían roles o permisos en el token
+        data = {"sub": "bench@example.com", "extra": "x" * size}
+        create = lambda: security.create_access_token(data, user_id=1, epoch=0)
+        token = create()
+        create_us = per_call_us(create, iterations)
+        decode_us = per_call_us(lambda: decode_token(token), iterations)
+        print(f"{size:>9} {len(token):>8} {create_us:>10.1f} {decode_us:>10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--bcrypt-iterations", type=int, default=5)
+    parser.add_argument("--payload-bytes", type=int, nargs="+", default=[0, 256, 1024, 4096])
+    parser.add_argument("--jwt-iterations", type=int, default=5000)
+    parser.add_argument("--target-ms", type=float, help="Costo que elegiría la calibración para este objetivo")
+    args = parser.parse_args()
+
+    bench_bcrypt(args.rounds, args.bcrypt_iterations)
+    bench_jwt(args.payload_bytes, args.jwt_iterations)
+    if args.target_ms:
+        rounds = security.calibrate_bcrypt_rounds(args.target_ms)
+        print(f"\nBCRYPT_TARGET_MS={args.target_ms:g} -> {rounds} rounds")
+
+
+if __name__ == "__main__":
+    main()
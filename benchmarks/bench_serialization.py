@@ -0,0 +1,106 @@
+"""
+Micro-benchmark de serialización de listados: response_model vs filas + orjson
+
+Mide el costo por fila de las dos formas de armar GET /tasks, separando la
+consulta de la serialización:
+
+- orm:  objetos Task -> TaskOut (from_attributes, validación) -> json de la stdlib
+        (lo que hace FastAPI con response_model=List[TaskOut])
+- fast: filas Core -> dict -> orjson (TASKS_FAST_SERIALIZATION=True)
+
+Ejecutar con:
+    python -m benchmarks.bench_serialization --rows 100 1000 --repeat 200
+
+Usa SQLite en memoria, así que la parte de consulta no incluye red.
+"""
+import argparse
+import time
+from typing import List
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.responses import FastJSONResponse
+from app.db.session import Base
+from app.models.task import Task
+from app.schemas.task import TaskOut
+from app.services import task_service
+
+# Se crea una sola vez, igual que el response field de la ruta
+TASK_LIST_ADAPTER = TypeAdapter(List[TaskOut])
+
+
+def seed(db, rows: int) -> None:
+    db.add_all(
+        Task(title=f"Tarea {i}", description="Descripción de la tarea con acentos ñ " * 2)
+        for i in range(rows)
+    )
+    db.commit()
+
+
+def fetch_orm(db, rows: int):
+    db.expunge_all()  # Sin esto el identity map reusa los objetos y la consulta parece gratis
+    return task_service.get_tasks(db, limit=rows)
+
+
+def fetch_rows(db, rows: int):
+    return task_service.get_tasks(db, limit=rows, as_rows=True)
+
+
+def serialize_orm(tasks) -> bytes:
+    content = TASK_LIST_ADAPTER.dump_python(
+        TASK_LIST_ADAPTER.validate_python(tasks, from_attributes=True), mode="json"
+    )
+    return JSONResponse(content).body
+
+
+def serialize_rows(rows) -> bytes:
+    return FastJSONResponse([dict(zip(task_service.TASK_OUT_FIELDS, row)) for row in rows]).body
+
+
+def per_row_us(fn, arg, rows: int, repeat: int) -> float:
+    fn(arg)  # Calentamiento
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(arg)
+    return (time.perf_counter() - started) / repeat / rows * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000], help="Tamaños de página a medir")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    seed(db, max(args.rows))
+
+    print(f"{'filas':>6} {'camino':<6} {'consulta µs/fila':>17} {'serializar µs/fila':>19} {'total µs/fila':>14}")
+    for rows in args.rows:
+        tasks = fetch_orm(db, rows)
+        plain = fetch_rows(db, rows)
+        assert serialize_orm(tasks) == serialize_rows(plain), "Los dos caminos deben dar el mismo JSON"
+
+        results = {
+            "orm": (
+                per_row_us(lambda n: fetch_orm(db, n), rows, rows, args.repeat),
+                per_row_us(serialize_orm, tasks, rows, args.repeat),
+            ),
+            "fast": (
+                per_row_us(lambda n: fetch_rows(db, n), rows, rows, args.repeat),
+                per_row_us(serialize_rows, plain, rows, args.repeat),
+            ),
+        }
+        for path, (query_us, serialize_us) in results.items():
+            print(f"{rows:>6} {path:<6} {query_us:>17.2f} {serialize_us:>19.2f} {query_us + serialize_us:>14.2f}")
+        speedup = sum(results["orm"]) / sum(results["fast"])
+        print(f"{rows:>6} orm/fast: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Generador de datos sintéticos para medir a escala
+
+Siembra N usuarios y M tareas con distribuciones parecidas a producción:
+- estados: la mayoría completadas, menos pendientes y pocas en curso
+- created_at repartido en --days días, con más tareas cerca del presente
+  (la carga crece con el tiempo); los ids siguen el orden de created_at
+- títulos de 2 a 12 palabras y descripciones de largo log-normal (un 30% sin descripción)
+
+Ejecutar con:
+    python -m benchmarks.seed_dataset --users 10000 --tasks 10000000
+    python -m benchmarks.seed_dataset --database-url sqlite:///scale.db --tasks 1000000
+
+En Postgres carga con COPY y en SQLite con executemany por lotes. Con
+--defer-indexes además borra los índices de tasks (y en SQLite los triggers de
+FTS) antes de cargar y los recrea al final: mucho más rápido que mantenerlos
+fila por fila. Al terminar corre ANALYZE para que el planner vea el tamaño
+real y recalcula los contadores por estado y el rollup diario. Sin
+--database-url usa la base del .env.
+"""
+import argparse
+import math
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.db.session import Base
+from app.models.revocation import RevokedToken, UserEpoch
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+from app.services.stats_service import rebuild_daily_stats
+from app.services.task_service import rebuild_status_counts
+
+PASSWORD = "seedpass123"
+
+# Peso de cada estado en el total de tareas
+STATUS_WEIGHTS = {TaskStatus.COMPLETED: 0.6, TaskStatus.PENDING: 0.28, TaskStatus.IN_PROGRESS: 0.12}
+
+# Vocabulario en español para que la búsqueda de texto (config "spanish") tenga algo real que indexar
+WORDS = (
+    "revisar actualizar corregir preparar enviar llamar documentar migrar desplegar probar "
+    "diseñar configurar reunión cliente proveedor factura reporte informe presupuesto contrato "
+    "servidor base datos backup índice consulta error fallo pago usuario cuenta acceso permiso "
+    "equipo proyecto sprint tarea entrega revisión código pruebas calidad seguridad soporte "
+    "ventas marketing campaña correo agenda plan mensual semanal urgente pendiente nuevo viejo "
+    "producción staging manual guía política inventario pedido envío stock almacén logística"
+).split()
+
+# Títulos y descripciones se arman una vez y se reparten entre las filas:
+# generar texto por fila sería lo más lento de toda la carga
+TEXT_POOL_SIZE = 20000
+
+
+def build_text_pools(rng: random.Random) -> tuple:
+    titles = [" ".join(rng.choices(WORDS, k=rng.randint(2, 12))).capitalize() for _ in range(TEXT_POOL_SIZE)]
+    descriptions = []
+    for _ in range(TEXT_POOL_SIZE):
+        if rng.random() < 0.3:
+            descriptions.append(None)
+        else:
+            # Mediana ~20 palabras, con una cola larga de descripciones de varios párrafos
+            words = min(400, max(1, int(rng.lognormvariate(math.log(20), 0.9))))
+            descriptions.append(" ".join(rng.choices(WORDS, k=words)).capitalize() + ".")
+    return titles, descriptions
+
+
+def task_rows(rng: random.Random, count: int, days: int, batch_size: int):
+    # Genera lotes de filas (title, description, status, created_at, updated_at, completed_at, version)
+    titles, descriptions = build_text_pools(rng)
+    statuses = [status.name for status in STATUS_WEIGHTS]
+    weights = list(STATUS_WEIGHTS.values())
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(days=days)
+    span = (end - start).total_seconds()
+
+    for offset in range(0, count, batch_size):
+        size = min(batch_size, count - offset)
+        batch_statuses = rng.choices(statuses, weights, k=size)
+        batch_titles = rng.choices(titles, k=size)
+        batch_descriptions = rng.choices(descriptions, k=size)
+        batch = []
+        for i in range(size):
+            # Acumulado ~ t²: la cantidad de tareas por día crece linealmente hacia el presente
+            created = start + timedelta(seconds=span * math.sqrt((offset + i) / count))
+            status = batch_statuses[i]
+            if status == TaskStatus.PENDING.name:
+                updated, version = created, 1
+            else:
+                # Las que avanzaron se tocaron entre minutos y semanas después
+                updated = min(end, created + timedelta(seconds=rng.expovariate(1 / 86400)))
+                version = 2 if status == TaskStatus.IN_PROGRESS.name else 3
+            # Las completadas se cerraron en su última modificación
+            completed = updated if status == TaskStatus.COMPLETED.name else None
+            batch.append((batch_titles[i], batch_descriptions[i], status, created, updated, completed, version))
+        yield batch
+
+
+def _copy_line(row) -> str:
+    # Formato text de COPY; el vocabulario no tiene tabs, saltos ni barras invertidas
+    title, description, status, created, updated, completed, version = row
+    description = "\\N" if description is None else description
+    completed = "\\N" if completed is None else completed.isoformat()
+    return f"{title}\t{description}\t{status}\t{created.isoformat()}\t{updated.isoformat()}\t{completed}\t{version}\n"
+
+
+def load_tasks_postgres(engine, batches, defer_indexes: bool) -> None:
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        indexes = []
+        if defer_indexes:
+            cursor.execute(
+                "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = 'tasks' AND indexname <> 'tasks_pkey'"
+            )
+            indexes = cursor.fetchall()
+            for name, _ in indexes:
+                cursor.execute(f'DROP INDEX "{name}"')
+        columns = "title, description, status, created_at, updated_at, completed_at, version"
+        with cursor.copy(f"COPY tasks ({columns}) FROM STDIN") as copy:
+            for batch in batches:
+                copy.write("".join(_copy_line(row) for row in batch))
+        for name, definition in indexes:
+            print(f"Recreando {name}...")
+            cursor.execute(definition)
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def load_tasks_sqlite(engine, batches, defer_indexes: bool) -> None:
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        deferred = []
+        if defer_indexes:
+            # Índices y triggers de FTS; el índice de texto se reconstruye de una vez al final
+            deferred = cursor.execute(
+                "SELECT type, name, sql FROM sqlite_master "
+                "WHERE tbl_name = 'tasks' AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+            ).fetchall()
+            for kind, name, _ in deferred:
+                cursor.execute(f'DROP {kind.upper()} "{name}"')
+        for batch in batches:
+            # Mismo formato de fechas que escribe SQLAlchemy en SQLite
+            fmt = "%Y-%m-%d %H:%M:%S.%f"
+            cursor.executemany(
+                "INSERT INTO tasks (title, description, status, created_at, updated_at, completed_at, version) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(t, d, s, c.strftime(fmt), u.strftime(fmt), done and done.strftime(fmt), v)
+                 for t, d, s, c, u, done, v in batch],
+            )
+        for kind, name, sql in deferred:
+            print(f"Recreando {name}...")
+            cursor.execute(sql)
+        if any(kind == "trigger" for kind, _, _ in deferred):
+            cursor.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def seed_users(engine, rng: random.Random, count: int, batch_size: int) -> None:
+    # Todos comparten password: un solo bcrypt en vez de uno por usuario
+    hashed = get_password_hash(PASSWORD)
+    with engine.begin() as connection:
+        first = (connection.scalar(select(func.max(User.id))) or 0) + 1
+        for offset in range(0, count, batch_size):
+            connection.execute(User.__table__.insert(), [
+                {"email": f"seed{first + i}@example.com", "hashed_password": hashed, "is_active": rng.random() < 0.97}
+                for i in range(offset, min(offset + batch_size, count))
+            ])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=730, help="Días hacia atrás que cubre created_at")
+    parser.add_argument("--batch-size", type=int, default=50000, help="Filas por lote de COPY/executemany")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla del generador (mismo valor = mismos datos)")
+    parser.add_argument("--database-url", default=settings.SQLALCHEMY_DATABASE_URL)
+    parser.add_argument("--defer-indexes", action="store_true", help="Recrear los índices de tasks (y el de texto) al final")
+    parser.add_argument("--truncate", action="store_true", help="Vaciar tasks, users y sus tokens revocados antes de sembrar")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    postgres = engine.dialect.name == "postgresql"
+    if args.truncate:
+        # user_epochs tiene FK a users; revoked_tokens son de los usuarios que se borran
+        tables = (Task, UserEpoch, RevokedToken, User)
+        with engine.begin() as connection:
+            if postgres:
+                names = ", ".join(model.__tablename__ for model in tables)
+                connection.execute(text(f"TRUNCATE {names} RESTART IDENTITY"))
+            else:
+                for model in tables:
+                    connection.execute(model.__table__.delete())
+
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    seed_users(engine, rng, args.users, args.batch_size)
+    print(f"{args.users} usuarios (password {PASSWORD!r}) en {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    batches = task_rows(rng, args.tasks, args.days, args.batch_size)
+    if postgres:
+        load_tasks_postgres(engine, batches, args.defer_indexes)
+    else:
+        load_tasks_sqlite(engine, batches, args.defer_indexes)
+    elapsed = time.perf_counter() - started
+    print(f"{args.tasks} tareas en {elapsed:.1f}s ({args.tasks / max(elapsed, 1e-9):,.0f} filas/s)")
+
+    # La carga no pasa por task_service: contadores y rollup diario se recalculan de una vez
+    with Session(engine) as db:
+        rebuild_status_counts(db)
+        rebuild_daily_stats(db)
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE"))
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,9 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from app.db.session import Base
 from app.models.user import User
 from app.models.task import Task
+from app.models.revocation import RevokedToken, UserEpoch
+from app.models.task_count import TaskStatusCount
+from app.models.task_stats import TaskDailyStats
 from app.core.config import settings
 
 config = context.config
@@ -0,0 +1,34 @@
+"""Keyset pagination index on tasks
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Índice compuesto para paginar por (created_at, id) sin OFFSET
+    if op.get_bind().dialect.name == 'postgresql':
+        # CONCURRENTLY no bloquea las escrituras en tasks mientras se construye,
+        # pero no puede correr dentro de una transacción
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'ix_tasks_created_at_id', 'tasks', ['created_at', 'id'], unique=False, postgresql_concurrently=True
+            )
+    else:
+        op.create_index('ix_tasks_created_at_id', 'tasks', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index('ix_tasks_created_at_id', table_name='tasks', postgresql_concurrently=True)
+    else:
+        op.drop_index('ix_tasks_created_at_id', table_name='tasks')
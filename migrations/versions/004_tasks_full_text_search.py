@@ -0,0 +1,65 @@
+"""Full-text search over task title and description
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Mismo DDL que crea create_all (ver app/models/task.py)
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute(
+            """
+            ALTER TABLE tasks ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('spanish', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('spanish', coalesce(description, '')), 'B')
+            ) STORED
+            """
+        )
+        op.execute('CREATE INDEX ix_tasks_search_vector ON tasks USING gin (search_vector)')
+    elif dialect == 'sqlite':
+        op.execute("CREATE VIRTUAL TABLE tasks_fts USING fts5(title, description, content='tasks', content_rowid='id')")
+        op.execute(
+            """
+            CREATE TRIGGER tasks_fts_ai AFTER INSERT ON tasks BEGIN
+                INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER tasks_fts_ad AFTER DELETE ON tasks BEGIN
+                INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+                INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+                INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+            END
+            """
+        )
+        # Indexa las filas que ya existían
+        op.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_tasks_search_vector')
+        op.execute('ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector')
+    elif dialect == 'sqlite':
+        for trigger in ('tasks_fts_ai', 'tasks_fts_ad', 'tasks_fts_au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS tasks_fts')
@@ -0,0 +1,52 @@
+"""Composite indexes for filtered and sorted task listings
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+# (nombre, columnas) en el orden en que se crean
+INDEXES = [
+    # ?status= con orden por created_at o title: el filtro de igualdad va primero
+    # y el resto de la clave coincide con el ORDER BY, así no hay sort en memoria
+    ('ix_tasks_status_created_at_id', ['status', 'created_at', 'id']),
+    ('ix_tasks_status_title_id', ['status', 'title', 'id']),
+    # ?sort=title sin filtro, con id como desempate del cursor
+    ('ix_tasks_title_id', ['title', 'id']),
+]
+
+
+def upgrade() -> None:
+    # ix_tasks_title (001) queda cubierto por ix_tasks_title_id: mismo prefijo,
+    # y mantenerlo solo suma costo a cada escritura
+    if op.get_bind().dialect.name == 'postgresql':
+        # CONCURRENTLY no bloquea las escrituras en tasks mientras se construyen,
+        # pero no puede correr dentro de una transacción
+        with op.get_context().autocommit_block():
+            for name, columns in INDEXES:
+                op.create_index(name, 'tasks', columns, unique=False, postgresql_concurrently=True)
+            op.drop_index('ix_tasks_title', table_name='tasks', postgresql_concurrently=True)
+    else:
+        for name, columns in INDEXES:
+            op.create_index(name, 'tasks', columns, unique=False)
+        op.drop_index('ix_tasks_title', table_name='tasks')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.create_index('ix_tasks_title', 'tasks', ['title'], unique=False, postgresql_concurrently=True)
+            for name, _ in reversed(INDEXES):
+                op.drop_index(name, table_name='tasks', postgresql_concurrently=True)
+    else:
+        op.create_index('ix_tasks_title', 'tasks', ['title'], unique=False)
+        for name, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='tasks')
@@ -0,0 +1,25 @@
+"""Add updated_at and version to tasks for ETags and optimistic locking
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Las filas existentes quedan en version 1 y updated_at = momento de la migración
+    op.add_column('tasks', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+    op.add_column('tasks', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('tasks', 'version')
+    op.drop_column('tasks', 'updated_at')
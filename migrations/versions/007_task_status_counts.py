@@ -0,0 +1,39 @@
+"""Per-status task counters for fast listing totals
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Reutiliza el tipo enum de tasks.status (creado en la migración 001)
+    status_type = postgresql.ENUM('PENDING', 'IN_PROGRESS', 'COMPLETED', name='taskstatus', create_type=False)
+    counts = op.create_table(
+        'task_status_counts',
+        sa.Column('status', status_type.with_variant(sa.String(), 'sqlite'), nullable=False),
+        sa.Column('count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('status')
+    )
+    op.bulk_insert(counts, [{'status': status, 'count': 0} for status in ('PENDING', 'IN_PROGRESS', 'COMPLETED')])
+    # Conteo inicial: el único GROUP BY sobre toda la tabla, después se mantiene incremental
+    op.execute(
+        """
+        UPDATE task_status_counts SET count = (
+            SELECT count(*) FROM tasks WHERE tasks.status = task_status_counts.status
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('task_status_counts')
@@ -0,0 +1,55 @@
+"""Daily task stats rollup and tasks.completed_at
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True))
+    # No hay registro de cuándo se completaron las tareas existentes: la mejor aproximación es updated_at
+    op.execute("UPDATE tasks SET completed_at = updated_at WHERE status = 'COMPLETED'")
+
+    status_type = postgresql.ENUM('PENDING', 'IN_PROGRESS', 'COMPLETED', name='taskstatus', create_type=False)
+    op.create_table(
+        'task_daily_stats',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('status', status_type.with_variant(sa.String(), 'sqlite'), nullable=False),
+        sa.Column('created', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('completed', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('day', 'status')
+    )
+
+    # Carga inicial, igual que stats_service.rebuild_daily_stats (día en UTC)
+    if op.get_bind().dialect.name == 'postgresql':
+        created_day, completed_day = "(created_at AT TIME ZONE 'UTC')::date", "(completed_at AT TIME ZONE 'UTC')::date"
+    else:
+        created_day, completed_day = "date(created_at)", "date(completed_at)"
+    op.execute(
+        f"""
+        INSERT INTO task_daily_stats (day, status, created, completed)
+        SELECT day, status, sum(created), sum(completed) FROM (
+            SELECT {created_day} AS day, status, count(*) AS created, 0 AS completed
+            FROM tasks GROUP BY 1, 2
+            UNION ALL
+            SELECT {completed_day} AS day, status, 0 AS created, count(*) AS completed
+            FROM tasks WHERE status = 'COMPLETED' AND completed_at IS NOT NULL GROUP BY 1, 2
+        ) events
+        GROUP BY day, status
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('task_daily_stats')
+    op.drop_column('tasks', 'completed_at')
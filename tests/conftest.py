@@ -8,7 +8,11 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.db.session import Base, get_db
+from app.core.config import settings
+from app.db.instrumentation import instrument_engine
+from app.db.session import Base, get_db, get_read_db
+from app.core.cache import task_cache
+from app.core.revocation import revocation_cache
 from app.core.security import get_password_hash
 from app.models.user import User
 from app.models.task import Task
@@ -23,11 +27,19 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# En los tests un N+1 hace fallar el request
+instrument_engine(engine)
+settings.SQL_REPEATED_STATEMENT_LIMIT = 10
+settings.SQL_REPEATED_STATEMENT_RAISE = True
+
 
 @pytest.fixture
 def db_session():
     """Fixture que proporciona una sesión de base de datos limpia para cada test"""
     Base.metadata.create_all(bind=engine)
+    # Los caches en memoria no deben arrastrar datos de otro test
+    revocation_cache.invalidate()
+    task_cache.clear()
     session = TestingSessionLocal()
     try:
         yield session
@@ -46,6 +58,7 @@ def client(db_session):
             pass
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -94,3 +107,15 @@ def test_task(db_session, test_user):
     db_session.commit()
     db_session.refresh(task)
     return task
+
+
+@pytest.fixture
+def counters_enabled(monkeypatch):
+    """Fixture que prende los contadores por estado (apagados por defecto)"""
+    monkeypatch.setattr(settings, "TASK_COUNTERS_ENABLED", True)
+
+
+@pytest.fixture
+def stats_enabled(monkeypatch):
+    """Fixture que prende el rollup diario de estadísticas (apagado por defecto)"""
+    monkeypatch.setattr(settings, "TASK_STATS_ENABLED", True)
@@ -0,0 +1,150 @@
+"""
+Tests para el modo async (DB_ASYNC=True) con aiosqlite
+"""
+import json
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.api.v1.api import build_api_router
+from app.core.cache import task_cache
+from app.core.config import settings
+from app.core.revocation import revocation_cache
+from app.core.security import get_password_hash
+from app.db.session import Base, get_async_db, get_async_read_db
+from app.models.user import User
+
+
+@pytest.fixture
+def async_client(tmp_path):
+    """Fixture que levanta la API en modo async sobre un archivo SQLite"""
+    task_cache.clear()
+    revocation_cache.invalidate()
+    db_path = tmp_path / "async.db"
+    sync_engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=sync_engine)
+    with Session(sync_engine) as session:
+        session.add(User(
+            email="async@example.com",
+            hashed_password=get_password_hash("testpass123"),
+            is_active=True
+        ))
+        session.commit()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+    AsyncTestingSession = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncTestingSession() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(build_api_router(use_async=True), prefix=settings.API_V1_STR)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
+    with TestClient(app) as client:
+        response = client.post(
+            "/api/v1/auth/login",
+            data={"username": "async@example.com", "password": "testpass123"}
+        )
+        client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+        yield client
+    sync_engine.dispose()
+
+
+class TestAsyncEndpoints:
+    """Suite de pruebas para los endpoints async"""
+    
+    def test_login_wrong_password(self, async_client):
+        """Test: Login async falla con contraseña incorrecta"""
+        response = async_client.post(
+            "/api/v1/auth/login",
+            data={"username": "async@example.com", "password": "wrongpassword"}
+        )
+        
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_logout_and_deactivate(self, async_client, monkeypatch):
+        """Test: Logout y desactivación en modo async invalidan los tokens"""
+        monkeypatch.setattr(settings, "ADMIN_EMAILS", "async@example.com")
+        assert async_client.post("/api/v1/auth/logout").status_code == status.HTTP_204_NO_CONTENT
+        assert async_client.get("/api/v1/tasks").status_code == status.HTTP_401_UNAUTHORIZED
+        
+        response = async_client.post(
+            "/api/v1/auth/login",
+            data={"username": "async@example.com", "password": "testpass123"}
+        )
+        async_client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+        response = async_client.post("/api/v1/auth/users/1/deactivate")
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert async_client.get("/api/v1/tasks").status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_task_crud(self, async_client):
+        """Test: Crear, leer, actualizar y eliminar en modo async"""
+        response = async_client.post("/api/v1/tasks", json={"title": "Async"})
+        assert response.status_code == status.HTTP_201_CREATED
+        task_id = response.json()["id"]
+        
+        response = async_client.put(f"/api/v1/tasks/{task_id}", json={"status": "completed"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["status"] == "completed"
+        
+        response = async_client.get(f"/api/v1/tasks/{task_id}")
+        assert response.json()["title"] == "Async"
+        
+        response = async_client.delete(f"/api/v1/tasks/{task_id}")
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert async_client.get(f"/api/v1/tasks/{task_id}").status_code == status.HTTP_404_NOT_FOUND
+    
+    def test_bulk_and_cursor(self, async_client):
+        """Test: Carga masiva y paginación por cursor en modo async"""
+        response = async_client.post(
+            "/api/v1/tasks/bulk",
+            json=[{"title": f"Async {i}"} for i in range(12)]
+        )
+        assert len(response.json()["created"]) == 12
+        
+        response = async_client.get("/api/v1/tasks?cursor=&page_size=10&with_total=true")
+        assert len(response.json()) == 10
+        assert response.headers["X-Total-Count"] == "12"
+        next_cursor = response.headers["X-Next-Cursor"]
+        
+        response = async_client.get(f"/api/v1/tasks?cursor={next_cursor}&page_size=10")
+        assert [t["title"] for t in response.json()] == ["Async 10", "Async 11"]
+        
+        response = async_client.request("DELETE", "/api/v1/tasks/bulk", json={"title_contains": "async"})
+        assert response.json() == {"affected": 12}
+        assert async_client.get("/api/v1/tasks?with_total=true").headers["X-Total-Count"] == "0"
+        assert async_client.get("/api/v1/tasks/stats").json()["total"] == 0
+    
+    def test_export_stream(self, async_client):
+        """Test: Export NDJSON en modo async"""
+        async_client.post("/api/v1/tasks/bulk", json=[{"title": f"Async {i}"} for i in range(3)])
+        
+        response = async_client.get("/api/v1/tasks/export?sort=-created_at")
+        
+        assert response.status_code == status.HTTP_200_OK
+        titles = [json.loads(line)["title"] for line in response.text.splitlines()]
+        assert titles == ["Async 2", "Async 1", "Async 0"]
+    
+    def test_import_stream(self, async_client):
+        """Test: Import NDJSON en modo async"""
+        body = b"".join(b'{"title": "Importada %d"}\n' % i for i in range(3))
+        
+        response = async_client.post("/api/v1/tasks/import", content=body)
+        
+        assert response.json() == {"imported": 3, "failed": 0, "errors": []}
+        assert len(async_client.get("/api/v1/tasks").json()) == 3
+    
+    def test_fast_serialization(self, async_client, monkeypatch):
+        """Test: Listado con filas + orjson en modo async"""
+        async_client.post("/api/v1/tasks/bulk", json=[{"title": f"Async {i}"} for i in range(3)])
+        expected = async_client.get("/api/v1/tasks").json()
+        
+        monkeypatch.setattr(settings, "TASKS_FAST_SERIALIZATION", True)
+        
+        assert async_client.get("/api/v1/tasks").json() == expected
@@ -53,6 +53,22 @@ class TestAuthentication:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert response.json()["detail"] == "Usuario inactivo"
     
+    def test_login_password_pool_busy(self, client, test_user, monkeypatch):
+        """Test: Login responde 503 cuando el pool de bcrypt está lleno"""
+        from app.core.password_pool import PasswordPoolBusy, password_pool
+        
+        def busy(*args):
+            raise PasswordPoolBusy()
+        
+        monkeypatch.setattr(password_pool, "submit", busy)
+        response = client.post(
+            "/api/v1/auth/login",
+            data={"username": "test@example.com", "password": "testpass123"}
+        )
+        
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers["Retry-After"] == "1"
+    
     def test_access_protected_endpoint_without_token(self, client):
         """Test: Acceso denegado a endpoint protegido sin token"""
         response = client.get("/api/v1/tasks")
@@ -73,3 +89,111 @@ class TestAuthentication:
         response = client.get("/api/v1/tasks", headers=auth_headers)
         
         assert response.status_code == status.HTTP_200_OK
+
+    
+    def test_logout_revokes_token(self, client, auth_headers):
+        """Test: Después del logout el token ya no sirve"""
+        response = client.post("/api/v1/auth/logout", headers=auth_headers)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        
+        response = client.get("/api/v1/tasks", headers=auth_headers)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_deactivate_user(self, client, db_session, test_user, auth_headers, monkeypatch):
+        """Test: Un admin desactiva a un usuario y sus tokens dejan de valer"""
+        from app.core.config import settings
+        from app.models.revocation import UserEpoch
+        monkeypatch.setattr(settings, "ADMIN_EMAILS", "test@example.com")
+        
+        response = client.post(f"/api/v1/auth/users/{test_user.id}/deactivate", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        db_session.refresh(test_user)
+        assert test_user.is_active is False
+        assert db_session.get(UserEpoch, test_user.id).epoch == 1
+        assert client.get("/api/v1/tasks", headers=auth_headers).status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_deactivate_user_requires_admin(self, client, test_user, auth_headers):
+        """Test: Sin estar en ADMIN_EMAILS no se puede desactivar usuarios"""
+        response = client.post(f"/api/v1/auth/users/{test_user.id}/deactivate", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+    
+    def test_deactivate_user_not_found(self, client, auth_headers, monkeypatch):
+        """Test: Desactivar un usuario que no existe responde 404"""
+        from app.core.config import settings
+        monkeypatch.setattr(settings, "ADMIN_EMAILS", "test@example.com")
+        
+        response = client.post("/api/v1/auth/users/999/deactivate", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+class TestStatelessAuthentication:
+    """Suite de pruebas para el modo stateless (AUTH_STATELESS)"""
+    
+    @pytest.fixture(autouse=True)
+    def stateless_mode(self, monkeypatch):
+        from app.core.config import settings
+        monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+    
+    def test_token_includes_principal_claims(self, test_user, test_user_token):
+        """Test: El token lleva id, estado y epoch del usuario"""
+        from jose import jwt
+        from app.core.config import settings
+        
+        payload = jwt.decode(test_user_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        
+        assert payload["uid"] == test_user.id
+        assert payload["act"] is True
+        assert payload["ep"] == 0
+        assert "jti" in payload
+    
+    def test_request_does_not_query_user(self, client, db_session, test_user, auth_headers):
+        """Test: En modo stateless no se busca al usuario en la BD"""
+        from app.models.user import User
+        
+        # Carga las revocaciones antes de borrar al usuario
+        assert client.get("/api/v1/tasks", headers=auth_headers).status_code == status.HTTP_200_OK
+        db_session.query(User).delete()
+        db_session.commit()
+        
+        response = client.get("/api/v1/tasks", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+    
+    def test_deactivated_user_token_is_rejected(self, client, db_session, test_user, auth_headers):
+        """Test: Desactivar al usuario invalida sus tokens ya emitidos"""
+        from app.services import auth_service
+        
+        assert client.get("/api/v1/tasks", headers=auth_headers).status_code == status.HTTP_200_OK
+        auth_service.deactivate_user(db_session, test_user)
+        
+        response = client.get("/api/v1/tasks", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_revoked_token_is_rejected(self, client, db_session, test_user_token, auth_headers):
+        """Test: Un token revocado por jti deja de valer"""
+        from datetime import datetime, timezone
+        from jose import jwt
+        from app.core.config import settings
+        from app.services import auth_service
+        
+        payload = jwt.decode(test_user_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        auth_service.revoke_token(
+            db_session, payload["jti"], datetime.fromtimestamp(payload["exp"], timezone.utc)
+        )
+        
+        response = client.get("/api/v1/tasks", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_logout_revokes_token(self, client, auth_headers):
+        """Test: El logout también invalida el token en modo stateless"""
+        assert client.get("/api/v1/tasks", headers=auth_headers).status_code == status.HTTP_200_OK
+        
+        response = client.post("/api/v1/auth/logout", headers=auth_headers)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        
+        response = client.get("/api/v1/tasks", headers=auth_headers)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,82 @@
+"""
+Tests para el cache LRU + TTL
+"""
+from app.core.cache import LRUTTLCache
+
+
+class TestLRUTTLCache:
+    """Tests para LRUTTLCache"""
+    
+    def test_get_and_set(self):
+        """Test: Guardar y leer cuenta hits y misses"""
+        cache = LRUTTLCache(max_items=10, ttl_seconds=60)
+        
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        
+        assert cache.get("a") == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+    
+    def test_evicts_least_recently_used(self):
+        """Test: Al pasar el tamaño máximo se descarta el menos usado"""
+        cache = LRUTTLCache(max_items=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+    
+    def test_expired_entries_are_misses(self, monkeypatch):
+        """Test: Las entradas vencidas no se devuelven"""
+        import app.core.cache as cache_module
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+        cache = LRUTTLCache(max_items=10, ttl_seconds=5)
+        cache.set("a", 1)
+        
+        now[0] += 6
+        
+        assert cache.get("a") is None
+        assert cache.stats()["size"] == 0
+    
+    def test_disabled_when_max_items_is_zero(self):
+        """Test: Con max_items=0 el cache no guarda nada"""
+        cache = LRUTTLCache(max_items=0, ttl_seconds=60)
+        cache.set("a", 1)
+        
+        assert cache.get("a") is None
+    
+    def test_set_if_fresh_skips_after_write(self):
+        """Test: Una lectura no guarda su valor si alguien escribió o borró la key mientras tanto"""
+        cache = LRUTTLCache(max_items=10, ttl_seconds=60)
+        
+        token = cache.token()
+        cache.set("a", "nuevo")
+        assert cache.set_if_fresh("a", "viejo", token) is False
+        assert cache.get("a") == "nuevo"
+        
+        token = cache.token()
+        cache.delete("a")
+        assert cache.set_if_fresh("a", "viejo", token) is False
+        assert cache.get("a") is None
+        
+        # Escribir otra key no afecta
+        token = cache.token()
+        cache.set("b", 1)
+        assert cache.set_if_fresh("a", "actual", token) is True
+        assert cache.get("a") == "actual"
+    
+    def test_set_if_fresh_with_forgotten_keys(self):
+        """Test: Si la key ya no se recuerda, se descarta por las dudas"""
+        cache = LRUTTLCache(max_items=1, ttl_seconds=60)
+        
+        token = cache.token()
+        cache.delete("a")
+        cache.delete("b")  # Empuja el registro de "a" fuera
+        
+        assert cache.set_if_fresh("a", "viejo", token) is False
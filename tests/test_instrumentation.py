@@ -0,0 +1,91 @@
+"""
+Tests para la instrumentación de SQL (conteo, sentencias lentas y N+1)
+"""
+import logging
+
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.instrumentation import (
+    QueryStats,
+    RepeatedStatementError,
+    RepeatedStatementWarning,
+    current_query_stats,
+)
+from app.models.task import Task
+from app.schemas.task import TaskUpdate
+from app.services import task_service
+
+
+@pytest.fixture
+def query_stats():
+    """Fixture que simula estar dentro de un request"""
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    yield stats
+    current_query_stats.reset(token)
+
+
+class TestQueryStats:
+    """Suite de pruebas del conteo de sentencias"""
+    
+    def test_counts_statements(self, db_session, test_task, query_stats):
+        """Test: Se cuentan las sentencias y se agrupan por forma"""
+        task_service.update_task(db_session, db_obj=test_task, obj_in=TaskUpdate(title="Contada"))
+        
+        # UPDATE y el SELECT del refresh
+        assert query_stats.count == 2
+        assert query_stats.seconds > 0
+        assert any(shape.startswith("UPDATE tasks") for shape in query_stats.shapes)
+    
+    def test_outside_request_not_counted(self, db_session, test_task):
+        """Test: Fuera de un request (scripts, tests de servicio) no se cuenta nada"""
+        db_session.execute(select(Task)).all()
+        
+        assert current_query_stats.get() is None
+    
+    def test_request_log(self, client, auth_headers, test_task, caplog):
+        """Test: Cada request loguea cuántas sentencias hizo, con su ruta"""
+        with caplog.at_level(logging.DEBUG, logger="app.db.instrumentation"):
+            client.get("/api/v1/tasks", headers=auth_headers)
+        
+        assert any(
+            "GET /api/v1/tasks/: " in record.getMessage() and "sentencias" in record.getMessage()
+            for record in caplog.records
+        )
+
+
+class TestSlowAndRepeated:
+    """Tests de sentencias lentas y N+1"""
+    
+    def test_slow_query_logged_with_params(self, db_session, test_task, query_stats, monkeypatch, caplog):
+        """Test: Las sentencias sobre el umbral se loguean con sus parámetros"""
+        monkeypatch.setattr(settings, "SQL_SLOW_QUERY_MS", 1e-6)
+        
+        with caplog.at_level(logging.WARNING, logger="app.db.instrumentation"):
+            db_session.execute(select(Task).where(Task.title == "buscada")).all()
+        
+        assert "Sentencia lenta" in caplog.text
+        assert "buscada" in caplog.text
+    
+    def test_repeated_statement_raises(self, db_session, test_task, query_stats, monkeypatch):
+        """Test: Repetir la misma sentencia más veces que el límite falla"""
+        monkeypatch.setattr(settings, "SQL_REPEATED_STATEMENT_LIMIT", 3)
+        monkeypatch.setattr(settings, "SQL_REPEATED_STATEMENT_RAISE", True)
+        
+        for task_id in range(3):
+            db_session.execute(select(Task).where(Task.id == task_id)).all()
+        with pytest.raises(RepeatedStatementError):
+            db_session.execute(select(Task).where(Task.id == 99)).all()
+    
+    def test_repeated_statement_warns(self, db_session, test_task, query_stats, monkeypatch):
+        """Test: En modo aviso se emite un warning una sola vez"""
+        monkeypatch.setattr(settings, "SQL_REPEATED_STATEMENT_LIMIT", 1)
+        monkeypatch.setattr(settings, "SQL_REPEATED_STATEMENT_RAISE", False)
+        
+        with pytest.warns(RepeatedStatementWarning) as record:
+            for task_id in range(4):
+                db_session.execute(select(Task).where(Task.id == task_id)).all()
+        
+        assert len(record) == 1
@@ -0,0 +1,72 @@
+"""
+Tests para las métricas Prometheus
+"""
+from fastapi import status
+
+from app.core.cache import task_cache
+from app.core.metrics import Counter, Histogram, Registry
+
+
+class TestMetricsRegistry:
+    """Suite de pruebas del registro de métricas"""
+    
+    def test_histogram_render(self):
+        """Test: Los buckets salen acumulados con +Inf, suma y conteo"""
+        registry = Registry()
+        histogram = registry.register(Histogram("latencia", "Latencia", ("ruta",), buckets=(0.1, 1)))
+        histogram.observe(0.05, ("/a",))
+        histogram.observe(0.5, ("/a",))
+        histogram.observe(3, ("/a",))
+        
+        lines = registry.render().splitlines()
+        
+        assert lines[:2] == ["# HELP latencia Latencia", "# TYPE latencia histogram"]
+        assert 'latencia_bucket{ruta="/a",le="0.1"} 1' in lines
+        assert 'latencia_bucket{ruta="/a",le="1"} 2' in lines
+        assert 'latencia_bucket{ruta="/a",le="+Inf"} 3' in lines
+        assert 'latencia_sum{ruta="/a"} 3.55' in lines
+        assert 'latencia_count{ruta="/a"} 3' in lines
+    
+    def test_label_escaping(self):
+        """Test: Comillas y saltos de línea en los labels se escapan"""
+        registry = Registry()
+        counter = registry.register(Counter("c", "Contador", ("x",)))
+        counter.inc(('a"b\nc',))
+        
+        assert 'c{x="a\\"b\\nc"} 1' in registry.render()
+
+
+class TestMetricsEndpoint:
+    """Tests del middleware y de /metrics"""
+    
+    def test_metrics_by_route_template(self, client, auth_headers, test_task):
+        """Test: Los requests se cuentan por template de ruta, no por path"""
+        client.get(f"/api/v1/tasks/{test_task.id}", headers=auth_headers)
+        client.get("/api/v1/tasks/99999", headers=auth_headers)
+        
+        response = client.get("/metrics")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        body = response.text
+        assert 'http_requests_total{method="GET",route="/api/v1/tasks/{task_id}",status="200"}' in body
+        assert 'http_requests_total{method="GET",route="/api/v1/tasks/{task_id}",status="404"}' in body
+        assert f"/api/v1/tasks/{test_task.id}\"" not in body
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/api/v1/tasks/{task_id}",status="200",le="+Inf"}' in body
+        assert "http_response_size_bytes_count" in body
+        assert 'http_requests_in_progress{method="GET"} 1' in body  # El propio GET /metrics
+    
+    def test_task_cache_metrics(self, client, auth_headers, test_task):
+        """Test: Los contadores del cache de tareas salen en /metrics y en /health"""
+        client.get(f"/api/v1/tasks/{test_task.id}", headers=auth_headers)
+        client.get(f"/api/v1/tasks/{test_task.id}", headers=auth_headers)
+        stats = task_cache.stats()
+        
+        body = client.get("/metrics").text
+        
+        assert "# TYPE task_cache_hits_total counter" in body
+        assert f"task_cache_hits_total {stats['hits']}" in body
+        assert f"task_cache_misses_total {stats['misses']}" in body
+        assert f"task_cache_evictions_total {stats['evictions']}" in body
+        assert "# TYPE task_cache_size gauge" in body
+        assert client.get("/health").json()["task_cache"]["hits"] == stats["hits"]
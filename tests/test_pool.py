@@ -0,0 +1,70 @@
+"""
+Tests para el pool de conexiones instrumentado
+"""
+import pytest
+from fastapi import status
+from sqlalchemy import create_engine, exc, text
+
+from app.db.pool import InstrumentedQueuePool, pool_status
+
+
+@pytest.fixture
+def small_engine(tmp_path):
+    """Fixture con un pool de una sola conexión y timeout corto"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+class TestInstrumentedPool:
+    """Suite de pruebas del pool instrumentado"""
+    
+    def test_checkout_stats(self, small_engine):
+        """Test: Cada checkout queda en el contador y en el histograma"""
+        for _ in range(3):
+            with small_engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        
+        status_ = pool_status(small_engine)
+        
+        assert status_["checkout"]["checkouts"] == 3
+        assert sum(status_["checkout"]["histogram"].values()) == 3
+        assert status_["checked_out"] == 0
+        assert status_["size"] == 1
+    
+    def test_timeout_is_counted(self, small_engine):
+        """Test: Sin conexiones libres el checkout falla y se cuenta el timeout"""
+        with small_engine.connect():
+            assert pool_status(small_engine)["checked_out"] == 1
+            with pytest.raises(exc.TimeoutError):
+                small_engine.connect()
+        
+        assert pool_status(small_engine)["checkout"]["timeouts"] == 1
+    
+    def test_stats_survive_dispose(self, small_engine):
+        """Test: engine.dispose() no borra las estadísticas"""
+        with small_engine.connect():
+            pass
+        small_engine.dispose()
+        
+        assert pool_status(small_engine)["checkout"]["checkouts"] == 1
+
+
+class TestHealthDb:
+    """Tests del endpoint de diagnóstico del pool"""
+    
+    def test_health_db(self, client):
+        """Test: /health/db muestra ambos pools sin abrir conexiones"""
+        response = client.get("/health/db")
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["sync"]["class"] == "InstrumentedQueuePool"
+        assert data["async"]["class"] == "InstrumentedAsyncQueuePool"
+        assert "histogram" in data["sync"]["checkout"]
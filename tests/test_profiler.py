@@ -0,0 +1,129 @@
+"""
+Tests para el profiler de /debug/profile
+"""
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.api import build_api_router
+from app.core import profiler
+from app.core.config import settings
+from app.db.session import get_db, get_read_db
+
+
+def _busy_loop(stop):
+    # Hilo que simula un request que no suelta la CPU
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.fixture
+def debug_client(db_session, monkeypatch):
+    """Fixture con el profiler habilitado y test@example.com como admin"""
+    monkeypatch.setattr(settings, "DEBUG_PROFILING_ENABLED", True)
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", "Test@example.com, otro@example.com")
+    
+    def override_get_db():
+        yield db_session
+    
+    app = FastAPI()
+    app.include_router(build_api_router(), prefix=settings.API_V1_STR)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    with TestClient(app) as client:
+        yield client
+
+
+class TestProfileEndpoint:
+    """Suite de pruebas de GET /debug/profile"""
+    
+    def test_disabled_by_default(self, client, auth_headers):
+        """Test: Sin DEBUG_PROFILING_ENABLED la ruta no existe"""
+        response = client.get("/api/v1/debug/profile", headers=auth_headers)
+        
+        assert response.status_code == 404
+    
+    def test_requires_admin(self, debug_client, test_user, auth_headers, monkeypatch):
+        """Test: Un usuario que no está en ADMIN_EMAILS recibe 403"""
+        monkeypatch.setattr(settings, "ADMIN_EMAILS", "otro@example.com")
+        
+        response = debug_client.get("/api/v1/debug/profile?seconds=0.05", headers=auth_headers)
+        
+        assert response.status_code == 403
+    
+    def test_requires_auth(self, debug_client):
+        """Test: Sin token, 401"""
+        response = debug_client.get("/api/v1/debug/profile?seconds=0.05")
+        
+        assert response.status_code == 401
+    
+    def test_cpu_profile(self, debug_client, auth_headers):
+        """Test: Las pilas del hilo ocupado aparecen en formato collapsed"""
+        stop = threading.Event()
+        worker = threading.Thread(target=_busy_loop, args=(stop,))
+        worker.start()
+        try:
+            response = debug_client.get(
+                "/api/v1/debug/profile?seconds=0.3&interval_ms=5", headers=auth_headers
+            )
+        finally:
+            stop.set()
+            worker.join()
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        lines = response.text.splitlines()
+        busy = [line for line in lines if "test_profiler._busy_loop" in line]
+        assert busy
+        stack, count = busy[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert stack.startswith("threading.Thread._bootstrap")
+    
+    def test_alloc_profile(self, debug_client, auth_headers):
+        """Test: El modo alloc pesa cada pila en bytes"""
+        response = debug_client.get("/api/v1/debug/profile?seconds=0.1&mode=alloc", headers=auth_headers)
+        
+        assert response.status_code == 200
+        for line in response.text.splitlines():
+            stack, size = line.rsplit(" ", 1)
+            assert int(size) > 0
+    
+    def test_seconds_capped(self, debug_client, auth_headers):
+        """Test: No se puede pedir más de DEBUG_PROFILE_MAX_SECONDS"""
+        response = debug_client.get("/api/v1/debug/profile?seconds=3600", headers=auth_headers)
+        
+        assert response.status_code == 422
+    
+    def test_one_profile_at_a_time(self, debug_client, auth_headers):
+        """Test: Un segundo profile simultáneo responde 409"""
+        with profiler._profile_lock:
+            response = debug_client.get("/api/v1/debug/profile?seconds=0.05", headers=auth_headers)
+        
+        assert response.status_code == 409
+
+
+class TestSampler:
+    """Tests del muestreo sin pasar por HTTP"""
+    
+    def test_idle_threads_skipped(self):
+        """Test: Los hilos esperando en un lock no aparecen salvo con include_idle"""
+        stop = threading.Event()
+        waiter = threading.Thread(target=stop.wait)
+        waiter.start()
+        try:
+            busy = profiler.sample_stacks(0.05, interval=0.01)
+            idle = profiler.sample_stacks(0.05, interval=0.01, include_idle=True)
+        finally:
+            stop.set()
+            waiter.join()
+        
+        assert not any(stack.endswith("threading.Condition.wait") for stack in busy)
+        assert any(stack.endswith("threading.Condition.wait") for stack in idle)
+    
+    def test_format_collapsed(self):
+        """Test: Una pila por línea, las más pesadas primero"""
+        stacks = profiler.Counter({"a;b": 1, "a;c": 5})
+        
+        assert profiler.format_collapsed(stacks) == "a;c 5\na;b 1\n"
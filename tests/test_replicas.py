@@ -0,0 +1,199 @@
+"""
+Tests para el ruteo de lecturas a réplicas (archivos SQLite como primario y réplicas)
+"""
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.api import build_api_router
+from app.core.cache import task_cache
+from app.core.config import settings
+from app.core.revocation import revocation_cache
+from app.core.security import get_password_hash
+from app.db import session as db_session_module
+from app.db.replicas import STICKY_COOKIE, ReadRouter, StickyPrimaryMiddleware
+from app.db.session import Base
+from app.models.task import Task
+from app.models.user import User
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestReadRouter:
+    """Suite de pruebas de la elección de réplica"""
+    
+    def test_round_robin(self):
+        """Test: Sin escrituras las lecturas se reparten entre réplicas"""
+        router = ReadRouter(replica_count=2, sticky_seconds=5)
+        
+        assert [router.choose("cliente") for _ in range(4)] == [0, 1, 0, 1]
+    
+    def test_sticky_after_write(self):
+        """Test: Con la marca de escritura el cliente lee del primario hasta que vence la ventana"""
+        clock = FakeClock()
+        clock.now = 1000.0
+        router = ReadRouter(replica_count=2, sticky_seconds=5, clock=clock)
+        
+        marker = router.write_marker()
+        assert router.choose(marker) is None
+        assert router.choose() == 0  # Otros clientes siguen en réplicas
+        
+        clock.now = 1005.1
+        assert router.choose(marker) is not None
+    
+    def test_invalid_marker(self):
+        """Test: Una marca ilegible o a futuro no manda al primario"""
+        clock = FakeClock()
+        clock.now = 1000.0
+        router = ReadRouter(replica_count=2, sticky_seconds=5, clock=clock)
+        
+        assert router.choose("abc") is not None
+        assert router.choose("99999999999") is not None
+    
+    def test_without_replicas(self):
+        """Test: Sin réplicas todo va al primario y no hace falta marca"""
+        router = ReadRouter(replica_count=0, sticky_seconds=5)
+        
+        assert router.write_marker() is None
+        assert router.choose() is None
+
+
+@pytest.fixture
+def replicated(tmp_path, monkeypatch):
+    """Fixture con un primario y dos réplicas en archivos SQLite separados
+    
+    Las réplicas no reciben las escrituras, como una réplica con lag infinito
+    """
+    factories = []
+    for name in ("primary", "replica0", "replica1"):
+        engine = create_engine(f"sqlite:///{tmp_path / name}.db", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        with factory() as db:
+            db.add(User(email="test@example.com", hashed_password=get_password_hash("testpass123"), is_active=True))
+            db.commit()
+        factories.append(factory)
+
+    clock = FakeClock()
+    router = ReadRouter(replica_count=2, sticky_seconds=5, clock=clock)
+    monkeypatch.setattr(db_session_module, "SessionLocal", factories[0])
+    monkeypatch.setattr(db_session_module, "ReadSessionLocals", factories[1:])
+    monkeypatch.setattr(db_session_module, "read_router", router)
+    task_cache.clear()
+    revocation_cache.invalidate()
+
+    app = FastAPI()
+    app.add_middleware(StickyPrimaryMiddleware, router=router)
+    app.include_router(build_api_router(use_async=False), prefix=settings.API_V1_STR)
+    # Dos clientes con cookies separadas, como dos navegadores
+    with TestClient(app) as client, TestClient(app) as other:
+        yield client, other, clock
+
+
+def _login(client):
+    response = client.post("/api/v1/auth/login", data={"username": "test@example.com", "password": "testpass123"})
+    client.cookies.clear()  # El login también es un POST exitoso: no se quiere la ventana de primario
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+class TestReadReplicas:
+    """Tests de read-your-writes sobre primario y réplicas"""
+    
+    def test_read_your_writes(self, replicated):
+        """Test: Quien escribe ve su cambio; los demás leen de las réplicas"""
+        client, other, clock = replicated
+        writer = _login(client)
+        reader = _login(other)
+        
+        response = client.post("/api/v1/tasks", json={"title": "Nueva"}, headers=writer)
+        assert response.status_code == status.HTTP_201_CREATED
+        assert STICKY_COOKIE in client.cookies
+        
+        # El que escribió lee del primario
+        assert [t["title"] for t in client.get("/api/v1/tasks", headers=writer).json()] == ["Nueva"]
+        # Otro cliente lee de las réplicas, que no la tienen
+        assert other.get("/api/v1/tasks", headers=reader).json() == []
+        assert other.get("/api/v1/tasks", headers=reader).json() == []
+        
+        # Pasada la ventana el que escribió también vuelve a las réplicas
+        clock.now = 6
+        assert client.get("/api/v1/tasks", headers=writer).json() == []
+    
+    def test_failed_write_is_not_sticky(self, replicated):
+        """Test: Una escritura rechazada (o redirigida) no manda al cliente al primario"""
+        client, _, _ = replicated
+        headers = _login(client)
+        
+        # Sin barra final: 307 y después 422
+        response = client.post("/api/v1/tasks", json={"title": ""}, headers=headers)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        
+        assert STICKY_COOKIE not in client.cookies
+    
+    def test_replica_read_does_not_fill_cache(self, replicated):
+        """Test: Una réplica atrasada no deja la versión vieja en el cache"""
+        client, other, _ = replicated
+        writer = _login(client)
+        reader = _login(other)
+        # La tarea existe en el primario y en las réplicas
+        for factory in (db_session_module.SessionLocal, *db_session_module.ReadSessionLocals):
+            with factory() as db:
+                db.add(Task(id=1, title="Vieja"))
+                db.commit()
+        
+        response = client.put("/api/v1/tasks/1", json={"title": "Nueva"}, headers=writer)
+        assert response.status_code == status.HTTP_200_OK
+        task_cache.clear()  # Como si la entrada hubiera vencido
+        
+        # El otro cliente lee de una réplica que no tiene el cambio
+        assert other.get("/api/v1/tasks/1", headers=reader).json()["title"] == "Vieja"
+        # Quien escribió sigue viendo su cambio
+        assert client.get("/api/v1/tasks/1", headers=writer).json()["title"] == "Nueva"
+
+    
+    def test_revocations_come_from_primary(self, replicated):
+        """Test: Un token revocado se rechaza aunque la lectura vaya a una réplica atrasada"""
+        client, other, _ = replicated
+        headers = _login(client)
+        assert client.post("/api/v1/auth/logout", headers=headers).status_code == status.HTTP_204_NO_CONTENT
+        
+        # other no tiene la cookie de escritura: lee de las réplicas, que no tienen la revocación
+        assert other.get("/api/v1/tasks", headers=headers).status_code == status.HTTP_401_UNAUTHORIZED
+
+class TestPrimaryPool:
+    """Tests del uso de conexiones del primario"""
+    
+    def test_write_with_single_connection(self, tmp_path, monkeypatch):
+        """Test: Un endpoint de escritura busca al usuario en su propia sesión (alcanza un pool de 1)"""
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'primary'}.db",
+            connect_args={"check_same_thread": False},
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=1,
+        )
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        with factory() as db:
+            db.add(User(email="test@example.com", hashed_password=get_password_hash("testpass123"), is_active=True))
+            db.commit()
+        monkeypatch.setattr(db_session_module, "SessionLocal", factory)
+        monkeypatch.setattr(db_session_module, "ReadSessionLocals", [])
+        monkeypatch.setattr(db_session_module, "read_router", ReadRouter(replica_count=0, sticky_seconds=5))
+        revocation_cache.invalidate()
+        
+        app = FastAPI()
+        app.include_router(build_api_router(use_async=False), prefix=settings.API_V1_STR)
+        with TestClient(app) as client:
+            headers = _login(client)
+            response = client.post("/api/v1/tasks/", json={"title": "Nueva"}, headers=headers)
+            assert response.status_code == status.HTTP_201_CREATED
+            assert client.delete(f"/api/v1/tasks/{response.json()['id']}", headers=headers).status_code == status.HTTP_204_NO_CONTENT
@@ -5,9 +5,12 @@ import pytest
 from datetime import datetime, timedelta
 from jose import jwt
 
+from app.core import security
 from app.core.security import (
+    calibrate_bcrypt_rounds,
     create_access_token,
     get_password_hash,
+    needs_rehash,
     verify_password
 )
 from app.core.config import settings
@@ -45,6 +48,31 @@ class TestPasswordHashing:
         assert hash1 != hash2
 
 
+class TestBcryptRounds:
+    """Tests para el costo configurable de bcrypt"""
+    
+    def test_hash_uses_requested_rounds(self):
+        """Test: El costo queda en el hash y verify lo respeta"""
+        hashed = get_password_hash("password", rounds=5)
+        
+        assert hashed.split("$")[2] == "05"
+        assert verify_password("password", hashed) is True
+    
+    def test_needs_rehash_with_lower_cost(self, monkeypatch):
+        """Test: Solo un hash con menor costo que el actual pide rehash"""
+        monkeypatch.setattr(security, "_bcrypt_rounds", 5)
+        
+        assert needs_rehash(get_password_hash("password", rounds=4)) is True
+        # Un costo mayor (p.ej. de otro worker que calibró más alto) se deja como está
+        assert needs_rehash(get_password_hash("password", rounds=6)) is False
+        assert needs_rehash(get_password_hash("password")) is False
+    
+    def test_calibrate_within_bounds(self):
+        """Test: La calibración nunca baja del mínimo ni pasa del máximo"""
+        assert calibrate_bcrypt_rounds(0.001) == security.BCRYPT_MIN_ROUNDS
+        assert calibrate_bcrypt_rounds(10 ** 9) == security.BCRYPT_MAX_ROUNDS
+
+
 class TestJWTTokens:
     """Tests para tokens JWT"""
     
@@ -118,3 +146,42 @@ class TestJWTTokens:
                 settings.SECRET_KEY,
                 algorithms=[settings.ALGORITHM]
             )
+
+
+class TestPasswordPool:
+    """Tests para el pool de procesos de bcrypt"""
+    
+    def test_pool_hash_and_verify(self):
+        """Test: El pool hashea y verifica igual que security"""
+        from app.core.password_pool import get_password_hash as pool_hash
+        from app.core.password_pool import verify_password as pool_verify
+        
+        hashed = pool_hash("test_password_123")
+        
+        assert verify_password("test_password_123", hashed) is True
+        assert pool_verify("test_password_123", hashed) is True
+        assert pool_verify("wrong_password", hashed) is False
+    
+    def test_pool_rejects_when_queue_is_full(self):
+        """Test: Con la cola llena falla al instante en vez de esperar"""
+        import threading
+        from app.core.password_pool import PasswordHasherPool, PasswordPoolBusy
+        
+        pool = PasswordHasherPool(workers=0, max_pending=0)
+        release = threading.Event()
+        worker = threading.Thread(target=lambda: pool.submit(release.wait, 5))
+        worker.start()
+        try:
+            # Espera a que el hilo ocupe el único cupo
+            for _ in range(100):
+                if pool._slots._value == 0:
+                    break
+                threading.Event().wait(0.01)
+            with pytest.raises(PasswordPoolBusy):
+                pool.submit(verify_password, "x", "y")
+        finally:
+            release.set()
+            worker.join()
+        
+        # Al terminar se libera el cupo
+        assert pool.submit(str.upper, "ok").result() == "OK"
@@ -2,9 +2,11 @@
 Tests para servicios (capa de negocio)
 """
 import pytest
-from app.services import task_service, auth_service
+import asyncio
+
+from app.services import import_service, stats_service, task_service, auth_service
 from app.models.task import Task, TaskStatus
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.schemas.task import TaskBulkFilter, TaskCreate, TaskExportFormat, TaskFilter, TaskSort, TaskUpdate
 from app.core.security import get_password_hash
 
 
@@ -27,6 +29,16 @@ class TestTaskService:
         assert task.status == TaskStatus.PENDING
         assert task.created_at is not None
     
+    def test_create_tasks_bulk_chunks(self, db_session):
+        """Test: Crear tareas masivamente en varios bloques"""
+        objs_in = [TaskCreate(title=f"Masiva {i}") for i in range(7)]
+        
+        created = task_service.create_tasks(db_session, objs_in=objs_in, chunk_size=3)
+        
+        assert [row.title for row in created] == [f"Masiva {i}" for i in range(7)]
+        assert all(row.id is not None for row in created)
+        assert db_session.query(Task).count() == 7
+    
     def test_get_task(self, db_session, test_task):
         """Test: Obtener tarea por ID"""
         task = task_service.get_task(db_session, task_id=test_task.id)
@@ -35,6 +47,61 @@ class TestTaskService:
         assert task.id == test_task.id
         assert task.title == test_task.title
     
+    def test_get_task_reads_through_cache(self, db_session, test_task):
+        """Test: La segunda lectura sale del cache y ve las escrituras"""
+        from app.core.cache import task_cache
+        
+        task_service.get_task(db_session, task_id=test_task.id)
+        hits = task_cache.stats()["hits"]
+        db_session.expunge_all()
+        
+        cached = task_service.get_task(db_session, task_id=test_task.id)
+        assert task_cache.stats()["hits"] == hits + 1
+        assert cached.title == test_task.title
+        
+        # La tarea del cache se puede actualizar y el cache queda al día
+        task_service.update_task(db_session, db_obj=cached, obj_in=TaskUpdate(title="Nuevo"))
+        db_session.expunge_all()
+        assert task_service.get_task(db_session, task_id=test_task.id).title == "Nuevo"
+        
+        task_service.delete_task(db_session, task_id=test_task.id)
+        assert task_service.get_task(db_session, task_id=test_task.id) is None
+    
+    def test_get_task_does_not_cache_row_deleted_meanwhile(self, db_session, test_task):
+        """Test: Si la tarea se borra entre el SELECT y el set, el cache no la revive"""
+        from sqlalchemy import event
+        from app.core.cache import task_cache
+        engine = db_session.get_bind()
+        
+        def delete_concurrently(conn, cursor, statement, parameters, context, executemany):
+            # Como otro request que borra la tarea justo después de que esta leyó la fila
+            task_cache.delete(test_task.id)
+        
+        event.listen(engine, "after_cursor_execute", delete_concurrently)
+        try:
+            task_service.get_task(db_session, task_id=test_task.id)
+        finally:
+            event.remove(engine, "after_cursor_execute", delete_concurrently)
+        
+        assert task_cache.get(test_task.id) is None
+    
+    def test_update_task_stale_version(self, db_session, test_task):
+        """Test: Actualizar una copia con version vieja falla sin pisar el cambio"""
+        from sqlalchemy.orm.exc import StaleDataError
+        
+        stale = task_service.get_task(db_session, task_id=test_task.id)
+        assert stale.version == 1
+        db_session.expunge_all()  # Copia leída antes del cambio de otro request
+        db_session.execute(
+            Task.__table__.update().values(title="Ajeno", version=2).where(Task.id == test_task.id)
+        )
+        db_session.commit()
+        
+        with pytest.raises(StaleDataError):
+            task_service.update_task(db_session, db_obj=stale, obj_in=TaskUpdate(title="Mío"))
+        db_session.expunge_all()
+        assert task_service.get_task(db_session, task_id=test_task.id).title == "Ajeno"
+    
     def test_get_task_not_found(self, db_session):
         """Test: Obtener tarea inexistente retorna None"""
         task = task_service.get_task(db_session, task_id=99999)
@@ -60,6 +127,63 @@ class TestTaskService:
         tasks = task_service.get_tasks(db_session, skip=3, limit=3)
         assert len(tasks) == 2
     
+    def test_get_tasks_keyset(self, db_session):
+        """Test: Paginación keyset continúa después del cursor"""
+        for i in range(5):
+            db_session.add(Task(title=f"Tarea {i}", status=TaskStatus.PENDING))
+        db_session.commit()
+        
+        first = task_service.get_tasks(db_session, limit=3)
+        cursor = task_service.encode_cursor(first[-1])
+        rest = task_service.get_tasks(
+            db_session, limit=3, after=task_service.decode_cursor(cursor)
+        )
+        
+        assert [t.title for t in first + rest] == [f"Tarea {i}" for i in range(5)]
+    
+    def test_get_tasks_filtered_and_sorted_keyset(self, db_session):
+        """Test: Keyset con filtro por estado y orden descendente por título"""
+        for i in range(6):
+            status = TaskStatus.COMPLETED if i % 2 else TaskStatus.PENDING
+            db_session.add(Task(title=f"Tarea {i}", status=status))
+        db_session.commit()
+        filters = TaskFilter(status="completed")
+        sort = TaskSort.TITLE_DESC
+        
+        first = task_service.get_tasks(db_session, limit=2, filters=filters, sort=sort)
+        cursor = task_service.encode_cursor(first[-1], sort)
+        rest = task_service.get_tasks(
+            db_session, limit=2, after=task_service.decode_cursor(cursor, sort),
+            filters=filters, sort=sort
+        )
+        
+        assert [t.title for t in first + rest] == ["Tarea 5", "Tarea 3", "Tarea 1"]
+        # Un cursor de otro orden no se acepta
+        with pytest.raises(ValueError):
+            task_service.decode_cursor(cursor, TaskSort.CREATED_AT)
+    
+    def test_export_tasks_in_chunks(self, db_session):
+        """Test: El export se genera en un bloque por cada chunk de filas"""
+        for i in range(5):
+            db_session.add(Task(title=f"Tarea {i}"))
+        db_session.commit()
+        
+        chunks = list(task_service.export_tasks(db_session, TaskExportFormat.NDJSON, chunk_size=2))
+        
+        assert [chunk.count("\n") for chunk in chunks] == [2, 2, 1]
+    
+    def test_search_tasks_follows_updates(self, db_session, test_task):
+        """Test: El índice de búsqueda sigue a inserts, updates y deletes"""
+        assert task_service.search_tasks(db_session, q="prueba") == [test_task]
+        
+        task_service.update_task(db_session, db_obj=test_task, obj_in=TaskUpdate(title="Otra cosa", description=""))
+        assert task_service.search_tasks(db_session, q="prueba") == []
+        assert task_service.search_tasks(db_session, q='cosa "raro:') == []
+        assert [t.id for t in task_service.search_tasks(db_session, q="otra")] == [test_task.id]
+        
+        task_service.delete_task(db_session, task_id=test_task.id)
+        assert task_service.search_tasks(db_session, q="otra") == []
+    
     def test_update_task(self, db_session, test_task):
         """Test: Actualizar tarea"""
         update_data = TaskUpdate(
@@ -90,6 +214,38 @@ class TestTaskService:
         assert updated_task.title == original_title
         assert updated_task.status == TaskStatus.COMPLETED
     
+    def test_update_tasks_bulk_in_chunks(self, db_session):
+        """Test: Actualización masiva recorre todos los bloques"""
+        for i in range(7):
+            db_session.add(Task(title=f"Tarea {i}", status=TaskStatus.PENDING))
+        db_session.commit()
+        
+        affected = task_service.update_tasks(
+            db_session,
+            criteria=TaskBulkFilter(status="pending"),
+            obj_in=TaskUpdate(status="in_progress"),
+            chunk_size=3
+        )
+        
+        assert affected == 7
+        assert db_session.query(Task).filter(Task.status == TaskStatus.IN_PROGRESS).count() == 7
+        # El UPDATE masivo también sube version (invalida los ETags)
+        assert {task.version for task in db_session.query(Task)} == {2}
+    
+    def test_delete_tasks_bulk_in_chunks(self, db_session):
+        """Test: Eliminación masiva solo borra lo que cumple el filtro"""
+        for i in range(5):
+            db_session.add(Task(title=f"Tarea {i}", status=TaskStatus.COMPLETED))
+        db_session.add(Task(title="Pendiente", status=TaskStatus.PENDING))
+        db_session.commit()
+        
+        affected = task_service.delete_tasks(
+            db_session, criteria=TaskBulkFilter(status="completed"), chunk_size=2
+        )
+        
+        assert affected == 5
+        assert db_session.query(Task).count() == 1
+    
     def test_delete_task(self, db_session, test_task):
         """Test: Eliminar tarea"""
         task_id = test_task.id
@@ -100,6 +256,212 @@ class TestTaskService:
         task = task_service.get_task(db_session, task_id=task_id)
         assert task is None
 
+    
+    def _counters(self, db_session):
+        from app.models.task_count import TaskStatusCount
+        return {row.status.value: row.count for row in db_session.query(TaskStatusCount)}
+    
+    def test_status_counters_follow_writes(self, db_session, counters_enabled):
+        """Test: Los contadores por estado acompañan cada escritura del servicio"""
+        created = [
+            task_service.create_task(db_session, obj_in=TaskCreate(title=f"Tarea {i}", status=status))
+            for i, status in enumerate(["pending", "pending", "pending", "completed"])
+        ]
+        task_service.create_tasks(db_session, [TaskCreate(title="Bulk", status="in_progress")] * 3)
+        task_service.update_task(db_session, db_obj=created[0], obj_in=TaskUpdate(status="in_progress"))
+        task_service.update_task(db_session, db_obj=created[1], obj_in=TaskUpdate(title="Solo título"))
+        task_service.delete_task(db_session, task_id=created[3].id)
+        task_service.update_tasks(
+            db_session,
+            criteria=TaskBulkFilter(status="in_progress"),
+            obj_in=TaskUpdate(status="completed"),
+            chunk_size=2
+        )
+        task_service.delete_tasks(db_session, criteria=TaskBulkFilter(title_contains="bulk"), chunk_size=2)
+        
+        assert self._counters(db_session) == {"pending": 2, "in_progress": 0, "completed": 1}
+        for status, count in self._counters(db_session).items():
+            assert db_session.query(Task).filter(Task.status == TaskStatus(status)).count() == count
+    
+    def test_update_task_lock_order(self, db_session, counters_enabled, stats_enabled):
+        """Test: update toca tasks, luego contadores en orden de estado y al final el rollup"""
+        from sqlalchemy import event
+        statements = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            words = statement.split()
+            if words[0] == "UPDATE":
+                statements.append((words[1], parameters))
+            elif words[0] == "INSERT":
+                statements.append((words[2], parameters))
+        
+        task = task_service.create_task(db_session, obj_in=TaskCreate(title="Tarea", status="pending"))
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            task_service.update_task(db_session, db_obj=task, obj_in=TaskUpdate(status="completed"))
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        
+        assert [table for table, _ in statements] == [
+            "tasks", "task_status_counts", "task_status_counts", "task_daily_stats"
+        ]
+        # Mismo orden sin importar la dirección del cambio (completed < pending)
+        assert [params[-1] for table, params in statements if table == "task_status_counts"] == [
+            "COMPLETED", "PENDING"
+        ]
+    
+    def test_count_tasks_strategies(self, db_session, counters_enabled):
+        """Test: Contadores sin filtro o por estado, COUNT exacto con otros filtros"""
+        from datetime import datetime, timedelta, timezone
+        task_service.create_tasks(
+            db_session, [TaskCreate(title=f"Informe {i}", status="completed") for i in range(5)]
+        )
+        task_service.create_task(db_session, obj_in=TaskCreate(title="Pendiente"))
+        
+        assert task_service.count_tasks(db_session) == (6, "counters")
+        assert task_service.count_tasks(db_session, TaskFilter(status="completed")) == (5, "counters")
+        
+        yesterday = datetime.now(timezone.utc) - timedelta(days=1)
+        assert task_service.count_tasks(db_session, TaskFilter(created_after=yesterday)) == (6, "exact")
+        assert task_service.count_tasks(db_session, q="informe") == (5, "exact")
+        # Por encima del límite SQLite no tiene estimado del planner: cuenta completo
+        assert task_service.count_tasks(db_session, q="informe", exact_limit=2) == (5, "exact")
+    
+    def test_count_tasks_without_counters(self, db_session, test_task, monkeypatch):
+        """Test: Sin contadores el total sale de un COUNT exacto"""
+        from app.core.config import settings
+        monkeypatch.setattr(settings, "TASK_COUNTERS_ENABLED", False)
+        
+        assert task_service.count_tasks(db_session) == (1, "exact")
+
+    
+    def _rollup(self, db_session):
+        from app.models.task_stats import TaskDailyStats
+        return {
+            (row.day, row.status): (row.created, row.completed)
+            for row in db_session.query(TaskDailyStats)
+            if row.created or row.completed
+        }
+    
+    def test_daily_stats_follow_writes(self, db_session, stats_enabled):
+        """Test: El rollup incremental queda igual que recalcularlo desde cero"""
+        from datetime import datetime, timezone
+        created = [
+            task_service.create_task(db_session, obj_in=TaskCreate(title=f"Tarea {i}", status=status))
+            for i, status in enumerate(["pending", "pending", "completed", "in_progress"])
+        ]
+        task_service.create_tasks(db_session, [TaskCreate(title="Bulk", status="completed")] * 2)
+        task_service.update_task(db_session, db_obj=created[0], obj_in=TaskUpdate(status="completed"))
+        task_service.update_task(db_session, db_obj=created[2], obj_in=TaskUpdate(status="pending"))
+        task_service.delete_task(db_session, task_id=created[3].id)
+        task_service.update_tasks(
+            db_session, criteria=TaskBulkFilter(status="pending"), obj_in=TaskUpdate(status="completed")
+        )
+        task_service.delete_tasks(db_session, criteria=TaskBulkFilter(ids=[created[1].id]))
+        
+        incremental = self._rollup(db_session)
+        stats_service.rebuild_daily_stats(db_session)
+        assert self._rollup(db_session) == incremental
+        
+        today = datetime.now(timezone.utc).date()
+        stats = stats_service.get_stats(db_session, today, today)
+        assert stats["by_status"] == {"pending": 0, "in_progress": 0, "completed": 4}
+        assert stats["days"] == [{"day": today, "created": 4, "completed": 4}]
+        assert db_session.query(Task).filter(Task.completed_at.is_not(None)).count() == 4
+    
+    def test_stats_without_rollup(self, db_session, monkeypatch):
+        """Test: Sin rollup ni contadores las estadísticas salen de tasks y no se escribe el rollup"""
+        from datetime import datetime, timedelta, timezone
+        task = task_service.create_task(db_session, obj_in=TaskCreate(title="Tarea"))
+        task_service.create_task(db_session, obj_in=TaskCreate(title="Otra"))
+        task_service.update_task(db_session, db_obj=task, obj_in=TaskUpdate(status="completed"))
+        today = datetime.now(timezone.utc).date()
+        
+        assert self._rollup(db_session) == {}
+        stats = stats_service.get_stats(db_session, today - timedelta(days=1), today)
+        assert stats["by_status"] == {"pending": 1, "in_progress": 0, "completed": 1}
+        assert stats["days"] == [
+            {"day": today - timedelta(days=1), "created": 0, "completed": 0},
+            {"day": today, "created": 2, "completed": 1},
+        ]
+    
+    def test_stats_by_status_from_counters(self, db_session, counters_enabled, stats_enabled):
+        """Test: Con contadores los totales por estado salen de task_status_counts"""
+        from datetime import datetime, timezone
+        from app.models.task_count import TaskStatusCount
+        task_service.create_task(db_session, obj_in=TaskCreate(title="Tarea"))
+        # Solo los contadores cambian: si el total saliera del rollup seguiría en 1
+        db_session.query(TaskStatusCount).filter(TaskStatusCount.status == TaskStatus.PENDING).update({"count": 7})
+        db_session.commit()
+        today = datetime.now(timezone.utc).date()
+        
+        assert stats_service.get_stats(db_session, today, today)["by_status"]["pending"] == 7
+    
+    def test_stats_range(self):
+        """Test: Rango por defecto de 30 días y validación de límites"""
+        from datetime import date
+        date_from, date_to = stats_service.stats_range(None, date(2026, 3, 30), max_days=366)
+        assert (date_from, date_to) == (date(2026, 3, 1), date(2026, 3, 30))
+        
+        with pytest.raises(ValueError):
+            stats_service.stats_range(date(2026, 3, 2), date(2026, 3, 1), max_days=366)
+        with pytest.raises(ValueError):
+            stats_service.stats_range(date(2025, 1, 1), date(2026, 3, 1), max_days=366)
+
+
+class TestImportService:
+    """Tests para el import NDJSON en streaming"""
+    
+    @staticmethod
+    async def _chunks(*parts):
+        for part in parts:
+            yield part
+    
+    def test_iter_lines_across_chunks(self):
+        """Test: Las líneas se arman aunque crucen varios chunks"""
+        async def collect():
+            chunks = self._chunks(b'{"a"', b': 1}\n{"b', b'": 2}\r\n', b'{"c": 3}')
+            return [line async for line in import_service.iter_lines(chunks, max_line_bytes=100)]
+        
+        lines = asyncio.run(collect())
+        
+        assert lines == [(1, b'{"a": 1}'), (2, b'{"b": 2}\r'), (3, b'{"c": 3}')]
+    
+    def test_iter_lines_too_long(self):
+        """Test: Una línea larga se descarta sin guardarla y no corre las demás"""
+        async def collect():
+            chunks = self._chunks(b"x" * 8, b"x" * 8, b"x\nok\n")
+            return [line async for line in import_service.iter_lines(chunks, max_line_bytes=10)]
+        
+        assert asyncio.run(collect()) == [(1, None), (2, b"ok")]
+    
+    def test_import_flushes_in_batches(self):
+        """Test: Las tareas válidas se guardan en lotes de tamaño fijo"""
+        batches = []
+        
+        async def flush(batch):
+            batches.append([task.title for task in batch])
+            return len(batch)
+        
+        lines = b"".join(b'{"title": "T%d"}\n' % i for i in range(5))
+        result = asyncio.run(import_service.import_tasks(self._chunks(lines), flush, batch_size=2))
+        
+        assert batches == [["T0", "T1"], ["T2", "T3"], ["T4"]]
+        assert result.imported == 5
+        assert result.failed == 0
+    
+    def test_import_caps_reported_errors(self):
+        """Test: Se cuentan todos los errores pero se devuelven solo los primeros"""
+        async def flush(batch):
+            return len(batch)
+        
+        lines = b"{}\n" * 5
+        result = asyncio.run(import_service.import_tasks(self._chunks(lines), flush, max_errors=2))
+        
+        assert result.failed == 5
+        assert [error.line for error in result.errors] == [1, 2]
+
 
 class TestAuthService:
     """Tests para el servicio de autenticación"""
@@ -116,6 +478,23 @@ class TestAuthService:
         assert user.email == "test@example.com"
         assert user.is_active is True
     
+    def test_authenticate_rehashes_lower_cost(self, db_session, test_user, monkeypatch):
+        """Test: Un login correcto rehashea la password si subió el costo de bcrypt"""
+        from app.core import security
+        test_user.hashed_password = security.get_password_hash("testpass123", rounds=4)
+        db_session.commit()
+        monkeypatch.setattr(security, "_bcrypt_rounds", 5)
+        
+        user = auth_service.authenticate(db_session, email="test@example.com", password="testpass123")
+        
+        assert user.hashed_password.split("$")[2] == "05"
+        assert security.verify_password("testpass123", user.hashed_password) is True
+        
+        # Con el costo al día no se vuelve a tocar
+        hashed = user.hashed_password
+        auth_service.authenticate(db_session, email="test@example.com", password="testpass123")
+        assert user.hashed_password == hashed
+    
     def test_authenticate_user_wrong_password(self, db_session, test_user):
         """Test: Autenticación falla con contraseña incorrecta"""
         user = auth_service.authenticate(
@@ -154,3 +533,15 @@ class TestAuthService:
         )
         
         assert user is None
+    
+    def test_authenticate_async_with_sync_session(self, db_session, test_user):
+        """Test: La versión para endpoints async valida igual que la sync"""
+        user = asyncio.run(
+            auth_service.authenticate_async(db_session, email="test@example.com", password="testpass123")
+        )
+        assert user.email == "test@example.com"
+        
+        user = asyncio.run(
+            auth_service.authenticate_async(db_session, email="test@example.com", password="wrongpassword")
+        )
+        assert user is None
@@ -79,6 +79,100 @@ class TestTaskEndpoints:
         
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
     
+    def test_create_tasks_bulk(self, client, auth_headers):
+        """Test: Carga masiva crea las tareas válidas y reporta las inválidas"""
+        items = [{"title": f"Masiva {i}"} for i in range(25)]
+        items.insert(3, {"title": ""})
+        items.append({"title": "Estado raro", "status": "invalid_status"})
+        
+        response = client.post(
+            "/api/v1/tasks/bulk",
+            json=items,
+            headers=auth_headers
+        )
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()
+        assert [t["title"] for t in data["created"]] == [f"Masiva {i}" for i in range(25)]
+        assert all(t["status"] == "pending" for t in data["created"])
+        assert [e["index"] for e in data["errors"]] == [3, 26]
+    
+    def test_create_tasks_bulk_all_invalid(self, client, auth_headers):
+        """Test: Carga masiva sin items válidos retorna 422"""
+        response = client.post(
+            "/api/v1/tasks/bulk",
+            json=[{"title": ""}, {"description": "sin título"}],
+            headers=auth_headers
+        )
+        
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
+    def test_import_tasks_ndjson(self, client, auth_headers, db_session):
+        """Test: Import NDJSON guarda las líneas válidas y reporta las inválidas"""
+        from app.models.task import Task
+        body = (
+            b'{"title": "Importada 1"}\n'
+            b'\n'
+            b'{"title": ""}\n'
+            b'no es json\n'
+            b'{"title": "Importada 2", "status": "completed"}'
+        )
+        
+        response = client.post(
+            "/api/v1/tasks/import",
+            content=iter([body[:10], body[10:]]),
+            headers={**auth_headers, "Content-Type": "application/x-ndjson"}
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["imported"] == 2
+        assert data["failed"] == 2
+        assert [error["line"] for error in data["errors"]] == [3, 4]
+        assert data["errors"][1]["errors"][0]["type"] == "json_invalid"
+        assert db_session.query(Task).count() == 2
+    
+    def test_update_tasks_bulk_by_filter(self, client, auth_headers, db_session):
+        """Test: Actualización masiva por filtro reporta las filas afectadas"""
+        from app.models.task import Task, TaskStatus
+        for i in range(4):
+            db_session.add(Task(title=f"Informe {i}", status=TaskStatus.PENDING))
+        db_session.add(Task(title="Otra cosa", status=TaskStatus.PENDING))
+        db_session.commit()
+        
+        response = client.patch(
+            "/api/v1/tasks/bulk",
+            json={"title_contains": "informe", "changes": {"status": "completed"}},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"affected": 4}
+        assert db_session.query(Task).filter(Task.status == TaskStatus.COMPLETED).count() == 4
+    
+    def test_delete_tasks_bulk_by_ids(self, client, auth_headers, test_task):
+        """Test: Eliminación masiva por lista de ids"""
+        response = client.request(
+            "DELETE",
+            "/api/v1/tasks/bulk",
+            json={"ids": [test_task.id, 99999]},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"affected": 1}
+    
+    def test_delete_tasks_bulk_without_criteria(self, client, auth_headers):
+        """Test: Eliminación masiva sin criterios se rechaza"""
+        response = client.request(
+            "DELETE",
+            "/api/v1/tasks/bulk",
+            json={"status": None},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
     def test_get_tasks_list(self, client, auth_headers, test_task):
         """Test: Obtener lista de tareas"""
         response = client.get("/api/v1/tasks", headers=auth_headers)
@@ -119,6 +213,240 @@ class TestTaskEndpoints:
         data = response.json()
         assert len(data) == 5
     
+    def test_get_tasks_cursor_pagination(self, client, auth_headers, db_session):
+        """Test: Paginación por cursor recorre todas las tareas sin repetir"""
+        from app.models.task import Task, TaskStatus
+        for i in range(15):
+            db_session.add(Task(title=f"Tarea {i}", status=TaskStatus.PENDING))
+        db_session.commit()
+
+        # Primera página con cursor vacío
+        response = client.get(
+            "/api/v1/tasks?cursor=&page_size=10",
+            headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        first_page = response.json()
+        assert len(first_page) == 10
+        next_cursor = response.headers["X-Next-Cursor"]
+
+        # Segunda página con el cursor devuelto
+        response = client.get(
+            f"/api/v1/tasks?cursor={next_cursor}&page_size=10",
+            headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        second_page = response.json()
+        assert len(second_page) == 5
+        assert "X-Next-Cursor" not in response.headers
+
+        ids = [t["id"] for t in first_page + second_page]
+        assert len(set(ids)) == 15
+    
+    @pytest.mark.parametrize("query", [
+        "?page_size=3",
+        "?cursor=&page_size=3&sort=-title",
+        "?q=tarea&status=pending",
+    ])
+    def test_get_tasks_fast_serialization(self, client, auth_headers, db_session, monkeypatch, query):
+        """Test: El modo rápido (filas + orjson) responde lo mismo que response_model"""
+        from app.core.config import settings
+        from app.models.task import Task, TaskStatus
+        db_session.add_all([
+            Task(title=f"Tarea {i}", description=None if i % 2 else "Descripción ñ", status=TaskStatus.PENDING)
+            for i in range(5)
+        ])
+        db_session.commit()
+        
+        expected = client.get(f"/api/v1/tasks{query}", headers=auth_headers)
+        monkeypatch.setattr(settings, "TASKS_FAST_SERIALIZATION", True)
+        response = client.get(f"/api/v1/tasks{query}", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == expected.json()
+        assert response.headers["ETag"] == expected.headers["ETag"]
+        assert response.headers.get("X-Next-Cursor") == expected.headers.get("X-Next-Cursor")
+    
+    def test_get_tasks_with_total(self, client, auth_headers, counters_enabled):
+        """Test: with_total=true agrega el total del listado, no el de la página"""
+        for i in range(3):
+            client.post("/api/v1/tasks/", json={"title": f"Tarea {i}", "status": "completed"}, headers=auth_headers)
+        client.post("/api/v1/tasks/", json={"title": "Pendiente"}, headers=auth_headers)
+        
+        response = client.get("/api/v1/tasks/?page_size=2&with_total=true", headers=auth_headers)
+        assert len(response.json()) == 2
+        assert response.headers["X-Total-Count"] == "4"
+        assert response.headers["X-Total-Count-Source"] == "counters"
+        
+        response = client.get(
+            "/api/v1/tasks/?status=completed&cursor=&with_total=true", headers=auth_headers
+        )
+        assert response.headers["X-Total-Count"] == "3"
+        
+        response = client.get("/api/v1/tasks/?q=tarea&with_total=true", headers=auth_headers)
+        assert response.headers["X-Total-Count"] == "3"
+        assert response.headers["X-Total-Count-Source"] == "exact"
+        
+        # Sin pedirlo no se cuenta
+        assert "X-Total-Count" not in client.get("/api/v1/tasks/", headers=auth_headers).headers
+    
+    @pytest.mark.parametrize("precomputed", [False, True])
+    def test_get_task_stats(self, client, auth_headers, monkeypatch, precomputed):
+        """Test: Estadísticas por estado y por día, desde tasks o desde el rollup y los contadores"""
+        from datetime import datetime, timedelta, timezone
+        from app.core.config import settings
+        monkeypatch.setattr(settings, "TASK_COUNTERS_ENABLED", precomputed)
+        monkeypatch.setattr(settings, "TASK_STATS_ENABLED", precomputed)
+        for title in ("Uno", "Dos"):
+            client.post("/api/v1/tasks/", json={"title": title}, headers=auth_headers)
+        task_id = client.post("/api/v1/tasks/", json={"title": "Tres"}, headers=auth_headers).json()["id"]
+        client.put(f"/api/v1/tasks/{task_id}", json={"status": "completed"}, headers=auth_headers)
+        
+        response = client.get("/api/v1/tasks/stats", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] == 3
+        assert data["by_status"] == {"pending": 2, "in_progress": 0, "completed": 1}
+        # Últimos 30 días, con los días sin actividad en 0
+        today = datetime.now(timezone.utc).date()
+        assert len(data["days"]) == 30
+        assert data["days"][-1] == {"day": today.isoformat(), "created": 3, "completed": 1}
+        assert data["days"][0] == {"day": (today - timedelta(days=29)).isoformat(), "created": 0, "completed": 0}
+    
+    def test_get_task_stats_invalid_range(self, client, auth_headers):
+        """Test: Un rango invertido responde 400"""
+        response = client.get(
+            "/api/v1/tasks/stats?date_from=2026-03-02&date_to=2026-03-01", headers=auth_headers
+        )
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_get_tasks_invalid_cursor(self, client, auth_headers):
+        """Test: Cursor inválido retorna 400"""
+        response = client.get(
+            "/api/v1/tasks?cursor=no-es-un-cursor",
+            headers=auth_headers
+        )
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_get_tasks_filter_and_sort(self, client, auth_headers, db_session):
+        """Test: Filtrar por estado y ordenar por título descendente"""
+        from app.models.task import Task, TaskStatus
+        db_session.add_all([
+            Task(title="B", status=TaskStatus.COMPLETED),
+            Task(title="A", status=TaskStatus.PENDING),
+            Task(title="C", status=TaskStatus.COMPLETED),
+            Task(title="A", status=TaskStatus.COMPLETED),
+        ])
+        db_session.commit()
+        
+        response = client.get(
+            "/api/v1/tasks?status=completed&sort=-title",
+            headers=auth_headers
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert [t["title"] for t in response.json()] == ["C", "B", "A"]
+        assert all(t["status"] == "completed" for t in response.json())
+    
+    def test_get_tasks_cursor_with_other_sort_fails(self, client, auth_headers, db_session):
+        """Test: Un cursor solo sirve para el orden con el que se generó"""
+        from app.models.task import Task
+        db_session.add_all([Task(title=f"Tarea {i}") for i in range(3)])
+        db_session.commit()
+        
+        response = client.get("/api/v1/tasks?cursor=&page_size=1&sort=title", headers=auth_headers)
+        next_cursor = response.headers["X-Next-Cursor"]
+        response = client.get(f"/api/v1/tasks?cursor={next_cursor}&page_size=1", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_get_tasks_invalid_filter(self, client, auth_headers):
+        """Test: Estado u orden desconocidos retornan 422"""
+        response = client.get("/api/v1/tasks?status=archived", headers=auth_headers)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        
+        response = client.get("/api/v1/tasks?sort=id", headers=auth_headers)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
+    def test_export_tasks_ndjson(self, client, auth_headers, db_session):
+        """Test: Export NDJSON con una tarea por línea y los filtros del listado"""
+        import json
+        from app.models.task import Task, TaskStatus
+        db_session.add_all([
+            Task(title="Exportar", description="Con acentos: ñ", status=TaskStatus.COMPLETED),
+            Task(title="Pendiente", status=TaskStatus.PENDING),
+        ])
+        db_session.commit()
+        
+        response = client.get("/api/v1/tasks/export?status=completed", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert len(rows) == 1
+        assert rows[0]["title"] == "Exportar"
+        assert rows[0]["description"] == "Con acentos: ñ"
+        assert rows[0]["status"] == "completed"
+    
+    def test_export_tasks_csv(self, client, auth_headers, db_session):
+        """Test: Export CSV con cabecera y campos con comas escapados"""
+        import csv
+        import io
+        from app.models.task import Task
+        db_session.add_all([Task(title="Uno, dos"), Task(title="Tres")])
+        db_session.commit()
+        
+        response = client.get("/api/v1/tasks/export?format=csv&sort=-title", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.reader(io.StringIO(response.text)))
+        assert rows[0] == ["id", "title", "description", "status", "created_at"]
+        assert [row[1] for row in rows[1:]] == ["Uno, dos", "Tres"]
+    
+    def test_search_tasks(self, client, auth_headers, db_session):
+        """Test: Búsqueda por texto en título y descripción"""
+        from app.models.task import Task
+        db_session.add_all([
+            Task(title="Comprar leche", description="En el súper"),
+            Task(title="Informe mensual", description="Incluir gastos de leche"),
+            Task(title="Llamar al banco"),
+        ])
+        db_session.commit()
+        
+        response = client.get("/api/v1/tasks?q=leche", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        # La coincidencia en el título pesa más que en la descripción
+        assert [t["title"] for t in response.json()] == ["Comprar leche", "Informe mensual"]
+    
+    def test_search_tasks_title_outweighs_description(self, client, auth_headers, db_session):
+        """Test: Un título largo con la palabra gana a una descripción corta que solo tiene la palabra"""
+        from app.models.task import Task
+        db_session.add_all([
+            Task(title="Informe", description="leche"),
+            Task(
+                title="Revisar el inventario completo del almacén antes de pedir leche",
+                description="Contar cajas, anotar faltantes y avisar al proveedor del pedido semanal"
+            ),
+        ])
+        db_session.commit()
+        
+        response = client.get("/api/v1/tasks?q=leche", headers=auth_headers)
+        
+        assert [t["title"] for t in response.json()] == [
+            "Revisar el inventario completo del almacén antes de pedir leche", "Informe"
+        ]
+    
+    def test_search_tasks_with_cursor_fails(self, client, auth_headers):
+        """Test: Búsqueda y cursor no se pueden combinar"""
+        response = client.get("/api/v1/tasks?q=leche&cursor=", headers=auth_headers)
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
     def test_get_task_by_id(self, client, auth_headers, test_task):
         """Test: Obtener tarea por ID"""
         response = client.get(
@@ -131,6 +459,60 @@ class TestTaskEndpoints:
         assert data["id"] == test_task.id
         assert data["title"] == test_task.title
     
+    def test_get_task_if_none_match(self, client, auth_headers, test_task):
+        """Test: Con el ETag actual GET /tasks/{id} responde 304 sin cuerpo"""
+        response = client.get(f"/api/v1/tasks/{test_task.id}", headers=auth_headers)
+        etag = response.headers["ETag"]
+        
+        response = client.get(
+            f"/api/v1/tasks/{test_task.id}",
+            headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+        
+        # Después de un cambio el ETag viejo ya no coincide
+        client.put(f"/api/v1/tasks/{test_task.id}", json={"title": "Otro"}, headers=auth_headers)
+        response = client.get(
+            f"/api/v1/tasks/{test_task.id}",
+            headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+    
+    def test_get_tasks_list_etag(self, client, auth_headers, test_task):
+        """Test: El ETag del listado cambia si cambia una tarea de la página"""
+        response = client.get("/api/v1/tasks", headers=auth_headers)
+        etag = response.headers["ETag"]
+        
+        response = client.get("/api/v1/tasks", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        
+        client.request(
+            "PATCH", "/api/v1/tasks/bulk",
+            json={"ids": [test_task.id], "changes": {"status": "completed"}},
+            headers=auth_headers
+        )
+        response = client.get("/api/v1/tasks", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+    
+    def test_get_tasks_list_etag_includes_total(self, client, auth_headers, test_task):
+        """Test: Con with_total el ETag cambia si cambia el total aunque la página sea la misma"""
+        url = "/api/v1/tasks?page_size=1&with_total=true"
+        response = client.get(url, headers=auth_headers)
+        etag, total = response.headers["ETag"], int(response.headers["X-Total-Count"])
+        
+        # Queda después de test_task (orden por created_at): la primera página no cambia
+        client.post("/api/v1/tasks/", json={"title": "Otra"}, headers=auth_headers)
+        response = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["X-Total-Count"] == str(total + 1)
+        assert [t["id"] for t in response.json()] == [test_task.id]
+        # Sin with_total el ETag es solo el de la página
+        assert client.get("/api/v1/tasks?page_size=1", headers=auth_headers).headers["ETag"] != etag
+    
     def test_get_task_not_found(self, client, auth_headers):
         """Test: Obtener tarea inexistente retorna 404"""
         response = client.get("/api/v1/tasks/99999", headers=auth_headers)
@@ -172,6 +554,28 @@ class TestTaskEndpoints:
         assert data["title"] == original_title  # No cambió
         assert data["status"] == "completed"  # Cambió
     
+    def test_update_task_if_match(self, client, auth_headers, test_task):
+        """Test: PUT con If-Match viejo retorna 412 y no pisa el cambio"""
+        etag = client.get(f"/api/v1/tasks/{test_task.id}", headers=auth_headers).headers["ETag"]
+        
+        response = client.put(
+            f"/api/v1/tasks/{test_task.id}",
+            json={"title": "Primero"},
+            headers={**auth_headers, "If-Match": etag}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        new_etag = response.headers["ETag"]
+        assert new_etag != etag
+        
+        response = client.put(
+            f"/api/v1/tasks/{test_task.id}",
+            json={"title": "Segundo"},
+            headers={**auth_headers, "If-Match": etag}
+        )
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        response = client.get(f"/api/v1/tasks/{test_task.id}", headers=auth_headers)
+        assert response.json()["title"] == "Primero"
+    
     def test_update_task_not_found(self, client, auth_headers):
         """Test: Actualizar tarea inexistente retorna 404"""
         response = client.put(
@@ -207,6 +611,69 @@ class TestTaskEndpoints:
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+class TestMsgPack:
+    """Tests de negociación de contenido MessagePack"""
+    
+    MSGPACK = "application/msgpack"
+    
+    def test_create_and_read_msgpack(self, client, auth_headers):
+        """Test: Body y respuesta en msgpack con el mismo esquema que JSON"""
+        import msgpack
+        response = client.post(
+            "/api/v1/tasks",
+            content=msgpack.packb({"title": "Binaria", "status": "in_progress"}),
+            headers={**auth_headers, "Content-Type": self.MSGPACK, "Accept": self.MSGPACK}
+        )
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.headers["content-type"] == self.MSGPACK
+        created = msgpack.unpackb(response.content)
+        assert created["title"] == "Binaria"
+        assert created["status"] == "in_progress"
+        
+        # Sin Accept sigue siendo JSON
+        response = client.get(f"/api/v1/tasks/{created['id']}", headers=auth_headers)
+        assert response.json() == created
+        assert "Accept" in response.headers["Vary"]
+    
+    def test_list_msgpack_with_fast_serialization(self, client, auth_headers, test_task, monkeypatch):
+        """Test: El listado respeta msgpack aunque esté activo el modo orjson"""
+        import msgpack
+        from app.core.config import settings
+        expected = client.get("/api/v1/tasks", headers=auth_headers).json()
+        monkeypatch.setattr(settings, "TASKS_FAST_SERIALIZATION", True)
+        
+        response = client.get("/api/v1/tasks", headers={**auth_headers, "Accept": self.MSGPACK})
+        
+        assert msgpack.unpackb(response.content) == expected
+    
+    def test_update_msgpack_validation(self, client, auth_headers, test_task):
+        """Test: Un body msgpack inválido falla igual que en JSON"""
+        import msgpack
+        headers = {**auth_headers, "Content-Type": self.MSGPACK}
+        
+        response = client.put(
+            f"/api/v1/tasks/{test_task.id}", content=msgpack.packb({"status": "archivada"}), headers=headers
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        
+        response = client.put(f"/api/v1/tasks/{test_task.id}", content=b"\xc1", headers=headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    @pytest.mark.parametrize("accept, expected", [
+        (None, False),
+        ("*/*", False),
+        ("application/msgpack", True),
+        ("application/json, application/msgpack;q=0.5", False),
+        ("application/x-msgpack, application/json;q=0.9", True),
+        ("application/msgpack;q=0", False),
+    ])
+    def test_wants_msgpack(self, accept, expected):
+        """Test: Preferencia de Accept entre JSON y msgpack"""
+        from app.core.msgpack_route import wants_msgpack
+        assert wants_msgpack(accept) is expected
+
+
 class TestTaskBusinessLogic:
     """Tests para lógica de negocio de tareas"""
     
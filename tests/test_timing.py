@@ -0,0 +1,74 @@
+"""
+Tests para el header Server-Timing y el log por request
+"""
+import json
+import logging
+
+from app.core.config import settings
+from app.core.timing import RequestTiming, current_timing, server_timing_header, span
+
+
+def _phases(response):
+    # Nombres de las fases del header, en orden
+    return [entry.split(";")[0].strip() for entry in response.headers["Server-Timing"].split(",")]
+
+
+class TestServerTiming:
+    """Suite de pruebas del header Server-Timing"""
+    
+    def test_list_phases(self, client, auth_headers, test_task):
+        """Test: Un listado muestra JWT, usuario, endpoint, serialización, BD y total"""
+        response = client.get("/api/v1/tasks", headers=auth_headers)
+        
+        assert response.status_code == 200
+        phases = _phases(response)
+        for phase in ("jwt", "user", "endpoint", "serialize", "db", "total"):
+            assert phase in phases
+        assert phases[-1] == "total"
+        assert 'queries"' in response.headers["Server-Timing"]
+    
+    def test_login_bcrypt_phase(self, client, test_user):
+        """Test: El login muestra el tiempo de bcrypt"""
+        response = client.post(
+            "/api/v1/auth/login",
+            data={"username": "test@example.com", "password": "testpass123"}
+        )
+        
+        assert response.status_code == 200
+        assert "bcrypt" in _phases(response)
+    
+    def test_errors_have_header(self, client):
+        """Test: También los 401 llevan el header (hasta donde llegó el request)"""
+        response = client.get("/api/v1/tasks")
+        
+        assert response.status_code == 401
+        assert _phases(response)[-1] == "total"
+    
+    def test_span_outside_request(self):
+        """Test: Fuera de un request span() no hace nada"""
+        with span("jwt"):
+            pass
+        
+        assert current_timing.get() is None
+    
+    def test_header_format(self):
+        """Test: Las fases repetidas se suman y el formato es nombre;dur=ms"""
+        timing = RequestTiming()
+        timing.add("bcrypt", 0.1)
+        timing.add("bcrypt", 0.05)
+        
+        assert server_timing_header(timing, 0.2) == "bcrypt;dur=150.00, total;dur=200.00"
+    
+    def test_structured_log(self, client, auth_headers, test_task, monkeypatch, caplog):
+        """Test: Con SERVER_TIMING_LOG se escribe una línea JSON por request"""
+        monkeypatch.setattr(settings, "SERVER_TIMING_LOG", True)
+        
+        with caplog.at_level(logging.INFO, logger="app.core.timing"):
+            client.get(f"/api/v1/tasks/{test_task.id}", headers=auth_headers)
+        
+        records = [json.loads(record.getMessage()) for record in caplog.records if record.name == "app.core.timing"]
+        assert len(records) == 1
+        assert records[0]["route"] == "/api/v1/tasks/{task_id}"
+        assert records[0]["status"] == 200
+        assert "jwt" in records[0]["spans_ms"]
+        assert records[0]["db_queries"] >= 1